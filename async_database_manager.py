@@ -0,0 +1,220 @@
+"""
+Asyncio front end for DatabaseManager.
+
+Reads run on a small pool of reader threads, each holding its own pooled connection. Writes
+go through a bounded queue to a single writer thread, which coalesces everything waiting
+into one transaction; each write runs inside its own SAVEPOINT so a failing statement only
+fails its own caller. A write's future resolves after the transaction commits.
+"""
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, Union
+
+from .database_manager import DatabaseManager
+
+_STOP = object()
+
+
+class AsyncDatabaseManager:
+    """Non-blocking counterpart of DatabaseManager for asyncio services."""
+
+    def __init__(self, db_path="database_scripts/zomata_database.db", readers: int = 4,
+                 max_pending_writes: int = 1000, max_pending_reads: int = 1000, max_batch: int = 500):
+        """
+        Initialize the reader pool and start the writer thread.
+        :param db_path: Path to the SQLite database file.
+        :param readers: Number of reader threads (and pooled read connections).
+        :param max_pending_writes: Writes per event loop that may wait in the queue before callers are made to wait.
+        :param max_pending_reads: Reads per event loop that may wait for a reader thread before callers are made to wait.
+        :param max_batch: Maximum writes coalesced into one transaction.
+        """
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self.max_pending_writes = max_pending_writes
+        self.max_pending_reads = max_pending_reads
+        self.logger = logging.getLogger(__name__)
+        self._manager = DatabaseManager(db_path, pool_size=readers + 1)
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="db-reader")
+        self._writes = queue.Queue()
+        # (write, read) semaphores per event loop; an asyncio.Semaphore must not be shared across loops
+        self._slots = weakref.WeakKeyDictionary()
+        self._slots_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="db-writer", daemon=True)
+        self._writer.start()
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _loop_slots(self) -> Tuple[asyncio.Semaphore, asyncio.Semaphore]:
+        """The running loop's (write, read) semaphores, created the first time the loop uses this manager."""
+        loop = asyncio.get_running_loop()
+        with self._slots_lock:
+            slots = self._slots.get(loop)
+            if slots is None:
+                slots = self._slots[loop] = (asyncio.Semaphore(self.max_pending_writes),
+                                             asyncio.Semaphore(self.max_pending_reads))
+            return slots
+
+    async def _read(self, function, *args):
+        """Run a blocking DatabaseManager read on a reader thread."""
+        async with self._loop_slots()[1]:
+            return await asyncio.get_running_loop().run_in_executor(self._readers, function, *args)
+
+    def _write_loop(self) -> None:
+        """Writer thread: commit queued writes in coalesced batches until stopped."""
+        while True:
+            batch = [self._writes.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+            stop = any(item is _STOP for item in batch)
+            batch = [item for item in batch if item is not _STOP]
+            if batch:
+                self._commit_batch(batch)
+            if stop:
+                return
+
+    def _commit_batch(self, batch: List[Tuple]) -> None:
+        """Apply a batch of writes in one transaction and resolve their futures."""
+        outcomes = []
+        try:
+            with self._manager._connect() as conn:
+                start = time.perf_counter()
+                conn.execute("BEGIN IMMEDIATE;")
+                for query, params, future, loop in batch:
+                    conn.execute("SAVEPOINT async_write;")
+                    try:
+                        rowcount = conn.execute(query, params).rowcount
+                        outcomes.append((future, loop, rowcount, None))
+                    except sqlite3.Error as e:
+                        conn.execute("ROLLBACK TO async_write;")
+                        outcomes.append((future, loop, None, e))
+                        self.logger.error(f"Database error: {e} | Query: {query} | Params: {params}")
+                    conn.execute("RELEASE async_write;")
+                conn.commit()
+                # One entry for the whole transaction, as insert_many records its batches
+                rows = sum(max(rowcount, 0) for _, _, rowcount, error in outcomes if error is None)
+                self._manager.profiler.record(conn, batch[0][0], batch[0][1], time.perf_counter() - start, rows)
+        except sqlite3.Error as e:
+            self.logger.error(f"Write batch of {len(batch)} failed: {e}")
+            outcomes = [(future, loop, None, e) for _, _, future, loop in batch]
+        finally:
+            for query, _, _, _ in batch:
+                self._manager._invalidate_cache(query)
+
+        self.logger.info(f"Committed {len(batch)} coalesced writes")
+        for future, loop, rowcount, error in outcomes:
+            try:
+                loop.call_soon_threadsafe(self._resolve, future, rowcount, error)
+            except RuntimeError:
+                # The caller's event loop is closed; nobody awaits this write any more
+                self.logger.warning("Event loop closed before a write result could be delivered.")
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, rowcount: Optional[int], error: Optional[Exception]) -> None:
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(rowcount)
+
+    async def execute_query(self, query: str, params: Tuple = ()) -> int:
+        """
+        Queue an SQL write (INSERT, UPDATE, DELETE) and wait until it is committed.
+        Waits first if max_pending_writes writes are already queued.
+        :param query: SQL query string.
+        :param params: Tuple of parameters for the query.
+        :return: Number of rows affected.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("AsyncDatabaseManager is closed.")
+        async with self._loop_slots()[0]:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._writes.put((query, tuple(params), future, loop))
+            return await future
+
+    async def fetch_all(self, query: str, params: Tuple = (), use_cache: bool = False) -> List[Tuple]:
+        """
+        Fetch all rows for a given query on a reader thread.
+        :param query: SQL query string.
+        :param params: Tuple of parameters for the query.
+        :param use_cache: Serve repeated reads from the query cache.
+        :return: List of rows.
+        """
+        return await self._read(self._manager.fetch_all, query, params, use_cache)
+
+    async def insert_record(self, table_name: str, columns: str, values: Tuple) -> int:
+        """
+        Insert a record into a table.
+        :param table_name: Name of the table.
+        :param columns: Comma-separated column names.
+        :param values: Tuple of values to insert.
+        """
+        # Location keys are parsed and looked up like DatabaseManager.insert_record does, off the event loop
+        columns, values = await self._read(self._manager._with_location_keys, table_name, columns, values)
+        placeholders = ", ".join("?" for _ in values)
+        query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders});"
+        return await self.execute_query(query, values)
+
+    async def update_record(self, table_name: str, set_clause: str, where_clause: str, params: Tuple) -> int:
+        """
+        Update a record in a table.
+        :param table_name: Name of the table.
+        :param set_clause: SET clause for the query (e.g., "name = ?").
+        :param where_clause: WHERE clause for the query (e.g., "id = ?").
+        :param params: Tuple of parameters for the query.
+        """
+        set_clause, params = await self._read(self._manager._with_location_updates, table_name, set_clause, params)
+        query = f"UPDATE {table_name} SET {set_clause} WHERE {where_clause};"
+        return await self.execute_query(query, params)
+
+    async def delete_record(self, table_name: str, where_clause: str, params: Tuple) -> int:
+        """
+        Delete a record from a table.
+        :param table_name: Name of the table.
+        :param where_clause: WHERE clause for the query (e.g., "id = ?").
+        :param params: Tuple of parameters for the query.
+        """
+        query = f"DELETE FROM {table_name} WHERE {where_clause};"
+        return await self.execute_query(query, params)
+
+    async def get_table_data(self, table_name: str) -> List[Tuple]:
+        """
+        Fetch all data from a table.
+        :param table_name: Name of the table.
+        :return: List of rows.
+        """
+        return await self._read(self._manager.get_table_data, table_name)
+
+    async def fetch_column_names(self, table_name: str) -> Union[List[str], None]:
+        """
+        Fetch column names for a given table.
+        :param table_name: Name of the table.
+        :return: List of column names or None if the table doesn't exist.
+        """
+        return await self._read(self._manager.fetch_column_names, table_name)
+
+    async def close(self) -> None:
+        """Commit every queued write, then stop the writer and reader threads."""
+        if self._closed:
+            return
+        self._closed = True
+        self._writes.put(_STOP)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._writer.join)
+        self._readers.shutdown(wait=True)
+        self._manager.close()
@@ -0,0 +1,86 @@
+"""
+Benchmark: thousands of concurrent coroutines writing orders and reading them back.
+
+Compares AsyncDatabaseManager (coalesced writer thread + reader pool) with the synchronous
+DatabaseManager driven from the same coroutines through asyncio.to_thread.
+
+Run from the project root:
+    python benchmarks/bench_async_manager.py --coroutines 5000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+from oop_database.async_database_manager import AsyncDatabaseManager
+from benchmarks.common import build_database, quiet_logging
+
+ORDER_COLUMNS = "order_id, customer_id, restaurant_id, order_date, status, total_amount, payment_mode"
+
+
+def order_values(i):
+    return (f"bench-{i}", "c0", "r0", "2024-06-01 12:00:00", "Pending", 25.0, "UPI")
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+async def client(insert, fetch, i, latencies):
+    """One coroutine: insert an order, then read it back."""
+    start = time.perf_counter()
+    await insert("Orders", ORDER_COLUMNS, order_values(i))
+    await fetch("SELECT status FROM Orders WHERE order_id = ?;", (f"bench-{i}",))
+    latencies.append(time.perf_counter() - start)
+
+
+async def run_async(db_path, coroutines):
+    latencies = []
+    async with AsyncDatabaseManager(db_path) as manager:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(manager.insert_record, manager.fetch_all, i, latencies)
+                               for i in range(coroutines)))
+        return time.perf_counter() - start, latencies
+
+
+async def run_threaded_sync(db_path, coroutines):
+    latencies = []
+    manager = DatabaseManager(db_path)
+
+    async def insert(*args):
+        return await asyncio.to_thread(manager.insert_record, *args)
+
+    async def fetch(*args):
+        return await asyncio.to_thread(manager.fetch_all, *args)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(insert, fetch, coroutines + i, latencies) for i in range(coroutines)))
+    elapsed = time.perf_counter() - start
+    manager.close()
+    return elapsed, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--coroutines", type=int, default=5000)
+    parser.add_argument("--orders", type=int, default=10000, help="Orders preloaded into the database.")
+    args = parser.parse_args()
+
+    quiet_logging()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_database(db_path, orders=args.orders).close()
+        for label, runner in [("DatabaseManager + to_thread", run_threaded_sync),
+                              ("AsyncDatabaseManager", run_async)]:
+            elapsed, latencies = asyncio.run(runner(db_path, args.coroutines))
+            print(f"{label:<28}: {args.coroutines / elapsed:8.0f} round trips/s | "
+                  f"p50 {percentile(latencies, 0.50) * 1000:7.1f} ms | p99 {percentile(latencies, 0.99) * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
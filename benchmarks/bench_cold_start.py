@@ -0,0 +1,100 @@
+"""
+Benchmark: cold start of the Streamlit entry point.
+
+Two measurements, each in fresh interpreters so nothing is already imported:
+  importtime  `python -X importtime` of the app module, summarized by top-level package
+              (cumulative import time of the slowest packages, and which chart-only modules loaded)
+  render      time to first render of the Home page through streamlit's AppTest, then the
+              time of the first visit to each other page in the same session
+
+Run from the project root (after create_database.py and populate_database.py):
+    python benchmarks/bench_cold_start.py --runs 3
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+APP = os.path.join(ROOT, "streamlit_app", "zomato_app.py")
+# Modules that only the chart and insight pages need
+LAZY_MODULES = ["pandas", "plotly.express", "insights_visualization.data_insights"]
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s+)(\S+)")
+
+# Runs in a fresh interpreter: renders Home, then visits each page once, printing JSON timings
+RENDER_SCRIPT = """
+import json, logging, sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+logging.disable(logging.INFO)
+app = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+timings = {"Home": time.perf_counter() - start,
+           "loaded_after_home": [name for name in sys.argv[2].split(",") if name in sys.modules]}
+for page in sys.argv[3:]:
+    start = time.perf_counter()
+    app.sidebar.selectbox[0].select(page).run()
+    timings[page] = time.perf_counter() - start
+timings["errors"] = [error.message for error in app.exception]
+print(json.dumps(timings))
+"""
+
+
+def import_times(app, top):
+    """
+    Cumulative import time of loading the app module, the slowest top-level packages (ms)
+    and which of LAZY_MODULES were imported.
+    """
+    loader = f"import runpy; runpy.run_path({app!r}, run_name='zomato_app')"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", loader],
+                            cwd=ROOT, capture_output=True, text=True)
+    packages = defaultdict(float)
+    total = 0.0
+    lines = IMPORT_LINE.findall(result.stderr)
+    for self_us, cumulative_us, indent, module in lines:
+        if len(indent) == 1:  # top-level imports only; nested ones are already in their parent's cumulative time
+            packages[module.split(".")[0]] += int(cumulative_us) / 1000
+            total += int(cumulative_us) / 1000
+    slowest = sorted(packages.items(), key=lambda item: -item[1])[:top]
+    loaded = [name for name in LAZY_MODULES if any(line[3] == name for line in lines)]
+    return total, slowest, loaded
+
+
+def render_times(app, pages):
+    """Time to first render and per-page first-visit time, measured in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-c", RENDER_SCRIPT, app, ",".join(LAZY_MODULES), *pages],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr[-2000:])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default=APP)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Packages listed in the import time summary.")
+    parser.add_argument("--pages", nargs="*", default=["Manage Orders", "Insights"])
+    args = parser.parse_args()
+
+    total, slowest, loaded = import_times(args.app, args.top)
+    print(f"Module import: {total:.0f} ms cumulative; lazy modules imported: {loaded or 'none'}")
+    for package, ms in slowest:
+        print(f"  {package:<30}{ms:8.0f} ms")
+
+    runs = [render_times(args.app, args.pages) for _ in range(args.runs)]
+    for run in runs:
+        if run["errors"]:
+            print(f"App raised: {run['errors']}")
+    print(f"\nFirst render over {args.runs} cold starts (median):")
+    for page in ["Home"] + args.pages:
+        samples = sorted(run[page] for run in runs)
+        label = "Home (time to first render)" if page == "Home" else f"first visit to {page}"
+        print(f"  {label:<40}{samples[len(samples) // 2] * 1000:8.0f} ms")
+    print(f"Lazy modules loaded by the Home render: {runs[0]['loaded_after_home'] or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
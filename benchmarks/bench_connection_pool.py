@@ -0,0 +1,87 @@
+"""
+Benchmark: queries per second for the `manage_table` read pattern with and without connection pooling.
+
+Run from the project root:
+    python benchmarks/bench_connection_pool.py --threads 8 --iterations 200
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+
+# Statements one `manage_table` rerun sends to SQLite with the query cache and schema catalog cold:
+# the sidebar table list, the catalog's schema_version check (table_exists, fetch_column_names),
+# get_table_data and the column list. They are issued directly so every one reaches SQLite.
+RERUN_QUERIES = [
+    "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';",
+    "PRAGMA schema_version;",
+    "SELECT * FROM Customers;",
+    "PRAGMA table_info(Customers);",
+]
+
+
+def build_database(db_path, rows):
+    """Create a small Customers table to read from."""
+    manager = DatabaseManager(db_path, pool_size=0)
+    manager.create_table("Customers", "customer_id TEXT PRIMARY KEY, name TEXT NOT NULL, location TEXT NOT NULL")
+    with manager._connect() as conn:
+        conn.executemany(
+            "INSERT INTO Customers (customer_id, name, location) VALUES (?, ?, ?);",
+            ((f"c{i}", f"Customer {i}", f"Street {i}") for i in range(rows)),
+        )
+        conn.commit()
+
+
+def simulate_rerun(manager):
+    """Replay the queries issued by one Streamlit rerun of `manage_table`."""
+    for query in RERUN_QUERIES:
+        manager.fetch_all(query)
+
+
+def run(db_path, pool_size, threads, iterations):
+    """Run `iterations` reruns on each of `threads` threads and return queries per second."""
+    manager = DatabaseManager(db_path, pool_size=pool_size, cache_size=0)  # measure connections, not cache hits
+
+    def worker():
+        for _ in range(iterations):
+            simulate_rerun(manager)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    manager.close()
+    return threads * iterations * len(RERUN_QUERIES) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_database(db_path, args.rows)
+        before = run(db_path, 0, args.threads, args.iterations)
+        after = run(db_path, args.pool_size, args.threads, args.iterations)
+
+    print(f"Connection per call: {before:10.0f} queries/s")
+    print(f"Pooled connections : {after:10.0f} queries/s (pool_size={args.pool_size})")
+    print(f"Speed-up           : {after / before:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: delivery dashboard views answered by DeliveryAnalytics (histograms built in one
+batched pass per refresh) versus the equivalent window-function SQL over Deliveries.
+
+The SQL computes the same nearest-rank percentiles, and its results are checked against
+the histograms before timing.
+
+Run from the project root:
+    python benchmarks/bench_delivery_analytics.py --orders 1000000
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+from oop_database.delivery_analytics import DISTANCE_EDGES, DeliveryAnalytics, distance_labels
+from benchmarks.common import build_database, quiet_logging
+
+PERCENTILES = (50, 90, 95, 99)
+DISTANCE_BUCKET = "CASE {} ELSE 0 END".format(" ".join(
+    f"WHEN distance >= {edge} THEN {i}" for i, edge in reversed(list(enumerate(DISTANCE_EDGES)))
+))
+
+
+def percentile_query(value, group):
+    """Nearest-rank percentiles of `value` per `group` with ROW_NUMBER over each partition."""
+    columns = ", ".join(f"MIN(CASE WHEN rn * 100 >= {q} * n THEN v END)" for q in PERCENTILES)
+    return f"""
+        SELECT g, COUNT(*), {columns}
+        FROM (SELECT {group} AS g, {value} AS v,
+                     ROW_NUMBER() OVER (PARTITION BY {group} ORDER BY {value}) AS rn,
+                     COUNT(*) OVER (PARTITION BY {group}) AS n
+              FROM Deliveries)
+        GROUP BY g ORDER BY g;
+    """
+
+
+# view: (SQL over Deliveries, DeliveryAnalytics call)
+VIEWS = {
+    "eta_error_by_vehicle": (percentile_query("delivery_time - estimated_time", "vehicle_type"),
+                             lambda analytics: analytics.eta_error_percentiles("vehicle")),
+    "eta_error_by_distance": (percentile_query("delivery_time - estimated_time", DISTANCE_BUCKET),
+                              lambda analytics: analytics.eta_error_percentiles("distance")),
+    "delivery_time_by_vehicle": (percentile_query("delivery_time", "vehicle_type"),
+                                 lambda analytics: analytics.delivery_time_percentiles("vehicle")),
+    "eta_error_histogram": ("SELECT delivery_time - estimated_time AS e, COUNT(*) FROM Deliveries GROUP BY e;",
+                            lambda analytics: analytics.eta_error_histogram()),
+    "fee_per_km_by_vehicle": ("SELECT vehicle_type, COUNT(*), SUM(delivery_fee) / SUM(distance) FROM Deliveries "
+                              "GROUP BY vehicle_type;",
+                              lambda analytics: analytics.fee_per_km("vehicle")),
+}
+
+
+def best_time(function, repeats):
+    """Best wall-clock time of several calls, in microseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def check(manager, analytics):
+    """The SQL and histogram percentiles agree (percentile columns only)."""
+    for name in ("eta_error_by_vehicle", "eta_error_by_distance", "delivery_time_by_vehicle"):
+        query, view = VIEWS[name]
+        expected = {row[0]: tuple(float(v) for v in row[2:]) for row in manager.fetch_all(query)}
+        if name == "eta_error_by_distance":
+            expected = {distance_labels()[group]: values for group, values in expected.items()}
+        actual = {row[0]: tuple(row[-len(PERCENTILES):]) for row in view(analytics)}
+        assert expected == actual, (name, expected, actual)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    quiet_logging()
+    logging.disable(logging.WARNING)  # every full scan is reported as a slow query
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_database(db_path, orders=args.orders, summaries=False).close()
+        manager = DatabaseManager(db_path, cache_size=0)
+
+        start = time.perf_counter()
+        analytics = DeliveryAnalytics(manager).refresh()
+        refresh_s = time.perf_counter() - start
+        print(f"{analytics.deliveries:,} deliveries: refresh {refresh_s:.2f} s, "
+              f"histograms {analytics.memory_usage() / 1e3:.0f} KB")
+        check(manager, analytics)
+
+        print(f"{'view':<26}{'SQL':>14}{'DeliveryAnalytics':>20}")
+        for name, (query, view) in VIEWS.items():
+            sql = best_time(lambda: manager.fetch_all(query), args.repeats)
+            histogram = best_time(lambda: view(analytics), args.repeats)
+            print(f"{name:<26}{sql / 1000:11.0f} ms{histogram:17.0f} us")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
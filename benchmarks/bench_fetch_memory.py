@@ -0,0 +1,84 @@
+"""
+Benchmark: peak memory and time of a full Orders scan through each fetch API.
+
+  fetch_all+DataFrame  fetch_all, then pd.DataFrame(rows) (the list and the frame coexist)
+  fetch_dataframe      typed columns built batch by batch, then wrapped without a copy
+  fetch_numpy          the same typed columns as a dict of arrays
+  fetch_iter           rows streamed and summed, never held
+  export_text          rows streamed into a gzip-compressed CSV file
+
+Each method runs in its own process so its peak RSS (ru_maxrss) is not inflated by another.
+
+Run from the project root:
+    python benchmarks/bench_fetch_memory.py --orders 1000000
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+from benchmarks.common import build_database, quiet_logging
+from benchmarks.suite import peak_rss_mb
+
+QUERY = "SELECT * FROM Orders;"
+METHODS = ["fetch_all+DataFrame", "fetch_dataframe", "fetch_numpy", "fetch_iter", "export_text"]
+
+
+def scan(db_path, method, batch_size):
+    """Run one scan and return (seconds, peak RSS growth in MB, rows)."""
+    import pandas as pd  # imported before the baseline so its own footprint is not counted
+
+    logging.disable(logging.WARNING)  # every full scan is reported as a slow query
+    manager = DatabaseManager(db_path, cache_size=0)
+    manager.fetch_all("SELECT 1;")
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if method == "fetch_all+DataFrame":
+        rows = manager.fetch_all(QUERY)
+        result = pd.DataFrame(rows, columns=manager.fetch_column_names("Orders"))
+        count = len(result)
+    elif method == "fetch_dataframe":
+        count = len(manager.fetch_dataframe(QUERY, batch_size=batch_size))
+    elif method == "fetch_numpy":
+        count = len(next(iter(manager.fetch_numpy(QUERY, batch_size=batch_size).values())))
+    elif method == "export_text":
+        count = manager.export_text(QUERY, os.path.join(os.path.dirname(db_path), "orders.csv.gz"), compress=True,
+                                    batch_size=batch_size)
+    else:
+        total = count = 0
+        for row in manager.fetch_iter(QUERY, batch_size=batch_size):
+            total += row[6]
+            count += 1
+    elapsed = time.perf_counter() - start
+    manager.close()
+    return elapsed, peak_rss_mb() - baseline, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    args = parser.parse_args()
+
+    quiet_logging()
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "bench.db")
+        build_database(db_path, orders=args.orders, summaries=False).close()
+        print(f"Full scan of {args.orders:,} orders ({os.path.getsize(db_path) / 1e6:.0f} MB database):")
+        print(f"{'method':<22}{'seconds':>10}{'peak RSS growth MB':>22}")
+        for method in METHODS:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                elapsed, growth, rows = executor.submit(scan, db_path, method, args.batch_size).result()
+            assert rows == args.orders, (method, rows)
+            print(f"{method:<22}{elapsed:>10.2f}{growth:>22.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark: Plotly JSON payload and render time of large insight charts, full versus
+downsampled by figures.render_figure, and a FigureCache hit.
+
+Run from the project root:
+    python benchmarks/bench_figures.py --points 10000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.figures import FigureCache, render_figure
+
+
+def series(points, seed):
+    """Daily-like order counts (line) and per-order amount/rating pairs (scatter)."""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2000-01-01", periods=points, freq="min").strftime("%Y-%m-%d %H:%M:%S")
+    line = pd.DataFrame({"day": days, "order_count": rng.poisson(50, points) + 20 * np.sin(np.arange(points) / 500)})
+    scatter = pd.DataFrame({"total_amount": rng.gamma(2.0, 30.0, points), "feedback_rating": rng.uniform(1, 5, points)})
+    return {"line": (line, "day", "order_count"), "scatter": (scatter, "total_amount", "feedback_rating")}
+
+
+def measure(render):
+    start = time.perf_counter()
+    payload = render().to_json()
+    return time.perf_counter() - start, len(payload)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--points", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--max-points", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"{'chart':<9}{'points':>10}{'full MB':>10}{'full ms':>10}{'reduced KB':>12}{'reduced ms':>12}{'cached ms':>11}")
+    for points in args.points:
+        for chart_type, (data, x, y) in series(points, args.seed).items():
+            full_s, full_bytes = measure(lambda: render_figure(
+                data, chart_type, x, y, max_points=len(data), webgl_threshold=0))
+            reduced_s, reduced_bytes = measure(lambda: render_figure(data, chart_type, x, y, max_points=args.max_points))
+
+            cache = FigureCache()
+            render = lambda: render_figure(data, chart_type, x, y, max_points=args.max_points)
+            cache.get_or_render(1, chart_type, render)
+            start = time.perf_counter()
+            cache.get_or_render(1, chart_type, render)
+            cached_s = time.perf_counter() - start
+
+            print(f"{chart_type:<9}{points:>10,}{full_bytes / 1e6:>10.1f}{full_s * 1000:>10.0f}"
+                  f"{reduced_bytes / 1e3:>12.1f}{reduced_s * 1000:>12.0f}{cached_s * 1000:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: memory per order and latency of the hot dashboard counts, answered by OrderStore
+(NumPy bincount) versus SQL over Orders (strftime / GROUP BY) and the trigger-maintained rollups.
+
+Run from the project root:
+    python benchmarks/bench_order_store.py --orders 200000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+from oop_database.order_store import ORDER_QUERY, OrderStore
+from benchmarks.check_query_plans import QUERY_SHAPES
+from benchmarks.common import build_database, quiet_logging
+
+# insight (also its rollup query, see DatabaseManager.fetch_summary): (SQL over Orders, OrderStore method)
+INSIGHTS = {
+    "order_count_by_hour": (QUERY_SHAPES["order_count_by_hour"], OrderStore.order_count_by_hour),
+    "peak_ordering_days": (QUERY_SHAPES["peak_ordering_days"], OrderStore.peak_ordering_days),
+    "orders_by_month": (QUERY_SHAPES["orders_by_month"], OrderStore.orders_by_month),
+    "top_restaurants": (QUERY_SHAPES["top_restaurants"], OrderStore.top_restaurants),
+    "top_customers": (QUERY_SHAPES["top_customers"], OrderStore.top_customers),
+}
+
+
+def best_time(function, repeats):
+    """Best wall-clock time of several calls, in microseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=200000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    quiet_logging()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_database(db_path, orders=args.orders).close()
+        manager = DatabaseManager(db_path, cache_size=0)
+
+        start = time.perf_counter()
+        store = OrderStore(db_path).load()
+        load_ms = (time.perf_counter() - start) * 1000
+        frame = pd.DataFrame(manager.fetch_all(ORDER_QUERY + ";"))
+        print(f"{store.size} orders, OrderStore loaded in {load_ms:.0f} ms")
+        print(f"memory per order: OrderStore {store.memory_usage() / store.size:6.1f} B | "
+              f"same columns as a pandas DataFrame {frame.memory_usage(deep=True).sum() / len(frame):6.1f} B")
+
+        print(f"{'insight':<22}{'SQL on Orders':>16}{'rollup SQL':>14}{'OrderStore':>14}")
+        for name, (raw_shape, method) in INSIGHTS.items():
+            raw = best_time(lambda: manager.fetch_all(*raw_shape), args.repeats)
+            rollup = best_time(lambda: manager.fetch_summary(name), args.repeats)
+            columnar = best_time(lambda: method(store), args.repeats)
+            print(f"{name:<22}{raw:13.0f} us{rollup:11.0f} us{columnar:11.0f} us")
+        store.close(uninstall=True)
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
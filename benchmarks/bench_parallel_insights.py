@@ -0,0 +1,68 @@
+"""
+Benchmark: wall-clock time for all the dashboard insights run serially and concurrently.
+
+Each insight runs its query on a read-only DatabaseManager (one pooled connection per worker)
+and builds the rows into a list, mirroring the fetch step of DataInsights.
+
+Run from the project root:
+    python benchmarks/bench_parallel_insights.py --orders 200000 --workers 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+from oop_database.insight_executor import run_insights, run_insights_serially
+from oop_database.summary_tables import SUMMARY_QUERIES
+from benchmarks.check_query_plans import QUERY_SHAPES
+from benchmarks.common import build_database, quiet_logging
+
+
+def insight_tasks(reader):
+    """The insight queries (index-backed shapes plus rollup reads) as executor tasks."""
+    tasks = [(name, lambda shape=shape: (reader.fetch_all(*shape), None)) for name, shape in QUERY_SHAPES.items()]
+    tasks += [(f"summary_{name}", lambda name=name: (reader.fetch_summary(name), None)) for name in SUMMARY_QUERIES]
+    return tasks
+
+
+def time_runs(run, tasks, repeats):
+    """Best wall-clock time over several repeats."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        results = run(tasks)
+        best = min(best, time.perf_counter() - start)
+        failed = [result.name for result in results if result.error is not None]
+        if failed:
+            raise RuntimeError(f"Insights failed: {failed}")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    quiet_logging()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_database(db_path, orders=args.orders).close()
+        reader = DatabaseManager(db_path, pool_size=args.workers, cache_size=0, read_only=True)
+        tasks = insight_tasks(reader)
+        serial = time_runs(run_insights_serially, tasks, args.repeats)
+        parallel = time_runs(lambda t: run_insights(t, max_workers=args.workers), tasks, args.repeats)
+        reader.close()
+
+    print(f"{len(tasks)} insights over {args.orders} orders")
+    print(f"Serial  : {serial * 1000:8.1f} ms")
+    print(f"Parallel: {parallel * 1000:8.1f} ms ({args.workers} workers)")
+    print(f"Speed-up: {serial / parallel:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: CRUD write latency while insight aggregations run, with the insights reading the
+primary database versus a ReadReplica. The primary uses the rollback journal, where readers
+and writers block each other.
+
+Run from the project root:
+    python benchmarks/bench_read_replica.py --orders 200000 --readers 2 --seconds 10
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+from oop_database.replica import ReadReplica
+from benchmarks.check_query_plans import QUERY_SHAPES
+from benchmarks.common import build_database, quiet_logging
+
+ORDER_COLUMNS = "order_id, customer_id, restaurant_id, order_date, status, total_amount, payment_mode"
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))] if samples else float("nan")
+
+
+def write_loop(writer, label, stop, latencies, interval):
+    """Insert one order every `interval` seconds, recording each insert's latency."""
+    i = 0
+    while not stop.is_set():
+        start = time.perf_counter()
+        writer.insert_record("Orders", ORDER_COLUMNS, (f"{label}-{i}", "c0", "r0", "2024-06-01 12:00:00", "Pending", 25.0, "UPI"))
+        latencies.append(time.perf_counter() - start)
+        i += 1
+        time.sleep(interval)
+
+
+def insight_loop(reader, stop, counter):
+    """Run the Orders aggregations back to back."""
+    while not stop.is_set():
+        for query, params in QUERY_SHAPES.values():
+            reader.fetch_all(query, params)
+            counter.append(1)
+
+
+def run(db_path, label, reader_factory, readers, seconds, interval):
+    writer = DatabaseManager(db_path, pool_size=0, cache_size=0)
+    stop = threading.Event()
+    latencies, insights = [], []
+    threads = [threading.Thread(target=write_loop, args=(writer, label, stop, latencies, interval))]
+    for _ in range(readers if reader_factory else 0):
+        threads.append(threading.Thread(target=insight_loop, args=(reader_factory(), stop, insights)))
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    print(f"{label:<20}: {len(latencies):5d} writes | p50 {percentile(latencies, 0.5) * 1000:7.2f} ms | "
+          f"p99 {percentile(latencies, 0.99) * 1000:7.2f} ms | max {max(latencies) * 1000:7.2f} ms | "
+          f"{len(insights)} insight queries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--write-interval-ms", type=float, default=5.0)
+    parser.add_argument("--max-staleness", type=float, default=2.0)
+    parser.add_argument("--pages-per-step", type=int, default=1024, help="Backup pages copied per step (-1: all).")
+    args = parser.parse_args()
+
+    quiet_logging()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        build_database(db_path, orders=args.orders).close()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("PRAGMA journal_mode = DELETE;")
+
+        interval = args.write_interval_ms / 1000
+        run(db_path, "no insights", None, 0, args.seconds, interval)
+        run(db_path, "insights on primary", lambda: DatabaseManager(db_path, pool_size=0, cache_size=0),
+            args.readers, args.seconds, interval)
+        replica = ReadReplica(db_path, max_staleness=args.max_staleness, pages_per_step=args.pages_per_step).start()
+        run(db_path, "insights on replica", lambda: replica, args.readers, args.seconds, interval)
+        print(f"replica refreshed {replica.generation} times, staleness {replica.staleness:.2f} s")
+        replica.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: record search on the Manage pages, DatabaseManager.search (FTS5 index) versus a
+LIKE '%text%' scan over the same columns, plus the index build time and size.
+
+Run from the project root:
+    python benchmarks/bench_search.py --orders 1000000
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.search_index import SEARCHABLE, index_name
+from benchmarks.common import build_database, quiet_logging
+
+# table: search text (a name, an email and an id prefix, as an operator would type them)
+SEARCHES = [
+    ("Customers", "Customer 4242"),
+    ("Customers", "c4242@example"),
+    ("Restaurants", "Owner 17"),
+    ("Orders", "o424242"),
+]
+
+
+def like_search(manager, table, text, limit):
+    """The scan the search box replaces: every word must appear in one of the columns."""
+    columns = SEARCHABLE[table]
+    words = text.split()
+    where = " AND ".join("(" + " OR ".join(f"{column} LIKE ?" for column in columns) + ")" for _ in words)
+    params = tuple(f"%{word}%" for word in words for _ in columns)
+    return manager.fetch_all(f"SELECT * FROM {table} WHERE {where} LIMIT ?;", params + (limit,))
+
+
+def best_time(function, repeats):
+    """Best wall-clock time of several calls, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    quiet_logging()
+    logging.disable(logging.WARNING)  # the LIKE scans are reported as slow queries
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        manager = build_database(db_path, orders=args.orders, summaries=False)
+        size = os.path.getsize(db_path)
+        start = time.perf_counter()
+        manager.create_search_indexes()
+        build_s = time.perf_counter() - start
+        manager.execute_query("VACUUM;")
+        print(f"{args.orders:,} orders: search indexes built in {build_s:.1f} s, "
+              f"database {size / 1e6:.0f} MB -> {os.path.getsize(db_path) / 1e6:.0f} MB")
+
+        print(f"{'table':<13}{'search':<18}{'LIKE scan':>12}{'FTS5':>10}{'matches':>9}")
+        for table, text in SEARCHES:
+            assert manager.has_search_index(table), index_name(table)
+            scan = best_time(lambda: like_search(manager, table, text, args.limit), args.repeats)
+            indexed = best_time(lambda: manager.search(table, text, args.limit), args.repeats)
+            matches = len(manager.search(table, text, args.limit))
+            print(f"{table:<13}{text:<18}{scan:9.1f} ms{indexed:7.2f} ms{matches:>9}")
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
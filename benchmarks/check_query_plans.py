@@ -0,0 +1,88 @@
+"""
+Check that the insight queries are answered through an index rather than a full table scan.
+
+Run from the project root after create_database.py:
+    python benchmarks/check_query_plans.py [--db database_scripts/zomata_database.db]
+
+Every insight_queries.build_query insight is checked over the whole history and with the order date
+window and cuisine filter the app adds, together with every `get_*` query in
+insights_visualization/queries.py when that module is importable.
+"""
+import argparse
+import inspect
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+from oop_database.insight_queries import INSIGHTS, build_query
+
+# Every parameterized insight as the app runs it over the whole history, plus the other app reads the
+# index suite covers; each entry is (query, params)
+QUERY_SHAPES = {
+    **{name: build_query(name) for name in INSIGHTS},
+    "deliveries_for_customer": ("""
+        SELECT d.delivery_id, d.delivery_time
+        FROM Orders o JOIN Deliveries d ON d.order_id = o.order_id
+        WHERE o.customer_id = ?;
+    """, ("customer",)),
+    "top_restaurants_by_rating": ("SELECT name, rating FROM Restaurants ORDER BY rating DESC LIMIT 5;", ()),
+    "highest_rated_customers": ("SELECT name, average_rating FROM Customers ORDER BY average_rating DESC LIMIT 5;", ()),
+}
+
+# Insight inputs the app also sends: an order date window and a cuisine filter
+INSIGHT_VARIANTS = {
+    "date window": {"start": "2024-01-01", "end": "2024-02-01"},
+    "cuisine": {"cuisine": ["Italian"]},
+}
+
+
+def insight_queries():
+    """Collect the query shapes, their filtered insight variants and every argument-free `get_*` query in queries.py."""
+    queries = dict(QUERY_SHAPES)
+    for variant, inputs in INSIGHT_VARIANTS.items():
+        queries.update({f"{name} ({variant})": build_query(name, **inputs) for name in INSIGHTS})
+    try:
+        from insights_visualization import queries as insight_module
+    except ImportError:
+        print("insights_visualization.queries not importable; checking the built-in query shapes only.")
+        return queries
+    for name, function in inspect.getmembers(insight_module, inspect.isfunction):
+        if name.startswith("get_") and not any(
+            p.default is p.empty for p in inspect.signature(function).parameters.values()
+        ):
+            query = function()
+            if isinstance(query, str):
+                queries[name] = (query, ())
+    return queries
+
+
+def full_scans(plan):
+    """Return the plan steps that scan a table without an index."""
+    return [step for step in plan if step.startswith("SCAN ") and " USING " not in step]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", default="database_scripts/zomata_database.db")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    manager = DatabaseManager(args.db)
+    failures = 0
+    for name, (query, params) in insight_queries().items():
+        plan = manager.explain_query_plan(query.strip().rstrip(";"), params)
+        scans = full_scans(plan)
+        failures += bool(scans)
+        print(f"{'FULL SCAN' if scans else 'OK':<10} {name}: {' | '.join(plan)}")
+    manager.close()
+
+    if failures:
+        print(f"{failures} queries fall back to a full table scan; run create_database.py to build the index suite.")
+        sys.exit(1)
+    print("All insight queries use an index.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Check that the Orders rollups (summary_tables) answer every summary insight exactly like the
+insight query over Orders, including orders whose order_date is empty or does not parse.
+
+Run from the project root:
+    python benchmarks/check_summaries.py [--orders 5000]
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.insight_queries import INSIGHTS, build_query
+from oop_database.summary_tables import SUMMARY_QUERIES, summary_query
+from benchmarks.common import build_database, quiet_logging
+
+ALL_ROWS = 10 ** 9  # top_k large enough that ties cannot change which rows are compared
+
+ORDER_COLUMNS = "order_id, customer_id, restaurant_id, order_date, status, total_amount, payment_mode, feedback_rating"
+# Orders the date rollups must leave out, as the Orders queries leave out their NULL group
+BAD_DATES = ["", "not a date", "2024-13-45 99:99:99"]
+
+
+def normalized(rows):
+    return sorted(((row[0], round(row[1], 6)) for row in rows), key=str)  # str: keys may be NULL
+
+
+def compare(manager, stage):
+    """Rollup and Orders results for every summary insight; returns the names that differ."""
+    failures = []
+    for name in SUMMARY_QUERIES:
+        if name not in INSIGHTS:
+            continue
+        rollup = normalized(manager.fetch_all(*summary_query(name, ALL_ROWS)))
+        raw = normalized(manager.fetch_all(*build_query(name, ALL_ROWS)))
+        if rollup != raw:
+            failures.append(name)
+        print(f"{'OK' if rollup == raw else 'MISMATCH':<10} {stage}: {name} ({len(raw)} rows)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=5000)
+    args = parser.parse_args()
+
+    quiet_logging()
+    logging.disable(logging.WARNING)  # the Orders aggregations are reported as slow queries
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = build_database(os.path.join(tmp, "check.db"), orders=args.orders)
+        for i, order_date in enumerate(BAD_DATES):
+            manager.insert_record("Orders", ORDER_COLUMNS,
+                                  (f"bad{i}", "c0", "r0", order_date, "Delivered", 10.0 + i, "UPI", 4.0))
+        # An order moving from a bad date to a valid one and back, and a deleted bad-date order
+        manager.update_record("Orders", "order_date = ?", "order_id = ?", ("2024-02-03 10:00:00", "bad0"))
+        manager.update_record("Orders", "order_date = ?", "order_id = ?", ("", "bad0"))
+        manager.delete_record("Orders", "order_id = ?", ("bad1",))
+
+        failures = compare(manager, "triggers")
+        manager.refresh_summary_tables()
+        failures += compare(manager, "rebuild")
+        manager.close()
+
+    if failures:
+        print(f"{len(failures)} rollup results differ from the Orders queries: {sorted(set(failures))}")
+        sys.exit(1)
+    print("Every rollup matches its Orders query.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Shared helpers for the benchmark scripts: quiet logging and reproducible synthetic databases.
+"""
+import logging
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+from database_scripts.create_database import create_database
+
+CUISINES = ["Indian", "Chinese", "Mexican", "Italian", "American"]
+STATUSES = ["Pending", "Delivered", "Cancelled"]
+PAYMENT_MODES = ["Credit Card", "Cash", "UPI"]
+VEHICLES = ["Bike", "Car", "Scooter"]
+STATES = ["CA", "TX", "NY", "FL", "IL", "PA", "OH", "GA", "NC", "MI", "WA", "AZ", "MA", "OR", "MS"]
+
+
+def quiet_logging():
+    """Silence the per-query INFO logging so it does not dominate the timings."""
+    logging.disable(logging.INFO)
+
+
+def build_database(db_path, orders=10000, seed=0, summaries=True):
+    """
+    Create a database at db_path with the project schema, indexes and synthetic rows.
+    Customers, restaurants and deliveries are scaled from the order count.
+    :return: The DatabaseManager used to load it (caller closes it).
+    """
+    rng = random.Random(seed)
+    customers = max(orders // 20, 10)
+    restaurants = max(orders // 200, 5)
+    start = datetime(2023, 1, 1)
+
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            create_database(db_path)
+        finally:
+            sys.stdout = stdout
+
+    manager = DatabaseManager(db_path)
+    manager.insert_many(
+        "Customers",
+        "customer_id, name, email, phone, location, signup_date, is_premium, preferred_cuisine, total_orders, average_rating",
+        ((f"c{i}", f"Customer {i}", f"c{i}@example.com", f"555-{i:07d}", f"{i} Main St\nCity {i % 50}, {STATES[i % len(STATES)]} {i % 99999:05d}",
+          "2023-01-01", rng.random() < 0.3, rng.choice(CUISINES), 0, round(rng.uniform(1, 5), 2))
+         for i in range(customers)),
+        defer_indexes=True,
+    )
+    manager.insert_many(
+        "Restaurants",
+        "restaurant_id, name, cuisine_type, location, owner_name, average_delivery_time, contact_number, rating, total_orders, is_active",
+        ((f"r{i}", f"Restaurant {i}", rng.choice(CUISINES), f"{i} Market St\nCity {i % 50}, {STATES[i % len(STATES)]} {i % 99999:05d}",
+          f"Owner {i}", rng.randint(20, 60), f"555-{i:07d}", round(rng.uniform(1, 5), 2), 0, True)
+         for i in range(restaurants)),
+        defer_indexes=True,
+    )
+
+    def order_rows():
+        for i in range(orders):
+            placed = start + timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+            status = rng.choice(STATUSES)
+            delivered = placed + timedelta(minutes=rng.randint(20, 120)) if status == "Delivered" else None
+            yield (f"o{i}", f"c{rng.randrange(customers)}", f"r{rng.randrange(restaurants)}",
+                   placed.strftime("%Y-%m-%d %H:%M:%S"), delivered and delivered.strftime("%Y-%m-%d %H:%M:%S"),
+                   status, round(rng.uniform(10, 200), 2), rng.choice(PAYMENT_MODES),
+                   round(rng.uniform(0, 20), 2), round(rng.uniform(1, 5), 2))
+
+    manager.insert_many(
+        "Orders",
+        "order_id, customer_id, restaurant_id, order_date, delivery_time, status, total_amount, payment_mode, discount_applied, feedback_rating",
+        order_rows(),
+        defer_indexes=True,
+    )
+
+    def delivery_rows():
+        for i in range(orders):
+            actual = rng.randint(15, 120)
+            yield (f"d{i}", f"o{i}", rng.choice(["On the way", "Delivered"]), round(rng.uniform(1, 20), 2),
+                   actual, actual + rng.randint(-10, 10), round(rng.uniform(2, 10), 2), rng.choice(VEHICLES))
+
+    manager.insert_many(
+        "Deliveries",
+        "delivery_id, order_id, delivery_status, distance, delivery_time, estimated_time, delivery_fee, vehicle_type",
+        delivery_rows(),
+        defer_indexes=True,
+    )
+    manager.create_location_dimension()
+    if summaries:
+        manager.create_summary_tables()
+    manager.analyze()
+    return manager
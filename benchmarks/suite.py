@@ -0,0 +1,289 @@
+"""
+Reproducible benchmark suite: dataset generation, bulk load, CRUD and insight latency at several
+scale factors, written to JSON, plus a comparison of two result files that flags regressions.
+
+Every scale runs offline in a temporary directory:
+  generate   generate_datasets.py --scalable with a fixed seed and --as-of date
+  bulk_load  database_scripts/create_database.py + populate_database.py (insert_data) on those CSVs
+  crud       insert_record, fetch_all (primary key lookup), update_record, delete_record,
+             get_table_data and get_table_page through DatabaseManager
+  insights   every DataInsights.fetch_and_visualize_* method, or the insight SQL
+             (benchmarks/check_query_plans.py and the summary queries) when DataInsights is not installed
+
+Each scale runs in its own process, so its peak RSS is not inflated by the previous one.
+
+Run from the project root:
+    python benchmarks/suite.py run --scales 10k 100k --out benchmarks/results/base.json
+    python benchmarks/suite.py compare benchmarks/results/base.json benchmarks/results/new.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from oop_database.database_manager import DatabaseManager
+from oop_database.summary_tables import SUMMARY_QUERIES
+from benchmarks.check_query_plans import QUERY_SHAPES
+from benchmarks.common import quiet_logging
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000, "10m": 10_000_000}
+AS_OF = "2024-12-31"
+STREAM_FROM = 1_000_000  # load larger datasets with populate_database.py --stream to bound memory
+ORDER_COLUMNS = "order_id, customer_id, restaurant_id, order_date, status, total_amount, payment_mode"
+# Metrics compared between runs (True: higher is worse). Max and p99 of a few hundred samples are
+# too noisy to gate on, and ops_per_s duplicates mean_ms.
+COMPARED = {"p50_ms": True, "p95_ms": True, "mean_ms": True, "rows_per_s": False,
+            "peak_rss_mb": True, "database_mb": True}
+INSERTED = re.compile(r"Inserted (\d+) rows into (\w+) in ([\d.]+)s")
+
+
+def peak_rss_mb(children: bool = False):
+    """Peak resident set size of this process (or of its finished children) in MB, None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    return usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def summarize(samples):
+    """Latency distribution (milliseconds) and throughput of a list of durations in seconds."""
+    ordered = sorted(samples)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000,
+        "ops_per_s": len(ordered) / sum(ordered) if sum(ordered) else None,
+    }
+
+
+def timed(function, repeats):
+    """Durations of `repeats` calls of function."""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def run_script(args, cwd):
+    """Run a project script in cwd and return its stdout, raising with its output if it fails."""
+    result = subprocess.run([sys.executable] + args, cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stdout[-2000:]}\n{result.stderr[-2000:]}")
+    return result.stdout
+
+
+def bench_generate(workdir, orders, seed, workers):
+    counts = {"customers": max(orders // 20, 10), "restaurants": max(orders // 200, 5),
+              "orders": orders, "deliveries": orders}
+    start = time.perf_counter()
+    run_script([
+        os.path.join(ROOT, "generate_datasets.py"), "--scalable", "--seed", str(seed), "--as-of", AS_OF,
+        "--workers", str(workers), *[f"--{table}={count}" for table, count in counts.items()],
+    ], workdir)
+    elapsed = time.perf_counter() - start
+    rows = sum(counts.values())
+    return {"rows": rows, "seconds": elapsed, "rows_per_s": rows / elapsed, "peak_rss_mb": peak_rss_mb(children=True)}
+
+
+def bench_bulk_load(workdir, stream):
+    run_script([os.path.join(ROOT, "database_scripts", "create_database.py")], workdir)
+    start = time.perf_counter()
+    output = run_script([os.path.join(ROOT, "database_scripts", "populate_database.py")] + (["--stream"] if stream else []),
+                        workdir)
+    elapsed = time.perf_counter() - start
+    tables = {
+        table: {"rows": int(rows), "seconds": float(seconds), "rows_per_s": int(rows) / float(seconds) if float(seconds) else None}
+        for rows, table, seconds in INSERTED.findall(output)
+    }
+    rows = sum(table["rows"] for table in tables.values())
+    return {"rows": rows, "seconds": elapsed, "rows_per_s": rows / elapsed, "tables": tables,
+            "peak_rss_mb": peak_rss_mb(children=True)}
+
+
+def bench_crud(db_path, operations, seed):
+    rng = random.Random(seed)
+    manager = DatabaseManager(db_path)
+    customers = [row[0] for row in manager.fetch_all("SELECT customer_id FROM Customers LIMIT 1000;")]
+    restaurants = [row[0] for row in manager.fetch_all("SELECT restaurant_id FROM Restaurants LIMIT 1000;")]
+    order_ids = [f"bench-{i}" for i in range(operations)]
+    ids = iter(order_ids)
+
+    results = {
+        "insert_record": timed(lambda: manager.insert_record("Orders", ORDER_COLUMNS, (
+            next(ids), rng.choice(customers), rng.choice(restaurants), "2024-06-01 12:00:00", "Pending",
+            round(rng.uniform(5, 200), 2), "UPI")), operations),
+        "fetch_all": timed(lambda: manager.fetch_all(
+            "SELECT * FROM Orders WHERE order_id = ?;", (rng.choice(order_ids),)), operations),
+        "update_record": timed(lambda: manager.update_record(
+            "Orders", "status = ?", "order_id = ?", ("Delivered", rng.choice(order_ids))), operations),
+        "get_table_data": timed(lambda: manager.get_table_data("Restaurants"), max(operations // 100, 3)),
+        "get_table_page": timed(lambda: manager.get_table_page("Orders", limit=50, order_by="order_date"),
+                                max(operations // 10, 3)),
+    }
+    ids = iter(order_ids)
+    results["delete_record"] = timed(lambda: manager.delete_record("Orders", "order_id = ?", (next(ids),)), operations)
+    manager.close()
+    return {name: summarize(samples) for name, samples in results.items()}
+
+
+def insight_tasks(db_path):
+    """(name, callable) for every insight: DataInsights methods when available, else the insight SQL."""
+    try:
+        from insights_visualization.data_insights import DataInsights
+    except ImportError:
+        DataInsights = None
+    if DataInsights is not None:
+        insights = DataInsights(db_path)
+        return "DataInsights", [
+            (name, getattr(insights, name)) for name in sorted(dir(insights)) if name.startswith("fetch_and_visualize_")
+        ], None
+    reader = DatabaseManager(db_path, cache_size=0, read_only=True)
+    tasks = [(name, lambda shape=shape: reader.fetch_all(*shape)) for name, shape in QUERY_SHAPES.items()]
+    tasks += [(f"summary_{name}", lambda name=name: reader.fetch_summary(name)) for name in SUMMARY_QUERIES]
+    return "sql", tasks, reader
+
+
+def bench_insights(db_path, repeats):
+    source, tasks, reader = insight_tasks(db_path)
+    results = {"source": source}
+    for name, task in tasks:
+        task()  # warm the page cache
+        results[name] = summarize(timed(task, repeats))
+    if reader is not None:
+        reader.close()
+    return results
+
+
+def run_scale(scale, orders, seed, operations, repeats, workers):
+    """All phases for one scale factor, in a fresh temporary directory."""
+    quiet_logging()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, "database_scripts"))
+        db_path = os.path.join(workdir, "database_scripts", "zomata_database.db")
+        result = {"orders": orders, "phases": {}}
+        result["phases"]["generate"] = bench_generate(workdir, orders, seed, workers)
+        result["phases"]["bulk_load"] = bench_bulk_load(workdir, stream=orders >= STREAM_FROM)
+        result["phases"]["crud"] = bench_crud(db_path, operations, seed)
+        result["phases"]["insights"] = bench_insights(db_path, repeats)
+        result["database_mb"] = os.path.getsize(db_path) / (1024 * 1024)
+        result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def run(args):
+    results = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "seed": args.seed,
+        },
+        "scales": {},
+    }
+    context = multiprocessing.get_context("spawn")
+    for scale in args.scales:
+        print(f"Running scale {scale} ({SCALES[scale]} orders)...", flush=True)
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results["scales"][scale] = executor.submit(
+                run_scale, scale, SCALES[scale], args.seed, args.operations, args.repeats, args.workers
+            ).result()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as output:
+        json.dump(results, output, indent=2)
+    print(f"Results written to '{args.out}'")
+
+
+def flatten(node, prefix=""):
+    """{"100k/crud/insert_record/p95_ms": value, ...} for every numeric metric in a result file."""
+    metrics = {}
+    for key, value in node.items():
+        path = f"{prefix}/{key}" if prefix else key
+        if isinstance(value, dict):
+            metrics.update(flatten(value, path))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            metrics[path] = value
+    return metrics
+
+
+def compare(args):
+    with open(args.base) as base_file, open(args.new) as new_file:
+        base = flatten(json.load(base_file)["scales"])
+        new = flatten(json.load(new_file)["scales"])
+
+    regressions = 0
+    print(f"{'metric':<60}{'base':>12}{'new':>12}{'change':>10}")
+    for path in sorted(base.keys() & new.keys()):
+        metric = path.rsplit("/", 1)[-1]
+        if metric not in COMPARED:
+            continue
+        higher_is_worse = COMPARED[metric]
+        old, current = base[path], new[path]
+        if not old:
+            continue
+        change = (current - old) / old
+        worse = change > args.threshold if higher_is_worse else change < -args.threshold
+        if metric.endswith("_ms") and abs(current - old) < args.min_ms:
+            worse = False  # sub-noise differences on very fast operations
+        if worse or args.all:
+            flag = "  REGRESSION" if worse else ""
+            print(f"{path:<60}{old:12.3f}{current:12.3f}{change:+9.1%}{flag}")
+        regressions += worse
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the suite and write a JSON result file.")
+    run_parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["10k", "100k"])
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--operations", type=int, default=1000, help="Operations per CRUD benchmark.")
+    run_parser.add_argument("--repeats", type=int, default=5, help="Runs per insight.")
+    run_parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Dataset generator processes.")
+    run_parser.add_argument("--out", default=os.path.join(
+        "benchmarks", "results", f"suite-{datetime.now():%Y%m%d-%H%M%S}.json"))
+
+    compare_parser = commands.add_parser("compare", help="Compare two result files and flag regressions.")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression.")
+    compare_parser.add_argument("--min-ms", type=float, default=0.05, help="Ignore latency changes smaller than this.")
+    compare_parser.add_argument("--all", action="store_true", help="Print every metric, not just regressions.")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,6 @@
 import sqlite3
 import os
 
-# Define the output folder and database file
-output_folder = "database_scripts"
-os.makedirs(output_folder, exist_ok=True)
-database_file = os.path.join(output_folder, "zomata_database.db")
-
-# Connect to SQLite database (or create one if it doesn't exist)
-conn = sqlite3.connect(database_file)
-cursor = conn.cursor()
-
 # Define table schemas
 schemas = {
     "Customers": """
@@ -72,31 +63,93 @@ schemas = {
     
 }
 
-# Create tables in the database
-for table_name, schema in schemas.items():
-    cursor.execute(schema)
-    print(f"Table '{table_name}' created successfully.")
-    
-    # Add new columns if not already present
-    if table_name == "Customers":
-        # Check if column exists before adding it
-        cursor.execute(f"PRAGMA table_info({table_name});")
-        columns = [col[1] for col in cursor.fetchall()]
+# Define indexes for the foreign keys and date expressions used by the insight queries.
+# The foreign key indexes carry the aggregated columns so per-customer and per-restaurant
+# rollups are answered from the index alone.
+indexes = {
+    "idx_orders_customer": """
+        CREATE INDEX IF NOT EXISTS idx_orders_customer
+        ON Orders (customer_id, total_amount, feedback_rating);
+    """,
+    "idx_orders_restaurant": """
+        CREATE INDEX IF NOT EXISTS idx_orders_restaurant
+        ON Orders (restaurant_id, total_amount, feedback_rating);
+    """,
+    "idx_orders_order_date": """
+        CREATE INDEX IF NOT EXISTS idx_orders_order_date ON Orders (order_date);
+    """,
+    "idx_orders_hour": """
+        CREATE INDEX IF NOT EXISTS idx_orders_hour ON Orders (strftime('%H', order_date));
+    """,
+    "idx_orders_weekday": """
+        CREATE INDEX IF NOT EXISTS idx_orders_weekday ON Orders (strftime('%w', order_date));
+    """,
+    "idx_orders_year_month": """
+        CREATE INDEX IF NOT EXISTS idx_orders_year_month ON Orders (strftime('%Y-%m', order_date));
+    """,
+    "idx_deliveries_order": """
+        CREATE INDEX IF NOT EXISTS idx_deliveries_order ON Deliveries (order_id);
+    """,
+    "idx_restaurants_rating": """
+        CREATE INDEX IF NOT EXISTS idx_restaurants_rating ON Restaurants (rating);
+    """,
+    "idx_restaurants_cuisine": """
+        CREATE INDEX IF NOT EXISTS idx_restaurants_cuisine ON Restaurants (cuisine_type);
+    """,
+    "idx_customers_rating": """
+        CREATE INDEX IF NOT EXISTS idx_customers_rating ON Customers (average_rating);
+    """,
+}
+
+def create_database(database_file):
+    """
+    Creates the tables and indexes in the given SQLite database file (or creates the file).
+    """
+    # Connect to SQLite database (or create one if it doesn't exist)
+    conn = sqlite3.connect(database_file)
+    cursor = conn.cursor()
+
+    # Create tables in the database
+    for table_name, schema in schemas.items():
+        cursor.execute(schema)
+        print(f"Table '{table_name}' created successfully.")
         
-        if "new_column_name" not in columns:
-            try:
-                cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN new_column_name TEXT;")
-                print(f"New column added to '{table_name}'")
-            except sqlite3.OperationalError:
-                # If there was any issue (e.g., column already exists), catch and print error
-                print(f"Failed to add column to '{table_name}'.")
-    
-    # Prevent duplicate entries by using INSERT OR IGNORE when inserting data
-    # Example: cursor.execute("INSERT OR IGNORE INTO Customers VALUES (...);")
-    # This ensures that duplicate records will not be inserted.
+        # Add new columns if not already present
+        if table_name == "Customers":
+            # Check if column exists before adding it
+            cursor.execute(f"PRAGMA table_info({table_name});")
+            columns = [col[1] for col in cursor.fetchall()]
+            
+            if "new_column_name" not in columns:
+                try:
+                    cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN new_column_name TEXT;")
+                    print(f"New column added to '{table_name}'")
+                except sqlite3.OperationalError:
+                    # If there was any issue (e.g., column already exists), catch and print error
+                    print(f"Failed to add column to '{table_name}'.")
+        
+        # Prevent duplicate entries by using INSERT OR IGNORE when inserting data
+        # Example: cursor.execute("INSERT OR IGNORE INTO Customers VALUES (...);")
+        # This ensures that duplicate records will not be inserted.
+
+    # Drop the month-of-year index that idx_orders_year_month replaced (the insights group by '%Y-%m')
+    cursor.execute("DROP INDEX IF EXISTS idx_orders_month;")
+
+    # Create indexes and refresh the query planner statistics
+    for index_name, index_sql in indexes.items():
+        cursor.execute(index_sql)
+        print(f"Index '{index_name}' created successfully.")
+    cursor.execute("ANALYZE;")
+
+    # Commit and close the connection
+    conn.commit()
+    conn.close()
+
+    print(f"Database created and tables initialized in '{database_file}'")
 
-# Commit and close the connection
-conn.commit()
-conn.close()
 
-print(f"Database created and tables initialized in '{database_file}'")
+if __name__ == "__main__":
+    # Define the output folder and database file
+    output_folder = "database_scripts"
+    os.makedirs(output_folder, exist_ok=True)
+    create_database(os.path.join(output_folder, "zomata_database.db"))
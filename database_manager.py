@@ -1,18 +1,632 @@
 import sqlite3
+import json
 import logging
-from typing import List, Tuple, Union
+import os
+import pathlib
+import queue
+import re
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict, deque, namedtuple
+from concurrent.futures import Future
+from contextlib import closing, contextmanager
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from . import insight_queries, locations, search_index, snapshots, summary_tables, text_export
+
+if TYPE_CHECKING:  # numpy and pandas are imported lazily by the methods that need them
+    import numpy as np
+    import pandas as pd
+
+
+def typed_column(values: Tuple):
+    """
+    NumPy array for one column of a fetched batch: int64 for integers, float64 for numbers
+    (NULL as NaN), and object for text, blobs or mixed values.
+    """
+    import numpy as np
+
+    kinds = set(map(type, values))
+    try:
+        if kinds == {int}:
+            return np.fromiter(values, dtype=np.int64, count=len(values))
+        if kinds <= {int, float, type(None)}:
+            return np.array(values, dtype=np.float64)
+    except OverflowError:
+        pass  # Integers beyond int64 stay Python ints
+    return np.array(values, dtype=object)
+
+
+class ConnectionPool:
+    """Thread-safe pool of SQLite connections with per-thread reuse."""
+
+    DEFAULT_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -20000,
+        "mmap_size": 268435456,
+    }
+
+    def __init__(self, db_path: str, size: int = 5, timeout: float = 30.0,
+                 health_check_interval: float = 30.0,
+                 pragmas: Optional[Dict[str, Union[str, int]]] = None, read_only: bool = False):
+        """
+        Initialize the pool. Connections are opened lazily, up to `size` at a time.
+        :param db_path: Path to the SQLite database file.
+        :param size: Maximum number of open connections.
+        :param timeout: Seconds to wait for a free connection or a database lock.
+        :param health_check_interval: Idle seconds after which a connection is pinged before reuse.
+        :param pragmas: PRAGMAs applied once to every new connection (defaults to DEFAULT_PRAGMAS).
+        :param read_only: Open connections with mode=ro so they can never write.
+        """
+        if size < 1:
+            raise ValueError("Connection pool size must be at least 1.")
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.pragmas = dict(self.DEFAULT_PRAGMAS if pragmas is None else pragmas)
+        self.read_only = read_only
+        if read_only:
+            # The journal mode is a property of the file and can only be changed by a writer
+            self.pragmas.pop("journal_mode", None)
+        self.logger = logging.getLogger(__name__)
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._local = threading.local()
+        self._closed = False
+
+    def _open(self) -> sqlite3.Connection:
+        """Open a new connection and apply the configured PRAGMAs."""
+        try:
+            if self.read_only:
+                uri = f"{pathlib.Path(self.db_path).absolute().as_uri()}?mode=ro"
+                conn = sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+            else:
+                conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            for name, value in self.pragmas.items():
+                conn.execute(f"PRAGMA {name} = {value};")
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to connect to database: {e}")
+            raise
+        self.logger.info(f"Opened pooled connection to '{self.db_path}' with PRAGMAs: {self.pragmas}")
+        return conn
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        """Check that a connection still answers queries."""
+        try:
+            conn.execute("SELECT 1;").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        """Close a connection that is leaving the pool."""
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Failed to close pooled connection: {e}")
+
+    def _checkout(self) -> sqlite3.Connection:
+        """Take an idle connection (or open a new one) once a pool slot is free."""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise sqlite3.OperationalError(f"Timed out waiting for one of {self.size} pooled connections.")
+        try:
+            while True:
+                try:
+                    conn, last_used = self._idle.get_nowait()
+                except queue.Empty:
+                    return self._open()
+                if time.monotonic() - last_used < self.health_check_interval or self._is_healthy(conn):
+                    return conn
+                self.logger.warning("Discarding unhealthy pooled connection.")
+                self._discard(conn)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _checkin(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, rolling back any unfinished transaction."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                self._discard(conn)
+            else:
+                self._idle.put((conn, time.monotonic()))
+        except sqlite3.Error:
+            self._discard(conn)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection for the duration of a `with` block.
+        Nested checkouts on the same thread reuse the connection already held.
+        """
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            try:
+                yield held
+            finally:
+                self._local.depth -= 1
+            return
+
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed.")
+        conn = self._checkout()
+        self._local.conn, self._local.depth = conn, 1
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._checkin(conn)
+
+    @contextmanager
+    def dedicated(self):
+        """
+        Check out a connection for a `with` block without sharing it through the thread's slot.
+        Nested connection() calls on the thread never reuse it, so it can be held across the
+        yields of a generator that may be closed late, by the garbage collector or on another thread.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed.")
+        conn = self._checkout()
+        try:
+            yield conn
+        finally:
+            self._checkin(conn)
+
+    def close(self) -> None:
+        """Close all idle connections; checked-out connections are closed when returned."""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+
+class QueryCache:
+    """LRU cache of query results with a TTL, invalidated per table on writes."""
+
+    READ_TABLES = re.compile(r"\b(?:FROM|JOIN)\s+[\"`\[]?(\w+)", re.IGNORECASE)
+    WRITE_TABLE = re.compile(
+        r"^\s*(?:INSERT(?:\s+OR\s+\w+)?\s+INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?|DELETE\s+FROM"
+        r"|DROP\s+TABLE(?:\s+IF\s+EXISTS)?|ALTER\s+TABLE)\s+[\"`\[]?(\w+)",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, db_path: str, max_entries: int = 256, ttl: float = 300.0,
+                 dependencies: Optional[Dict[str, Iterable[str]]] = None):
+        """
+        Initialize the cache.
+        :param db_path: Path to the SQLite database file, watched for writes from other connections.
+        :param max_entries: Maximum cached results before the least recently used one is evicted.
+        :param ttl: Seconds a cached result stays valid.
+        :param dependencies: Tables written by triggers when a given table changes
+            (e.g., {"Orders": ["_orders_by_hour"]}).
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.dependencies = {
+            source.lower(): {table.lower() for table in derived} for source, derived in (dependencies or {}).items()
+        }
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+        self.db_path = db_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._data_version = None
+
+    def _read_data_version(self) -> int:
+        """PRAGMA data_version changes whenever another connection commits to the database."""
+        if self._watcher is None:
+            self._watcher = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._watcher.execute("PRAGMA data_version;").fetchone()[0]
+
+    @classmethod
+    def tables_read(cls, query: str) -> frozenset:
+        """Tables referenced by the FROM/JOIN clauses of a query."""
+        return frozenset(name.lower() for name in cls.READ_TABLES.findall(query))
+
+    @classmethod
+    def table_written(cls, query: str) -> Optional[str]:
+        """Table modified by a write statement, or None if it cannot be determined."""
+        match = cls.WRITE_TABLE.match(query)
+        return match.group(1).lower() if match else None
+
+    def get(self, key: Tuple) -> Optional[List[Tuple]]:
+        """Return a cached result, or None on a miss."""
+        with self._lock:
+            version = self._read_data_version()
+            if version != self._data_version:
+                self._data_version = version
+                self.invalidations += len(self._entries)
+                self._entries.clear()
+            entry = self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: Tuple, rows: List[Tuple]) -> None:
+        """Cache a result under its query and parameters."""
+        with self._lock:
+            self._entries[key] = (self.tables_read(key[0]), time.monotonic() + self.ttl, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, table_name: Optional[str] = None) -> None:
+        """
+        Drop cached results that read a table (or every result when table_name is None)
+        after a write made through this process.
+        """
+        tables = None
+        if table_name is not None:
+            tables = {table_name.lower()} | self.dependencies.get(table_name.lower(), set())
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if tables is None or tables & entry[0]]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+            self._data_version = self._read_data_version()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Hit/miss counters for tuning the cache size and TTL."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def close(self) -> None:
+        """Close the data_version watcher connection."""
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+
+class QueryProfiler:
+    """Per-query-fingerprint latency histograms, caller row counts and a slow query log."""
+
+    LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+    PLACEHOLDER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+    SAMPLES_PER_QUERY = 1000
+
+    def __init__(self, slow_query_ms: float = 200.0, slow_log_size: int = 50):
+        """
+        Initialize the profiler.
+        :param slow_query_ms: Calls slower than this are logged with their query plan.
+        :param slow_log_size: Number of recent slow queries kept for the Performance page.
+        """
+        self.slow_query_ms = slow_query_ms
+        self.slow_queries = deque(maxlen=slow_log_size)
+        self._stats = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    @classmethod
+    def fingerprint(cls, query: str) -> str:
+        """Normalize a query so calls that differ only in literals share one fingerprint."""
+        normalized = cls.LITERALS.sub("?", query)
+        normalized = cls.PLACEHOLDER_LISTS.sub("(?...)", normalized)
+        return " ".join(normalized.split()).rstrip(";")
+
+    @staticmethod
+    def _caller() -> str:
+        """The first function on the stack outside this module."""
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename == __file__:
+            frame = frame.f_back
+        if frame is None:
+            return "unknown"
+        return f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}"
+
+    @staticmethod
+    def _percentile(sorted_samples: List[float], fraction: float) -> float:
+        """Nearest-rank percentile of pre-sorted samples."""
+        index = max(0, min(len(sorted_samples) - 1, int(round(fraction * len(sorted_samples) + 0.5)) - 1))
+        return sorted_samples[index]
+
+    def record(self, conn: sqlite3.Connection, query: str, params: Tuple, elapsed: float, rows: int) -> None:
+        """
+        Record one call; slow calls are logged with EXPLAIN QUERY PLAN run on the same connection.
+        :param conn: Connection the query ran on.
+        :param query: SQL query string.
+        :param params: Tuple of parameters for the query.
+        :param elapsed: Wall-clock seconds spent in SQLite.
+        :param rows: Rows fetched or affected.
+        """
+        key = self.fingerprint(query)
+        caller = self._caller()
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = {
+                    "calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0,
+                    "samples": deque(maxlen=self.SAMPLES_PER_QUERY), "callers": Counter(),
+                }
+            elapsed_ms = elapsed * 1000
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["rows"] += max(rows, 0)
+            stats["samples"].append(elapsed_ms)
+            stats["callers"][caller] += max(rows, 0)
+
+        if elapsed_ms < self.slow_query_ms:
+            return
+        try:
+            plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()]
+        except sqlite3.Error:
+            plan = []
+        self.slow_queries.append({
+            "query": key, "elapsed_ms": round(elapsed_ms, 3), "rows": rows, "caller": caller,
+            "plan": plan, "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        self.logger.warning(
+            f"Slow query ({elapsed_ms:.1f} ms, {rows} rows, from {caller}): {key} | Plan: {' | '.join(plan)}"
+        )
+
+    def report(self) -> Dict:
+        """
+        Snapshot of the collected statistics, slowest total time first.
+        :return: Dictionary with a "queries" list and the recent "slow_queries".
+        """
+        with self._lock:
+            queries = []
+            for key, stats in self._stats.items():
+                samples = sorted(stats["samples"])
+                queries.append({
+                    "fingerprint": key,
+                    "calls": stats["calls"],
+                    "total_ms": round(stats["total_ms"], 3),
+                    "mean_ms": round(stats["total_ms"] / stats["calls"], 3),
+                    "p50_ms": round(self._percentile(samples, 0.50), 3),
+                    "p95_ms": round(self._percentile(samples, 0.95), 3),
+                    "p99_ms": round(self._percentile(samples, 0.99), 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                    "rows": stats["rows"],
+                    "rows_by_caller": dict(stats["callers"]),
+                })
+            slow_queries = list(self.slow_queries)
+        queries.sort(key=lambda entry: entry["total_ms"], reverse=True)
+        return {"slow_query_ms": self.slow_query_ms, "queries": queries, "slow_queries": slow_queries}
+
+    def reset(self) -> None:
+        """Discard all collected statistics."""
+        with self._lock:
+            self._stats.clear()
+            self.slow_queries.clear()
+
+
+class SchemaCatalog:
+    """In-memory copy of the database schema, reloaded whenever PRAGMA schema_version changes."""
+
+    DDL = re.compile(r"^\s*(?:CREATE|ALTER|DROP)\b", re.IGNORECASE)
+
+    Column = namedtuple("Column", ["name", "type", "not_null", "default", "primary_key"])
+    ForeignKey = namedtuple("ForeignKey", ["column", "references_table", "references_column"])
+    Table = namedtuple("Table", ["name", "columns", "primary_key", "foreign_keys", "indexes"])
+
+    def __init__(self):
+        self.loads = 0
+        self._tables = None
+        self._schema_version = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def is_ddl(cls, query: str) -> bool:
+        """Whether a statement can change the schema."""
+        return bool(cls.DDL.match(query))
+
+    def invalidate(self) -> None:
+        """Forget the cached schema; the next lookup reloads it."""
+        with self._lock:
+            self._tables = None
+
+    def tables(self, conn: sqlite3.Connection) -> Dict[str, "SchemaCatalog.Table"]:
+        """
+        Tables keyed by name, reloaded only if the schema changed since the last call.
+        :param conn: Connection used to check PRAGMA schema_version (and to reload if needed).
+        """
+        schema_version = conn.execute("PRAGMA schema_version;").fetchone()[0]
+        with self._lock:
+            if self._tables is None or schema_version != self._schema_version:
+                self._tables = self._load(conn)
+                self._schema_version = schema_version
+                self.loads += 1
+            return self._tables
+
+    @classmethod
+    def _load(cls, conn: sqlite3.Connection) -> Dict[str, "SchemaCatalog.Table"]:
+        tables = {}
+        names = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY rowid;"
+        ).fetchall()
+        for (name,) in names:
+            columns = [
+                cls.Column(col[1], col[2], bool(col[3]), col[4], col[5])
+                for col in conn.execute(f'PRAGMA table_info("{name}");')
+            ]
+            primary_key = tuple(col.name for col in sorted(columns, key=lambda col: col.primary_key)
+                                if col.primary_key)
+            foreign_keys = [
+                cls.ForeignKey(fk[3], fk[2], fk[4]) for fk in conn.execute(f'PRAGMA foreign_key_list("{name}");')
+            ]
+            indexes = [index[1] for index in conn.execute(f'PRAGMA index_list("{name}");')]
+            tables[name] = cls.Table(name, columns, primary_key, foreign_keys, indexes)
+        return tables
+
+
+class GroupCommitWriter:
+    """Background thread that commits queued writes in groups of max_records or every max_delay_ms."""
+
+    _FLUSH = "flush"
+    _STOP = "stop"
+
+    def __init__(self, manager: "DatabaseManager", max_records: int = 500, max_delay_ms: float = 10.0):
+        """
+        Start the writer thread.
+        :param manager: DatabaseManager whose connections, cache and profiler the writer uses.
+        :param max_records: Commit as soon as this many writes are queued.
+        :param max_delay_ms: Commit at most this long after the first write of a group was queued.
+        """
+        if max_records < 1:
+            raise ValueError("max_records must be at least 1.")
+        self.manager = manager
+        self.max_records = max_records
+        self.max_delay = max_delay_ms / 1000
+        self.groups = self.records = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="group-commit-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, query: str, params: Tuple = ()) -> Future:
+        """
+        Queue a write statement.
+        :return: Future resolving to None once the write is committed, or raising its sqlite3.Error.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("GroupCommitWriter is closed.")
+            self._queue.put((query, tuple(params), future))
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Block until every write submitted so far is committed."""
+        future = Future()
+        self._queue.put((self._FLUSH, (), future))
+        future.result(timeout)
+
+    def close(self) -> None:
+        """Commit everything still queued and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put((self._STOP, (), Future()))
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            group = [self._queue.get()]
+            deadline = time.monotonic() + self.max_delay
+            while group[-1][0] not in (self._FLUSH, self._STOP) and len(group) < self.max_records:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    group.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            writes = [item for item in group if item[0] not in (self._FLUSH, self._STOP)]
+            if writes:
+                self._commit(writes)
+            for query, _, future in group:
+                if query in (self._FLUSH, self._STOP):
+                    future.set_result(None)
+            if group[-1][0] == self._STOP:
+                return
+
+    def _commit(self, writes: List[Tuple]) -> None:
+        """Commit a group in one transaction; if it fails, retry each write in its own savepoint."""
+        errors = {}
+        try:
+            with self.manager._connect() as conn:
+                start = time.perf_counter()
+                try:
+                    conn.execute("BEGIN IMMEDIATE;")
+                    for query, params, _ in writes:
+                        conn.execute(query, params)
+                    conn.commit()
+                except sqlite3.Error:
+                    conn.rollback()
+                    conn.execute("BEGIN IMMEDIATE;")
+                    for index, (query, params, _) in enumerate(writes):
+                        conn.execute("SAVEPOINT group_write;")
+                        try:
+                            conn.execute(query, params)
+                        except sqlite3.Error as e:
+                            conn.execute("ROLLBACK TO group_write;")
+                            errors[index] = e
+                            self.manager.logger.error(f"Database error: {e} | Query: {query} | Params: {params}")
+                        conn.execute("RELEASE group_write;")
+                    conn.commit()
+                self.manager.profiler.record(conn, writes[0][0], writes[0][1], time.perf_counter() - start, len(writes))
+        except sqlite3.Error as e:
+            self.manager.logger.error(f"Group commit of {len(writes)} writes failed: {e}")
+            errors = dict.fromkeys(range(len(writes)), e)
+        finally:
+            for query in {query for query, _, _ in writes}:
+                self.manager._invalidate_cache(query)
+
+        self.groups += 1
+        self.records += len(writes)
+        for index, (_, _, future) in enumerate(writes):
+            if index in errors:
+                future.set_exception(errors[index])
+            else:
+                future.set_result(None)
 
 
 class DatabaseManager:
     """Encapsulates database operations in a reusable and scalable manner."""
 
-    def __init__(self, db_path="database_scripts/zomata_database.db"):
+    def __init__(self, db_path="database_scripts/zomata_database.db", pool_size: int = 5,
+                 pragmas: Optional[Dict[str, Union[str, int]]] = None,
+                 cache_size: int = 256, cache_ttl: float = 300.0, read_only: bool = False,
+                 slow_query_ms: float = 200.0, group_commit_size: int = 500,
+                 group_commit_ms: float = 10.0):
         """
         Initialize the database connection.
         :param db_path: Path to the SQLite database file.
+        :param pool_size: Maximum pooled connections; 0 opens a fresh connection per call.
+        :param pragmas: PRAGMAs applied to each pooled connection (see ConnectionPool.DEFAULT_PRAGMAS).
+        :param cache_size: Maximum results kept by the query cache; 0 disables caching.
+        :param cache_ttl: Seconds a cached result stays valid.
+        :param read_only: Open pooled connections read-only (e.g., for concurrent insight workers).
+        :param slow_query_ms: Queries slower than this are logged with their EXPLAIN QUERY PLAN.
+        :param group_commit_size: Records per transaction for enqueue_record.
+        :param group_commit_ms: Maximum milliseconds an enqueued record waits for its group to fill.
         """
         self.db_path = db_path
         self._setup_logging()
+        self._pool = ConnectionPool(
+            db_path, size=pool_size, pragmas=pragmas, read_only=read_only
+        ) if pool_size > 0 else None
+        self._cache = QueryCache(
+            db_path, max_entries=cache_size, ttl=cache_ttl,
+            dependencies={"Orders": summary_tables.SUMMARIES},
+        ) if cache_size > 0 else None
+        self.profiler = QueryProfiler(slow_query_ms=slow_query_ms)
+        self.catalog = SchemaCatalog()
+        self.group_commit_size = group_commit_size
+        self.group_commit_ms = group_commit_ms
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._location_ids = {}
 
     def _setup_logging(self):
         """Setup logging configuration."""
@@ -23,13 +637,66 @@ class DatabaseManager:
         )
         self.logger = logging.getLogger(__name__)
 
-    def _connect(self):
-        """Establish a connection to the SQLite database."""
+    @contextmanager
+    def _connect(self, dedicated: bool = False):
+        """
+        Provide a connection to the SQLite database, pooled unless pool_size is 0.
+        :param dedicated: Take a pooled connection of its own instead of the one held by the thread.
+        """
+        if self._pool is not None:
+            with (self._pool.dedicated() if dedicated else self._pool.connection()) as conn:
+                yield conn
+            return
+
         try:
-            return sqlite3.connect(self.db_path)
+            conn = sqlite3.connect(self.db_path)
         except sqlite3.Error as e:
             self.logger.error(f"Failed to connect to database: {e}")
             raise
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def close(self) -> None:
+        """Commit queued records, then close all pooled connections."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._pool is not None:
+            self._pool.close()
+        if self._cache is not None:
+            self._cache.close()
+
+    def _invalidate_cache(self, query: str) -> None:
+        """Drop cached results made stale by a write statement."""
+        if self._cache is not None:
+            self._cache.invalidate(QueryCache.table_written(query))
+        if SchemaCatalog.is_ddl(query):
+            self.catalog.invalidate()
+
+    def profile_report(self) -> Dict:
+        """
+        Query timing statistics per fingerprint (p50/p95/p99, rows per caller) and recent slow queries.
+        :return: Dictionary produced by QueryProfiler.report.
+        """
+        return self.profiler.report()
+
+    def dump_profile(self, path: str) -> None:
+        """
+        Write the query timing statistics to a JSON file.
+        :param path: Output file path.
+        """
+        with open(path, "w") as output:
+            json.dump(self.profile_report(), output, indent=2)
+        self.logger.info(f"Query profile written to '{path}'")
+
+    def cache_stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Query cache counters.
+        :return: Dictionary of entries, hits, misses, hit_rate, evictions and invalidations.
+        """
+        return self._cache.stats() if self._cache is not None else {}
 
     def execute_query(self, query: str, params: Tuple = ()) -> None:
         """
@@ -40,31 +707,139 @@ class DatabaseManager:
         try:
             with self._connect() as conn:
                 cursor = conn.cursor()
+                start = time.perf_counter()
                 cursor.execute(query, params)
                 conn.commit()
+                self.profiler.record(conn, query, params, time.perf_counter() - start, cursor.rowcount)
                 self.logger.info(f"Query executed successfully: {query} | Params: {params}")
         except sqlite3.Error as e:
             self.logger.error(f"Database error: {e} | Query: {query} | Params: {params}")
             raise
+        finally:
+            self._invalidate_cache(query)
 
-    def fetch_all(self, query: str, params: Tuple = ()) -> List[Tuple]:
+    def fetch_all(self, query: str, params: Tuple = (), use_cache: bool = False) -> List[Tuple]:
         """
         Fetch all rows for a given query.
         :param query: SQL query string.
         :param params: Tuple of parameters for the query.
+        :param use_cache: Serve repeated reads from the query cache until a write touches their tables.
         :return: List of rows.
         """
+        if use_cache and self._cache is not None:
+            key = (query, tuple(params))
+            rows = self._cache.get(key)
+            if rows is None:
+                rows = self.fetch_all(query, params)
+                self._cache.put(key, rows)
+            return list(rows)
+
         try:
             with self._connect() as conn:
                 cursor = conn.cursor()
+                start = time.perf_counter()
                 cursor.execute(query, params)
                 rows = cursor.fetchall()
+                self.profiler.record(conn, query, params, time.perf_counter() - start, len(rows))
                 self.logger.info(f"Fetched {len(rows)} rows for query: {query} | Params: {params}")
                 return rows
         except sqlite3.Error as e:
             self.logger.error(f"Database error: {e} | Query: {query} | Params: {params}")
             raise
 
+    def _fetch_batches(self, query: str, params: Tuple, batch_size: int,
+                       names: Optional[List[str]] = None) -> Iterator[List[Tuple]]:
+        """
+        Yield rows batch_size at a time, holding one connection until exhausted or closed.
+        The connection is a dedicated one, never the thread's shared pooled connection: a generator
+        abandoned mid-result is only finalized later, and must not return a connection other code
+        on the thread is still using. Callers that consume it themselves close it explicitly.
+        The result's column names are appended to `names` once the query has run.
+        """
+        try:
+            with self._connect(dedicated=True) as conn:
+                cursor = conn.cursor()
+                cursor.arraysize = batch_size
+                start = time.perf_counter()
+                cursor.execute(query, params)
+                if names is not None:
+                    names.extend(column[0] for column in cursor.description or ())
+                count = 0
+                try:
+                    while True:
+                        rows = cursor.fetchmany()
+                        if not rows:
+                            break
+                        count += len(rows)
+                        yield rows
+                finally:
+                    cursor.close()
+                    # Includes the time the consumer spent between batches
+                    self.profiler.record(conn, query, params, time.perf_counter() - start, count)
+                    self.logger.info(f"Streamed {count} rows for query: {query} | Params: {params}")
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error: {e} | Query: {query} | Params: {params}")
+            raise
+
+    def fetch_iter(self, query: str, params: Tuple = (), batch_size: int = 1000) -> Iterator[Tuple]:
+        """
+        Yield the rows of a query lazily, so a large result is never held as one list.
+        A pooled connection of its own stays checked out until the iterator is exhausted or closed,
+        so close() an iterator that is not read to the end.
+        :param query: SQL query string.
+        :param params: Tuple of parameters for the query.
+        :param batch_size: Rows fetched from SQLite per step (the cursor's arraysize).
+        :return: Iterator of rows.
+        """
+        with closing(self._fetch_batches(query, params, batch_size)) as batches:
+            for rows in batches:
+                yield from rows
+
+    def fetch_numpy(self, query: str, params: Tuple = (), batch_size: int = 50000) -> Dict[str, "np.ndarray"]:
+        """
+        Fetch a query into typed NumPy columns, converting each batch as it arrives so the
+        rows are never all materialized as tuples at once.
+        :param query: SQL query string.
+        :param params: Tuple of parameters for the query.
+        :param batch_size: Rows converted per batch.
+        :return: Dict of column name to array (int64, float64 with NULL as NaN, or object).
+        """
+        import numpy as np
+
+        names, chunks = [], []
+        with closing(self._fetch_batches(query, params, batch_size, names)) as batches:
+            for rows in batches:
+                chunks.append([typed_column(values) for values in zip(*rows)])
+        columns = {}
+        for index, name in enumerate(names):
+            parts = [chunk[index] for chunk in chunks]
+            columns[name] = np.concatenate(parts) if parts else np.empty(0, dtype=object)
+            for chunk in chunks:
+                chunk[index] = None  # release each batch's column once it is copied
+        return columns
+
+    def fetch_dataframe(self, query: str, params: Tuple = (), batch_size: int = 50000,
+                        use_cache: bool = False) -> "pd.DataFrame":
+        """
+        Fetch a query into a pandas DataFrame built from typed columns (see fetch_numpy),
+        avoiding the list-of-tuples copy of fetch_all followed by pd.DataFrame.
+        :param query: SQL query string.
+        :param params: Tuple of parameters for the query.
+        :param batch_size: Rows converted per batch.
+        :param use_cache: Serve repeated reads from the query cache until a write touches their tables.
+        :return: DataFrame with one column per result column.
+        """
+        import pandas as pd
+
+        if use_cache and self._cache is not None:
+            key = (query, tuple(params), "dataframe")
+            frame = self._cache.get(key)
+            if frame is None:
+                frame = self.fetch_dataframe(query, params, batch_size)
+                self._cache.put(key, frame)
+            return frame.copy(deep=False)
+        return pd.DataFrame(self.fetch_numpy(query, params, batch_size), copy=False)
+
     def create_table(self, table_name: str, columns: str) -> None:
         """
         Dynamically create a table.
@@ -90,10 +865,146 @@ class DatabaseManager:
         :param columns: Comma-separated column names.
         :param values: Tuple of values to insert.
         """
+        columns, values = self._with_location_keys(table_name, columns, values)
         placeholders = ", ".join("?" for _ in values)
         query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders});"
         self.execute_query(query, values)
 
+    def enqueue_record(self, table_name: str, columns: str, values: Tuple) -> Future:
+        """
+        Queue a record for insertion by the group-commit writer instead of committing it alone.
+        Records are committed together once group_commit_size are queued or group_commit_ms have passed.
+        :param table_name: Name of the table.
+        :param columns: Comma-separated column names.
+        :param values: Tuple of values to insert.
+        :return: Future resolving once the record is committed (or raising its sqlite3.Error).
+        """
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = GroupCommitWriter(self, self.group_commit_size, self.group_commit_ms)
+        columns, values = self._with_location_keys(table_name, columns, values)
+        placeholders = ", ".join("?" for _ in values)
+        query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders});"
+        return self._writer.submit(query, values)
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """
+        Block until every enqueued record is committed.
+        :param timeout: Seconds to wait before raising concurrent.futures.TimeoutError.
+        """
+        if self._writer is not None:
+            self._writer.flush(timeout)
+
+    def insert_many(self, table_name: str, columns: str, rows: Iterable[Tuple], batch_size: int = 5000,
+                    defer_indexes: bool = False, defer_foreign_keys: bool = False, single_transaction: bool = False,
+                    on_batch: Optional[Callable[[sqlite3.Connection, int], None]] = None) -> int:
+        """
+        Bulk insert rows with one executemany call per batch. By default each batch commits on its
+        own, so a failure leaves the earlier batches in the table (use on_batch to checkpoint them);
+        with single_transaction the whole load commits or rolls back as one.
+        :param table_name: Name of the table.
+        :param columns: Comma-separated column names.
+        :param rows: Iterable of value tuples; consumed lazily, batch by batch.
+        :param batch_size: Number of rows per executemany call (and per transaction unless single_transaction).
+        :param defer_indexes: Drop the table's non-UNIQUE indexes during the load and rebuild them afterwards.
+        :param defer_foreign_keys: Disable foreign key enforcement during the load and run
+            PRAGMA foreign_key_check before the commit. Requires single_transaction.
+        :param single_transaction: Load every batch in one transaction, committed only if all succeed.
+        :param on_batch: Called inside the open transaction after each batch with the connection and the
+            batch row count, e.g. to record an ingest checkpoint atomically with the rows.
+        :return: Number of rows inserted.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        if defer_foreign_keys and not single_transaction:
+            raise ValueError("defer_foreign_keys requires single_transaction, so violations are found before any row is committed.")
+        placeholders = ", ".join("?" for _ in columns.split(","))
+        query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders});"
+        rows = iter(rows)
+        inserted = 0
+
+        with self._connect() as conn:
+            foreign_keys = conn.execute("PRAGMA foreign_keys;").fetchone()[0]
+            indexes = []
+            failed = False
+            try:
+                if defer_foreign_keys:
+                    conn.execute("PRAGMA foreign_keys = OFF;")
+                if single_transaction:
+                    conn.execute("BEGIN IMMEDIATE;")
+                if defer_indexes:
+                    # UNIQUE indexes stay: without them duplicates could be committed and their rebuild would fail
+                    unique = {row[1] for row in conn.execute(f"PRAGMA index_list({table_name});") if row[2]}
+                    indexes = [index for index in conn.execute(
+                        "SELECT name, sql FROM sqlite_master WHERE type='index' AND tbl_name=? AND sql IS NOT NULL;",
+                        (table_name,),
+                    ).fetchall() if index[0] not in unique]
+                    for name, _ in indexes:
+                        conn.execute(f"DROP INDEX IF EXISTS {name};")
+                    if not single_transaction:
+                        conn.commit()
+
+                while True:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    start = time.perf_counter()
+                    if not single_transaction:
+                        conn.execute("BEGIN IMMEDIATE;")
+                    conn.executemany(query, batch)
+                    if on_batch is not None:
+                        on_batch(conn, len(batch))
+                    if not single_transaction:
+                        conn.commit()
+                    self.profiler.record(conn, query, batch[0], time.perf_counter() - start, len(batch))
+                    inserted += len(batch)
+
+                if single_transaction:
+                    # The indexes are rebuilt inside the transaction, so a failed load gets them back on rollback
+                    for _, sql in indexes:
+                        conn.execute(sql)
+                    if defer_foreign_keys:
+                        violations = conn.execute(f"PRAGMA foreign_key_check({table_name});").fetchall()
+                        if violations:
+                            raise sqlite3.IntegrityError(
+                                f"{len(violations)} rows in '{table_name}' violate foreign key constraints."
+                            )
+                    conn.commit()
+            except BaseException as e:
+                # Any failure (including an interrupt) discards the open transaction, so rows are only
+                # ever committed together with their on_batch checkpoint
+                failed = True
+                if conn.in_transaction:
+                    conn.rollback()
+                self.logger.error(f"Bulk insert into '{table_name}' failed after {inserted} rows: {e!r}")
+                raise
+            finally:
+                if not single_transaction:
+                    self._rebuild_indexes(conn, table_name, indexes, failed)
+                if defer_foreign_keys:
+                    conn.execute(f"PRAGMA foreign_keys = {foreign_keys};")
+
+        self._invalidate_cache(query)
+        self.logger.info(f"Inserted {inserted} rows into '{table_name}' in batches of {batch_size}")
+        return inserted
+
+    def _rebuild_indexes(self, conn: sqlite3.Connection, table_name: str, indexes: List[Tuple[str, str]],
+                         failed: bool) -> None:
+        """
+        Recreate indexes dropped by a batched insert_many, in their own transaction. A rebuild
+        failure is logged; it is raised only if the load itself succeeded, so it never replaces the load's error.
+        """
+        try:
+            for _, sql in indexes:
+                conn.execute(sql)
+            conn.commit()
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            self.logger.error(f"Rebuilding the deferred indexes of '{table_name}' failed: {e}")
+            if not failed:
+                raise
+
     def update_record(self, table_name: str, set_clause: str, where_clause: str, params: Tuple) -> None:
         """
         Update a record in a table.
@@ -102,6 +1013,7 @@ class DatabaseManager:
         :param where_clause: WHERE clause for the query (e.g., "id = ?").
         :param params: Tuple of parameters for the query.
         """
+        set_clause, params = self._with_location_updates(table_name, set_clause, params)
         query = f"UPDATE {table_name} SET {set_clause} WHERE {where_clause};"
         self.execute_query(query, params)
 
@@ -122,7 +1034,235 @@ class DatabaseManager:
         :return: List of rows.
         """
         query = f"SELECT * FROM {table_name};"
-        return self.fetch_all(query)
+        return self.fetch_all(query, use_cache=True)
+
+    def export_table(self, table_name: str, directory: str, file_format: str = "parquet",
+                     compression: str = "zstd", column_compression: Optional[Dict[str, str]] = None,
+                     incremental_key: Optional[str] = None, batch_size: int = 50000) -> int:
+        """
+        Snapshot a table into a Parquet or Arrow dataset directory, streaming one record batch at a time.
+        A full export replaces the directory's parts. An incremental export appends a part with only
+        the rows whose incremental_key is greater than the last value exported; use rowid for
+        append-only capture (order_date misses rows that arrive late with an older date).
+        :param table_name: Name of the table.
+        :param directory: Dataset directory (e.g., "snapshots/Orders").
+        :param file_format: "parquet" or "arrow".
+        :param compression: Codec for every column ("zstd", "snappy", "lz4", "gzip" or "none").
+        :param column_compression: Per-column codec overrides (Parquet only), e.g. {"order_id": "snappy"}.
+        :param incremental_key: Column (or "rowid") to export incrementally by, or None for a full export.
+        :param batch_size: Rows per record batch.
+        :return: Number of rows exported.
+        """
+        table = self.schema().get(table_name)
+        if table is None:
+            raise ValueError(f"Table '{table_name}' does not exist.")
+        names = [column.name for column in table.columns]
+        types = [snapshots.arrow_type(column.type) for column in table.columns]
+        query = f"SELECT * FROM {table_name}"
+        params = ()
+        parts = snapshots.part_files(directory)
+        last_value = None
+
+        if incremental_key is not None:
+            if incremental_key != "rowid" and incremental_key not in names:
+                raise ValueError(f"Column '{incremental_key}' does not exist in '{table_name}'.")
+            query = f"SELECT *, {incremental_key} FROM {table_name}"
+            last_value = snapshots.last_exported_value(directory, incremental_key)
+            if last_value is not None:
+                query += f" WHERE {incremental_key} > ?"
+                params = (last_value,)
+            query += f" ORDER BY {incremental_key}"
+
+        os.makedirs(directory, exist_ok=True)
+        extension = snapshots.FORMATS.get(file_format, "")
+        # Append to a dataset exported incrementally by the same key; otherwise replace its parts
+        append = last_value is not None
+        if append and not parts[-1].endswith(extension):
+            raise ValueError(f"'{directory}' holds {os.path.splitext(parts[-1])[1]} parts; export it in that format.")
+        part = os.path.join(directory, f"part-{len(parts) if append else 0:05d}{extension}")
+        writer = snapshots.SnapshotWriter(part + ".tmp", file_format, compression, column_compression)
+        try:
+            with self._connect() as conn:
+                start = time.perf_counter()
+                cursor = conn.execute(query + ";", params)
+                elapsed = 0.0
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    elapsed += time.perf_counter() - start
+                    if not rows:
+                        break
+                    if incremental_key is not None:
+                        last_value = rows[-1][-1]
+                        rows = [row[:-1] for row in rows]
+                    writer.write(snapshots.to_record_batch(rows, names, types))
+                    start = time.perf_counter()
+                self.profiler.record(conn, query, params, elapsed, writer.rows)
+        except Exception:
+            writer.close()
+            if os.path.exists(part + ".tmp"):
+                os.remove(part + ".tmp")
+            raise
+        writer.close()
+
+        if writer.rows == 0 and append:
+            self.logger.info(f"No new rows to export from '{table_name}'")
+            return 0
+        if writer.rows:
+            snapshots.record_part(directory, incremental_key, part, last_value)
+            os.replace(part + ".tmp", part)
+        if not append:
+            for old_part in parts:
+                if old_part != part:
+                    os.remove(old_part)
+        self.logger.info(f"Exported {writer.rows} rows from '{table_name}' to '{part}'")
+        return writer.rows
+
+    def export_query(self, query: str, path: str, params: Tuple = (), file_format: str = "parquet",
+                     compression: str = "zstd", column_compression: Optional[Dict[str, str]] = None,
+                     batch_size: int = 50000) -> int:
+        """
+        Stream a query result into a single Parquet or Arrow file; column types are inferred.
+        :param query: SQL query string.
+        :param path: Output file path.
+        :param params: Tuple of parameters for the query.
+        :param file_format: "parquet" or "arrow".
+        :param compression: Codec for every column.
+        :param column_compression: Per-column codec overrides (Parquet only).
+        :param batch_size: Rows per record batch.
+        :return: Number of rows exported.
+        """
+        writer = snapshots.SnapshotWriter(path, file_format, compression, column_compression)
+        try:
+            with self._connect() as conn:
+                start = time.perf_counter()
+                cursor = conn.execute(query, params)
+                names = [description[0] for description in cursor.description]
+                types = None
+                elapsed = 0.0
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    elapsed += time.perf_counter() - start
+                    if not rows:
+                        break
+                    batch = snapshots.to_record_batch(rows, names, types or [None] * len(names))
+                    types = types or [field.type for field in batch.schema]
+                    writer.write(batch)
+                    start = time.perf_counter()
+                self.profiler.record(conn, query, params, elapsed, writer.rows)
+        finally:
+            writer.close()
+        self.logger.info(f"Exported {writer.rows} rows to '{path}'")
+        return writer.rows
+
+    def export_text(self, query: str, path: str, params: Tuple = (), file_format: str = "csv",
+                    compress: bool = False, batch_size: int = 10000,
+                    progress: Optional[Callable[[int], None]] = None) -> int:
+        """
+        Stream a query result into a CSV or JSON Lines file, batch_size rows at a time, so memory
+        stays bounded however many rows it returns. The file appears at `path` only once complete.
+        :param query: SQL query string (e.g., "SELECT * FROM Orders WHERE status = ?").
+        :param path: Output file path.
+        :param params: Tuple of parameters for the query.
+        :param file_format: "csv" (with a header row) or "jsonl" (one JSON object per row).
+        :param compress: gzip the output.
+        :param batch_size: Rows fetched and written per step.
+        :param progress: Called with the number of rows written after every batch.
+        :return: Number of rows exported.
+        """
+        names = []
+        writer = text_export.TextWriter(path + ".tmp", file_format, compress)
+        try:
+            with closing(self._fetch_batches(query, params, batch_size, names)) as batches:
+                for rows in batches:
+                    writer.write(names, rows)
+                    if progress is not None:
+                        progress(writer.rows)
+            writer.start(names)
+        except Exception:
+            writer.close()
+            os.remove(path + ".tmp")
+            raise
+        writer.close()
+        os.replace(path + ".tmp", path)
+        self.logger.info(f"Exported {writer.rows} rows to '{path}'")
+        return writer.rows
+
+    def get_table_page(self, table_name: str, after_key: Optional[Tuple] = None, limit: int = 50,
+                       order_by: Optional[str] = None, descending: bool = False,
+                       where_clause: str = "", params: Tuple = ()) -> Tuple[List[Tuple], Optional[Tuple]]:
+        """
+        Fetch one page of a table using keyset pagination on (order_by, rowid).
+        :param table_name: Name of the table.
+        :param after_key: Key returned with the previous page, or None for the first page.
+        :param limit: Maximum rows per page.
+        :param order_by: Column to sort on (defaults to rowid).
+        :param descending: Sort in descending order.
+        :param where_clause: Optional filter (e.g., "name LIKE ?").
+        :param params: Tuple of parameters for the filter.
+        :return: Tuple of (rows, next_key); next_key is None on the last page.
+        """
+        direction = "DESC" if descending else "ASC"
+        conditions, key_params = [], ()
+        if where_clause:
+            conditions.append(f"({where_clause})")
+
+        if order_by is None:
+            order_clause = f"rowid {direction}"
+            if after_key is not None:
+                conditions.append(f"rowid {'<' if descending else '>'} ?")
+                key_params = (after_key[-1],)
+        else:
+            # NULLs sort first ascending and last descending, so a page boundary inside
+            # the NULL run needs its own condition.
+            order_clause = f"{order_by} {direction}, rowid {direction}"
+            if after_key is not None:
+                value, rowid = after_key
+                if value is None and not descending:
+                    conditions.append(f"(({order_by} IS NULL AND rowid > ?) OR {order_by} IS NOT NULL)")
+                    key_params = (rowid,)
+                elif value is None:
+                    conditions.append(f"({order_by} IS NULL AND rowid < ?)")
+                    key_params = (rowid,)
+                elif not descending:
+                    conditions.append(f"({order_by}, rowid) > (?, ?)")
+                    key_params = (value, rowid)
+                else:
+                    conditions.append(f"(({order_by}, rowid) < (?, ?) OR {order_by} IS NULL)")
+                    key_params = (value, rowid)
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        sort_key = f", {order_by}" if order_by else ""
+        query = f"SELECT *{sort_key}, rowid FROM {table_name}{where} ORDER BY {order_clause} LIMIT ?;"
+        rows = self.fetch_all(query, tuple(params) + key_params + (limit + 1,), use_cache=True)
+
+        key_width = 2 if order_by else 1
+        next_key = tuple(rows[limit - 1][-key_width:]) if len(rows) > limit else None
+        return [row[:-key_width] for row in rows[:limit]], next_key
+
+    def count_rows(self, table_name: str, where_clause: str = "", params: Tuple = ()) -> int:
+        """
+        Count the rows of a table exactly, optionally filtered.
+        :param table_name: Name of the table.
+        :param where_clause: Optional filter (e.g., "name LIKE ?").
+        :param params: Tuple of parameters for the filter.
+        :return: Number of matching rows.
+        """
+        where = f" WHERE {where_clause}" if where_clause else ""
+        return self.fetch_all(f"SELECT COUNT(*) FROM {table_name}{where};", params, use_cache=True)[0][0]
+
+    def estimate_row_count(self, table_name: str) -> int:
+        """
+        Estimate the row count of a table without scanning it.
+        Uses ANALYZE statistics when available, otherwise MAX(rowid).
+        :param table_name: Name of the table.
+        :return: Approximate number of rows.
+        """
+        # Queried directly: the schema catalog leaves out sqlite_* tables
+        if self.fetch_all("SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1';"):
+            stats = self.fetch_all("SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1;", (table_name,))
+            if stats:
+                return int(stats[0][0].split()[0])
+        return self.fetch_all(f"SELECT MAX(rowid) FROM {table_name};")[0][0] or 0
 
     def drop_table(self, table_name: str) -> None:
         """
@@ -132,21 +1272,300 @@ class DatabaseManager:
         query = f"DROP TABLE IF EXISTS {table_name};"
         self.execute_query(query)
 
+    def drop_column(self, table_name: str, column_name: str) -> None:
+        """
+        Drop a column from an existing table.
+        :param table_name: Name of the table.
+        :param column_name: Name of the column.
+        """
+        query = f"ALTER TABLE {table_name} DROP COLUMN {column_name};"
+        self.execute_query(query)
+
+    def create_index(self, index_name: str, table_name: str, columns: str, unique: bool = False) -> None:
+        """
+        Create an index on a table.
+        :param index_name: Name of the index.
+        :param table_name: Name of the table.
+        :param columns: Indexed columns or expressions (e.g., "customer_id, total_amount").
+        :param unique: Whether to create a UNIQUE index.
+        """
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        query = f"CREATE {kind} IF NOT EXISTS {index_name} ON {table_name} ({columns});"
+        self.execute_query(query)
+
+    def drop_index(self, index_name: str) -> None:
+        """
+        Drop an index from the database.
+        :param index_name: Name of the index.
+        """
+        query = f"DROP INDEX IF EXISTS {index_name};"
+        self.execute_query(query)
+
+    def list_indexes(self, table_name: Optional[str] = None) -> List[Tuple]:
+        """
+        List user-defined indexes, optionally for a single table.
+        :param table_name: Name of the table, or None for all tables.
+        :return: List of (index_name, table_name, sql) rows.
+        """
+        query = "SELECT name, tbl_name, sql FROM sqlite_master WHERE type='index' AND sql IS NOT NULL"
+        if table_name is None:
+            return self.fetch_all(query + " ORDER BY tbl_name, name;")
+        return self.fetch_all(query + " AND tbl_name=? ORDER BY name;", (table_name,))
+
+    def analyze(self, table_name: Optional[str] = None) -> None:
+        """
+        Refresh the query planner statistics.
+        :param table_name: Name of the table, or None to analyze the whole database.
+        """
+        query = f"ANALYZE {table_name};" if table_name else "ANALYZE;"
+        self.execute_query(query)
+
+    def explain_query_plan(self, query: str, params: Tuple = ()) -> List[str]:
+        """
+        Fetch the query plan SQLite would use for a query.
+        :param query: SQL query string.
+        :param params: Tuple of parameters for the query.
+        :return: List of plan steps (e.g., "SCAN o USING COVERING INDEX idx_orders_customer").
+        """
+        return [row[3] for row in self.fetch_all(f"EXPLAIN QUERY PLAN {query}", params)]
+
+    def create_summary_tables(self) -> None:
+        """
+        Create the Orders rollup tables, fill them from Orders and install the triggers
+        that keep them current on every insert, update and delete. Triggers left by an earlier
+        version are replaced.
+        """
+        statements = [f"DROP TRIGGER IF EXISTS {trigger};" for trigger in summary_tables.TRIGGERS]
+        statements += [summary_tables.create_table_sql(table) for table in summary_tables.SUMMARIES]
+        statements += summary_tables.trigger_sql()
+        statements += [sql for table in summary_tables.SUMMARIES for sql in summary_tables.rebuild_sql(table)]
+        self._execute_script(statements)
+        self.logger.info(f"Summary tables ready: {list(summary_tables.SUMMARIES)}")
+
+    def refresh_summary_tables(self) -> None:
+        """Recompute the Orders rollup tables from scratch (e.g., after a bulk load with triggers absent)."""
+        self._execute_script([sql for table in summary_tables.SUMMARIES for sql in summary_tables.rebuild_sql(table)])
+        self.logger.info("Summary tables refreshed.")
+
+    def drop_summary_tables(self) -> None:
+        """Drop the Orders rollup tables and their triggers."""
+        statements = [f"DROP TRIGGER IF EXISTS {trigger};" for trigger in summary_tables.TRIGGERS]
+        statements += [f"DROP TABLE IF EXISTS {table};" for table in summary_tables.SUMMARIES]
+        self._execute_script(statements)
+
+    def create_search_indexes(self) -> None:
+        """
+        Create the FTS5 search indexes of Customers, Restaurants and Orders, fill them from the
+        tables and install the triggers that keep them in sync.
+        """
+        tables = [table for table in search_index.SEARCHABLE if table in self.schema()]
+        statements = [search_index.create_index_sql(table) for table in tables]
+        statements += [sql for table in tables for sql in search_index.trigger_sql(table)]
+        statements += [search_index.rebuild_sql(table) for table in tables]
+        self._execute_script(statements)
+        self.logger.info(f"Search indexes ready: {tables}")
+
+    def drop_search_indexes(self) -> None:
+        """Drop the FTS5 search indexes and their triggers."""
+        statements = [f"DROP TRIGGER IF EXISTS {trigger};" for trigger in search_index.TRIGGERS]
+        statements += [f"DROP TABLE IF EXISTS {search_index.index_name(table)};" for table in search_index.SEARCHABLE]
+        self._execute_script(statements)
+
+    def has_search_index(self, table_name: str) -> bool:
+        """Whether the table has an FTS5 search index (see create_search_indexes)."""
+        return table_name in search_index.SEARCHABLE and search_index.index_name(table_name) in self.schema()
+
+    def search(self, table_name: str, text: str, limit: int = 20) -> List[Tuple]:
+        """
+        Full-text search of a table through its FTS5 index.
+        :param table_name: "Customers", "Restaurants" or "Orders".
+        :param text: Words to find; each matches the start of a token in any indexed column
+            (e.g. "sara" finds "Sara Ruiz", "4ecfd314" the record whose id starts with it).
+        :param limit: Maximum rows returned.
+        :return: Matching rows (all columns), best match first.
+        """
+        if table_name not in search_index.SEARCHABLE:
+            raise ValueError(f"Table '{table_name}' is not searchable; use one of {list(search_index.SEARCHABLE)}.")
+        if not self.has_search_index(table_name):
+            raise ValueError(f"Table '{table_name}' has no search index; run create_search_indexes() first.")
+        query = search_index.match_query(text)
+        if query is None:
+            return []
+        return self.fetch_all(search_index.search_sql(table_name), (query, limit))
+
+    def has_summary_tables(self) -> bool:
+        """Whether the Orders rollup tables exist (see create_summary_tables)."""
+        schema = self.schema()
+        return all(table in schema for table in summary_tables.SUMMARIES)
+
+    def fetch_summary(self, name: str, top_k: int = 5) -> List[Tuple]:
+        """
+        Run an insight query against the rollup tables.
+        :param name: Key of summary_tables.SUMMARY_QUERIES (e.g., "order_count_by_hour").
+        :param top_k: Rows returned by ranked insights.
+        :return: List of rows.
+        """
+        query, params = summary_tables.summary_query(name, top_k)
+        return self.fetch_all(query, params, use_cache=True)
+
+    def create_location_dimension(self) -> None:
+        """
+        Create the States and Cities lookup tables, add city_id, state_id and postal_code to
+        Customers and Restaurants with their indexes, and fill the keys of rows that lack them.
+        """
+        tables = self.schema()
+        existing = {name: {column.name for column in table.columns} for name, table in tables.items()}
+        self._execute_script(locations.schema_sql(existing))
+        self._location_ids.clear()
+
+        for table in locations.LOCATION_TABLES:
+            if table not in tables:
+                continue
+            rows = self.fetch_all(f"SELECT rowid, location FROM {table} WHERE state_id IS NULL AND location IS NOT NULL;")
+            filled = 0
+            for start in range(0, len(rows), 10000):
+                batch = rows[start:start + 10000]
+                keys = self.location_keys([location for _, location in batch])
+                updates = [key + (rowid,) for key, (rowid, _) in zip(keys, batch) if key[1] is not None]
+                with self._connect() as conn:
+                    conn.execute("BEGIN IMMEDIATE;")
+                    conn.executemany(f"UPDATE {table} SET city_id = ?, state_id = ?, postal_code = ? WHERE rowid = ?;",
+                                     updates)
+                    conn.commit()
+                filled += len(updates)
+            if rows:
+                self.logger.info(f"Location keys filled for {filled} of {len(rows)} rows in '{table}'")
+        self._invalidate_cache("")
+
+    def location_keys(self, addresses: Iterable[str]) -> List[Tuple[Optional[int], Optional[int], Optional[str]]]:
+        """
+        Parse addresses and look up their city and state keys, adding new cities and states
+        to the lookup tables. Keys are cached, so repeated cities cost no query.
+        :param addresses: Address strings (see locations.parse_location).
+        :return: (city_id, state_id, postal_code) per address; all None for addresses that do not parse.
+        """
+        parsed = [locations.parse_location(address) for address in addresses]
+        missing = {(state, city) for city, state, _ in parsed if state is not None} - self._location_ids.keys()
+        if missing:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE;")
+                conn.executemany("INSERT OR IGNORE INTO States (code) VALUES (?);", {(state,) for state, _ in missing})
+                conn.executemany(
+                    "INSERT OR IGNORE INTO Cities (state_id, name) SELECT state_id, ? FROM States WHERE code = ?;",
+                    [(city, state) for state, city in missing],
+                )
+                for state, city in missing:
+                    self._location_ids[(state, city)] = conn.execute(
+                        "SELECT c.city_id, c.state_id FROM Cities c JOIN States s ON s.state_id = c.state_id "
+                        "WHERE s.code = ? AND c.name = ?;",
+                        (state, city),
+                    ).fetchone()
+                conn.commit()
+            if self._cache is not None:
+                for table in locations.DIMENSION_TABLES:
+                    self._cache.invalidate(table)
+        return [
+            self._location_ids[(state, city)] + (postal_code,) if state is not None else (None, None, None)
+            for city, state, postal_code in parsed
+        ]
+
+    def _has_location_keys(self, table_name: str) -> bool:
+        table = self.schema().get(table_name) if table_name in locations.LOCATION_TABLES else None
+        return table is not None and "state_id" in {column.name for column in table.columns}
+
+    def _with_location_keys(self, table_name: str, columns: str, values: Tuple) -> Tuple[str, Tuple]:
+        """Append city_id, state_id and postal_code parsed from the inserted location, unless given."""
+        names = [name.strip() for name in columns.split(",")]
+        if "location" not in names or set(locations.KEY_COLUMN_NAMES) & set(names) \
+                or not self._has_location_keys(table_name):
+            return columns, values
+        keys = self.location_keys([values[names.index("location")]])[0]
+        return ", ".join(names + list(locations.KEY_COLUMN_NAMES)), tuple(values) + keys
+
+    def _with_location_updates(self, table_name: str, set_clause: str, params: Tuple) -> Tuple[str, Tuple]:
+        """Also set city_id, state_id and postal_code when a simple "col = ?, ..." SET clause changes location."""
+        assignments = [re.fullmatch(r"\s*(\w+)\s*=\s*\?\s*", part) for part in set_clause.split(",")]
+        if not all(assignments) or not self._has_location_keys(table_name):
+            return set_clause, params
+        names = [assignment.group(1) for assignment in assignments]
+        if "location" not in names or set(locations.KEY_COLUMN_NAMES) & set(names):
+            return set_clause, params
+        keys = self.location_keys([params[names.index("location")]])[0]
+        set_clause += "".join(f", {column} = ?" for column in locations.KEY_COLUMN_NAMES)
+        return set_clause, tuple(params[:len(names)]) + keys + tuple(params[len(names):])
+
+    def _answered_by_summary(self, name: str, start, end, filters: dict) -> bool:
+        """Whether an insight request can be read from the rollup tables instead of Orders."""
+        return (name in summary_tables.SUMMARY_QUERIES and insight_queries.is_unfiltered(start, end, **filters)
+                and self.has_summary_tables())
+
+    def insight_query(self, name: str, top_k: int = 5, start=None, end=None, **filters) -> Tuple[str, Tuple]:
+        """
+        SQL and bound parameters answering a parameterized insight: the rollup query
+        (summary_tables.summary_query) when the whole history is asked for with no filter set and
+        the rollup tables exist, otherwise the query over Orders (insight_queries.build_query).
+        Takes the same arguments as fetch_insight.
+        :return: (query, params) tuple.
+        """
+        query, params = insight_queries.build_query(name, top_k, start, end, **filters)
+        if self._answered_by_summary(name, start, end, filters):
+            return summary_tables.summary_query(name, top_k)
+        return query, params
+
+    def fetch_insight(self, name: str, top_k: int = 5, start=None, end=None, **filters) -> List[Tuple]:
+        """
+        Run a parameterized insight query (see insight_query) through the query cache.
+        :param name: Key of insight_queries.INSIGHTS (e.g., "top_restaurants").
+        :param top_k: Rows returned by ranked insights.
+        :param start: Earliest order_date included, or None.
+        :param end: Latest order_date (a date includes that whole day), or None.
+        :param filters: Categorical filters, e.g. cuisine=["Italian"] or restaurant_location="MS".
+        :return: List of rows.
+        """
+        query, params = insight_queries.build_query(name, top_k, start, end, **filters)
+        if self._answered_by_summary(name, start, end, filters):
+            return self.fetch_summary(name, top_k)
+        return self.fetch_all(query, params, use_cache=True)
+
+    def _execute_script(self, statements: List[str]) -> None:
+        """Execute several statements in one transaction."""
+        try:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE;")
+                for statement in statements:
+                    conn.execute(statement)
+                conn.commit()
+        except sqlite3.Error as e:
+            self.logger.error(f"Database error: {e} | Script: {statements}")
+            raise
+        finally:
+            self._invalidate_cache("")
+            self.catalog.invalidate()
+
+    def schema(self) -> Dict[str, SchemaCatalog.Table]:
+        """
+        Tables, columns, types, primary keys, foreign keys and indexes from the schema catalog.
+        Only PRAGMA schema_version is queried unless the schema changed.
+        :return: Dictionary of table name to SchemaCatalog.Table.
+        """
+        with self._connect() as conn:
+            return self.catalog.tables(conn)
+
+    def list_tables(self, include_internal: bool = False) -> List[str]:
+        """
+        List table names in creation order.
+        :param include_internal: Include bookkeeping tables whose names start with '_'.
+        :return: List of table names.
+        """
+        return [name for name in self.schema() if include_internal or not name.startswith("_")]
+
     def table_exists(self, table_name: str) -> bool:
         """
         Check if a table exists in the database.
         :param table_name: Name of the table.
         :return: Boolean indicating existence.
         """
-        query = """
-            SELECT name 
-            FROM sqlite_master 
-            WHERE type='table' AND name=?;
-        """
-        result = self.fetch_all(query, (table_name,))
-        exists = len(result) > 0
-        self.logger.info(f"Table '{table_name}' exists: {exists}")
-        return exists
+        return table_name in self.schema()
 
     def fetch_column_names(self, table_name: str) -> Union[List[str], None]:
         """
@@ -154,11 +1573,8 @@ class DatabaseManager:
         :param table_name: Name of the table.
         :return: List of column names or None if the table doesn't exist.
         """
-        if not self.table_exists(table_name):
+        table = self.schema().get(table_name)
+        if table is None:
             self.logger.warning(f"Table '{table_name}' does not exist.")
             return None
-        query = f"PRAGMA table_info({table_name});"
-        columns_info = self.fetch_all(query)
-        column_names = [col_info[1] for col_info in columns_info]
-        self.logger.info(f"Columns in table '{table_name}': {column_names}")
-        return column_names
+        return [column.name for column in table.columns]
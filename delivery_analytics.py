@@ -0,0 +1,246 @@
+"""
+Delivery performance analytics over the Deliveries table.
+
+DeliveryAnalytics.refresh() reads distance, delivery_time, estimated_time, delivery_fee and
+vehicle_type once, in batches, and folds every batch with vectorized NumPy into per-group
+accumulators: one-minute histograms of the ETA error (delivery_time - estimated_time) and
+of the delivery time, per vehicle type and per distance bucket, plus fee and distance sums.
+Percentiles are read off the cumulative histograms (exact for the whole-minute values these
+columns hold), so after a refresh every dashboard query touches a few thousand counters
+instead of millions of deliveries, and memory does not grow with the table.
+"""
+import logging
+import time
+from contextlib import closing
+from itertools import islice
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .database_manager import DatabaseManager, typed_column
+from .order_store import Dictionary
+
+DELIVERY_QUERY = "SELECT distance, delivery_time, estimated_time, delivery_fee, vehicle_type FROM Deliveries"
+
+# Histogram ranges in minutes; values outside are counted in the first or last bin
+ERROR_RANGE = (-240, 240)
+TIME_RANGE = (0, 720)
+# Distance bucket edges in km; the last bucket is open-ended
+DISTANCE_EDGES = [0, 2, 5, 10, 15, 20]
+GROUPINGS = ("vehicle", "distance")
+
+
+def distance_labels(edges: Sequence[float] = DISTANCE_EDGES) -> List[str]:
+    """Labels of the distance buckets, e.g. ["0-2 km", ..., "20+ km"]."""
+    bounds = [f"{low:g}-{high:g} km" for low, high in zip(edges, edges[1:])]
+    return bounds + [f"{edges[-1]:g}+ km"]
+
+
+def histogram_percentiles(histograms: np.ndarray, low: int, percentiles: Sequence[float]) -> np.ndarray:
+    """
+    Nearest-rank percentiles of integer-valued histograms.
+    :param histograms: Counts, one row per group and one column per value from `low` upwards.
+    :param low: Value of the first column.
+    :param percentiles: Percentiles in [0, 100].
+    :return: Array of shape (groups, len(percentiles)); NaN for empty groups.
+    """
+    cumulative = histograms.cumsum(axis=1)
+    totals = cumulative[:, -1:]
+    ranks = np.maximum(np.ceil(np.asarray(percentiles, dtype=np.float64) / 100 * totals), 1)
+    values = np.stack([(cumulative < rank[:, None]).sum(axis=1) for rank in ranks.T], axis=1) + low
+    return np.where(totals > 0, values, np.nan)
+
+
+class DeliveryAnalytics:
+    """Histogram-backed delivery statistics (ETA error, delivery time, fee per km) by vehicle and distance."""
+
+    def __init__(self, manager: DatabaseManager, status: Optional[str] = None, batch_size: int = 50000,
+                 distance_edges: Sequence[float] = DISTANCE_EDGES):
+        """
+        Initialize empty analytics; call refresh() to compute them.
+        :param manager: DatabaseManager to read Deliveries from (e.g. a replica's).
+        :param status: Only count deliveries with this delivery_status (e.g. "Delivered"), or None for all.
+        :param batch_size: Rows folded into the accumulators per batch.
+        :param distance_edges: Distance bucket edges in km.
+        """
+        self.manager = manager
+        self.status = status
+        self.batch_size = batch_size
+        self.distance_edges = np.asarray(distance_edges, dtype=np.float64)
+        self.logger = logging.getLogger(__name__)
+        self.vehicles = Dictionary()
+        self.deliveries = 0
+        self.skipped = 0
+        self.refreshed = None
+        self._groups = {}
+
+    def _empty(self, groups: int) -> Dict[str, np.ndarray]:
+        return {
+            "error": np.zeros((groups, ERROR_RANGE[1] - ERROR_RANGE[0] + 1), dtype=np.int64),
+            "time": np.zeros((groups, TIME_RANGE[1] - TIME_RANGE[0] + 1), dtype=np.int64),
+            "count": np.zeros(groups, dtype=np.int64),
+            "late": np.zeros(groups, dtype=np.int64),
+            "error_sum": np.zeros(groups, dtype=np.float64),
+            "abs_error_sum": np.zeros(groups, dtype=np.float64),
+            "fee_sum": np.zeros(groups, dtype=np.float64),
+            "distance_sum": np.zeros(groups, dtype=np.float64),
+            "fee_per_km_sum": np.zeros(groups, dtype=np.float64),
+            "fee_per_km_count": np.zeros(groups, dtype=np.int64),
+        }
+
+    def refresh(self) -> "DeliveryAnalytics":
+        """Recompute every accumulator in one batched pass over Deliveries."""
+        start = time.perf_counter()
+        query, params = DELIVERY_QUERY, ()
+        if self.status is not None:
+            query, params = f"{query} WHERE delivery_status = ?", (self.status,)
+
+        self.vehicles = Dictionary()
+        self.deliveries = self.skipped = 0
+        self._groups = {"vehicle": self._empty(0), "distance": self._empty(len(self.distance_edges))}
+        with closing(self.manager.fetch_iter(query + ";", params, self.batch_size)) as rows:
+            while True:
+                batch = list(islice(rows, self.batch_size))
+                if not batch:
+                    break
+                self._fold(batch)
+        self.refreshed = time.time()
+        self.logger.info(
+            f"Delivery analytics refreshed over {self.deliveries} deliveries "
+            f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+        )
+        return self
+
+    def _fold(self, rows: List[Tuple]) -> None:
+        """Add one batch of (distance, delivery_time, estimated_time, delivery_fee, vehicle_type) rows."""
+        distance, actual, estimated, fee = (
+            np.asarray(typed_column(values), dtype=np.float64) for values in list(zip(*rows))[:4]
+        )
+        vehicles = [row[4] for row in rows]
+        valid = ~(np.isnan(distance) | np.isnan(actual) | np.isnan(estimated) | np.isnan(fee))
+        self.skipped += int((~valid).sum())
+        if not valid.all():
+            distance, actual, estimated, fee = distance[valid], actual[valid], estimated[valid], fee[valid]
+            vehicles = [vehicle for vehicle, keep in zip(vehicles, valid) if keep]
+        if not len(distance):
+            return
+        self.deliveries += len(distance)
+
+        error = actual - estimated
+        measures = {
+            "error_bin": (np.clip(np.floor(error), *ERROR_RANGE) - ERROR_RANGE[0]).astype(np.int64),
+            "time_bin": (np.clip(np.floor(actual), *TIME_RANGE) - TIME_RANGE[0]).astype(np.int64),
+            "error": error,
+            "fee": fee,
+            "distance": distance,
+            "fee_per_km": np.divide(fee, distance, out=np.zeros_like(fee), where=distance > 0),
+            "has_distance": distance > 0,
+        }
+        vehicle_codes = self.vehicles.encode(vehicles)
+        self._grow("vehicle", len(self.vehicles.values))
+        buckets = np.searchsorted(self.distance_edges, distance, side="right") - 1
+        self._add("vehicle", vehicle_codes, measures)
+        self._add("distance", np.clip(buckets, 0, len(self.distance_edges) - 1), measures)
+
+    def _grow(self, grouping: str, groups: int) -> None:
+        accumulators = self._groups[grouping]
+        extra = groups - len(accumulators["count"])
+        if extra > 0:
+            for name, values in accumulators.items():
+                padding = np.zeros((extra,) + values.shape[1:], dtype=values.dtype)
+                accumulators[name] = np.concatenate([values, padding])
+
+    def _add(self, grouping: str, codes: np.ndarray, measures: Dict[str, np.ndarray]) -> None:
+        accumulators = self._groups[grouping]
+        groups = len(accumulators["count"])
+        for histogram, bins in (("error", "error_bin"), ("time", "time_bin")):
+            width = accumulators[histogram].shape[1]
+            accumulators[histogram] += np.bincount(
+                codes * width + measures[bins], minlength=groups * width
+            ).reshape(groups, width)
+        accumulators["count"] += np.bincount(codes, minlength=groups)
+        accumulators["late"] += np.bincount(codes, weights=measures["error"] > 0, minlength=groups).astype(np.int64)
+        accumulators["error_sum"] += np.bincount(codes, weights=measures["error"], minlength=groups)
+        accumulators["abs_error_sum"] += np.bincount(codes, weights=np.abs(measures["error"]), minlength=groups)
+        accumulators["fee_sum"] += np.bincount(codes, weights=measures["fee"], minlength=groups)
+        accumulators["distance_sum"] += np.bincount(codes, weights=measures["distance"], minlength=groups)
+        accumulators["fee_per_km_sum"] += np.bincount(codes, weights=measures["fee_per_km"], minlength=groups)
+        accumulators["fee_per_km_count"] += np.bincount(
+            codes, weights=measures["has_distance"], minlength=groups
+        ).astype(np.int64)
+
+    def _accumulators(self, group_by: Optional[str]) -> Tuple[List[str], Dict[str, np.ndarray]]:
+        """Group labels and accumulators; group_by None sums the vehicle groups into one "All" row."""
+        if not self._groups:
+            raise RuntimeError("DeliveryAnalytics has not been refreshed yet; call refresh() first.")
+        if group_by is None:
+            totals = {name: values.sum(axis=0, keepdims=True) for name, values in self._groups["vehicle"].items()}
+            return ["All"], totals
+        if group_by not in GROUPINGS:
+            raise ValueError(f"Unknown grouping '{group_by}'; use one of {GROUPINGS} or None.")
+        labels = list(self.vehicles.values) if group_by == "vehicle" else distance_labels(self.distance_edges)
+        return labels, self._groups[group_by]
+
+    @staticmethod
+    def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        return np.divide(numerator, denominator, out=np.full(len(numerator), np.nan), where=denominator > 0)
+
+    def eta_error_percentiles(self, group_by: Optional[str] = "vehicle",
+                              percentiles: Sequence[float] = (50, 90, 95, 99)) -> List[Tuple]:
+        """
+        ETA error (actual minus estimated minutes; positive is late) per group.
+        :param group_by: "vehicle", "distance" or None for all deliveries.
+        :param percentiles: Percentiles to report.
+        :return: Rows of (group, deliveries, mean error, mean absolute error, late share, *percentiles).
+        """
+        labels, accumulators = self._accumulators(group_by)
+        count = accumulators["count"]
+        values = histogram_percentiles(accumulators["error"], ERROR_RANGE[0], percentiles)
+        mean = self._ratio(accumulators["error_sum"], count)
+        mean_abs = self._ratio(accumulators["abs_error_sum"], count)
+        late = self._ratio(accumulators["late"].astype(np.float64), count)
+        return [
+            (label, int(count[i]), float(mean[i]), float(mean_abs[i]), float(late[i]), *map(float, values[i]))
+            for i, label in enumerate(labels) if count[i]
+        ]
+
+    def delivery_time_percentiles(self, group_by: Optional[str] = "vehicle",
+                                  percentiles: Sequence[float] = (50, 90, 95, 99)) -> List[Tuple]:
+        """
+        Delivery time in minutes per group.
+        :return: Rows of (group, deliveries, *percentiles).
+        """
+        labels, accumulators = self._accumulators(group_by)
+        count = accumulators["count"]
+        values = histogram_percentiles(accumulators["time"], TIME_RANGE[0], percentiles)
+        return [(label, int(count[i]), *map(float, values[i])) for i, label in enumerate(labels) if count[i]]
+
+    def eta_error_histogram(self, group_by: Optional[str] = None) -> List[Tuple]:
+        """
+        Distribution of the ETA error in whole minutes.
+        :return: Rows of (group, error minutes, deliveries) for the minutes that occur.
+        """
+        labels, accumulators = self._accumulators(group_by)
+        groups, bins = np.nonzero(accumulators["error"])
+        counts = accumulators["error"][groups, bins]
+        return [(labels[g], int(b) + ERROR_RANGE[0], int(c)) for g, b, c in zip(groups, bins, counts)]
+
+    def fee_per_km(self, group_by: Optional[str] = "vehicle") -> List[Tuple]:
+        """
+        Delivery fee relative to distance per group.
+        :return: Rows of (group, deliveries, total fee, total km, fee per km over all deliveries,
+            mean of the per-delivery fee per km).
+        """
+        labels, accumulators = self._accumulators(group_by)
+        count = accumulators["count"]
+        overall = self._ratio(accumulators["fee_sum"], accumulators["distance_sum"])
+        mean = self._ratio(accumulators["fee_per_km_sum"], accumulators["fee_per_km_count"])
+        return [
+            (label, int(count[i]), float(accumulators["fee_sum"][i]), float(accumulators["distance_sum"][i]),
+             float(overall[i]), float(mean[i]))
+            for i, label in enumerate(labels) if count[i]
+        ]
+
+    def memory_usage(self) -> int:
+        """Bytes held by the accumulators."""
+        return sum(values.nbytes for accumulators in self._groups.values() for values in accumulators.values())
@@ -0,0 +1,42 @@
+import os
+import sys
+import argparse
+
+# Add project root to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+
+# Command line options
+parser = argparse.ArgumentParser(description="Export tables or a query result to Parquet/Arrow snapshots for analytics.")
+parser.add_argument("--tables", nargs="*", default=["Customers", "Restaurants", "Orders", "Deliveries"],
+                    help="Tables to snapshot, each into <out>/<table>/.")
+parser.add_argument("--query", help="Export this query's result to a single file at --out instead of tables.")
+parser.add_argument("--out", default="snapshots", help="Snapshot directory (or output file with --query).")
+parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet")
+parser.add_argument("--compression", default="zstd", help="Codec for every column: zstd, snappy, lz4, gzip or none.")
+parser.add_argument("--column-compression", nargs="*", default=[], metavar="COLUMN=CODEC",
+                    help="Per-column codec overrides (Parquet only).")
+parser.add_argument("--incremental-key", help="Append only rows past the last export, keyed by this column or rowid.")
+parser.add_argument("--batch-size", type=int, default=50000, help="Rows per record batch.")
+args = parser.parse_args()
+
+database_file = os.path.join("database_scripts", "zomata_database.db")
+if not os.path.exists(database_file):
+    raise FileNotFoundError(f"Database file '{database_file}' not found. Please run the create_database.py script first.")
+
+column_compression = dict(option.split("=", 1) for option in args.column_compression)
+db_manager = DatabaseManager(database_file, read_only=True)
+
+if args.query:
+    rows = db_manager.export_query(args.query, args.out, file_format=args.format, compression=args.compression,
+                                   column_compression=column_compression, batch_size=args.batch_size)
+    print(f"Exported {rows} rows to '{args.out}'.")
+else:
+    for table_name in args.tables:
+        rows = db_manager.export_table(
+            table_name, os.path.join(args.out, table_name), file_format=args.format, compression=args.compression,
+            column_compression=column_compression, incremental_key=args.incremental_key, batch_size=args.batch_size,
+        )
+        print(f"Exported {rows} rows from '{table_name}'.")
+
+db_manager.close()
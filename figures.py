@@ -0,0 +1,213 @@
+"""
+Rendering layer for insight charts.
+
+Plotly serializes every point of a figure into the page, so a chart of a multi-year daily
+series or of every order grows to megabytes. render_figure fits the data to a point budget
+before the figure is built:
+  line     Largest-Triangle-Three-Buckets (LTTB) keeps the points that preserve the shape
+  scatter  points are binned onto a grid, one marker per occupied cell sized by its count
+  bar/pie  ordered x values are merged into consecutive bins; other categories past the
+           budget are folded into "Other"
+Line and scatter traces switch to WebGL above webgl_threshold points. FigureCache keeps the
+serialized figure JSON keyed by the data version and chart type, so reruns on unchanged data
+skip both the downsampling and the serialization.
+
+plotly is imported lazily, so importing this module does not load it.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Union
+
+import numpy as np
+
+CHART_TYPES = ("line", "bar", "scatter", "pie")
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept when reducing a series to `threshold` points with
+    Largest-Triangle-Three-Buckets (Steinarsson, 2013).
+    :param x: Monotonic x positions.
+    :param y: Values.
+    :param threshold: Points to keep (the first and last are always kept).
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # threshold - 2 buckets over the interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_x, next_y = x[stop:edges[bucket + 2]].mean(), y[stop:edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Twice the area of the triangle (previous kept point, candidate, next bucket's average)
+        area = np.abs((x[previous] - next_x) * (y[start:stop] - y[previous])
+                      - (x[previous] - x[start:stop]) * (next_y - y[previous]))
+        previous = start + int(area.argmax())
+        kept[bucket + 1] = previous
+    return kept
+
+
+def bin_points(x: np.ndarray, y: np.ndarray, bins: int):
+    """
+    Aggregate a point cloud onto a bins x bins grid.
+    :return: (x, y, count) of the centre of every occupied cell.
+    """
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    cells_x, cells_y = np.nonzero(counts)
+    x_centres = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centres = (y_edges[:-1] + y_edges[1:]) / 2
+    return x_centres[cells_x], y_centres[cells_y], counts[cells_x, cells_y].astype(np.int64)
+
+
+def _positions(values):
+    """Numeric positions for x values (numbers, dates or date strings), or None if they are categorical."""
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=np.float64)
+    for date_format in ("ISO8601", "mixed"):  # ISO8601 is the stored form and parses much faster
+        try:
+            return pd.to_datetime(values, format=date_format).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+def _downsample(data, chart_type: str, x: str, y: str, max_points: int, max_categories: int, aggregate: str):
+    """Fit data to the point budget of its chart type; returns (data, note) where note describes the reduction."""
+    rows = len(data)
+    if chart_type == "line" and rows > max_points:
+        positions = _positions(data[x])
+        if positions is None:
+            positions = np.arange(rows, dtype=np.float64)
+        kept = lttb(positions, data[y].to_numpy(dtype=np.float64), max_points)
+        return data.iloc[kept], f"LTTB: {rows:,} points reduced to {len(kept):,}"
+
+    if chart_type == "scatter" and rows > max_points:
+        positions = _positions(data[x])
+        if positions is not None and _positions(data[y]) is not None:
+            import pandas as pd
+
+            bins = max(int(np.sqrt(max_points)), 2)
+            cell_x, cell_y, count = bin_points(positions, data[y].to_numpy(dtype=np.float64), bins)
+            if not pd.api.types.is_numeric_dtype(data[x]):
+                cell_x = pd.to_datetime(cell_x.astype(np.int64))
+            binned = pd.DataFrame({x: cell_x, y: cell_y, "points": count})
+            return binned, f"{rows:,} points binned into {len(binned):,} cells"
+
+    if chart_type in ("bar", "pie") and rows > max_categories:
+        import pandas as pd
+
+        if chart_type == "bar" and _positions(data[x]) is not None:
+            # Ordered x (dates, hours): merge consecutive rows so the axis keeps its order
+            group = np.arange(rows) * max_categories // rows
+            merged = data.groupby(group, sort=True).agg({x: "first", y: aggregate})
+            return merged, f"{rows:,} bars merged into {len(merged):,}"
+        ranked = data.sort_values(y, ascending=False)
+        head, tail = ranked.iloc[:max_categories - 1], ranked.iloc[max_categories - 1:]
+        other = pd.DataFrame({x: ["Other"], y: [tail[y].agg(aggregate)]})
+        return pd.concat([head[[x, y]], other], ignore_index=True), f"{len(tail):,} smallest folded into Other"
+
+    return data, None
+
+
+def render_figure(data, chart_type: str, x: str, y: str, title: Optional[str] = None, max_points: int = 2000,
+                  max_categories: int = 50, webgl_threshold: int = 1000, aggregate: str = "sum"):
+    """
+    Build a Plotly figure from a DataFrame, reduced to the point budget of its chart type.
+    :param data: DataFrame holding the x and y columns.
+    :param chart_type: "line", "bar", "scatter" or "pie".
+    :param x: Column on the x axis (the names for a pie chart).
+    :param y: Column on the y axis (the values for a pie chart).
+    :param title: Chart title.
+    :param max_points: Maximum points of a line or scatter trace.
+    :param max_categories: Maximum bars or pie slices.
+    :param webgl_threshold: Line and scatter traces with more points render with WebGL.
+    :param aggregate: How merged bars and the "Other" slice combine y ("sum", "mean", "max", ...).
+    :return: plotly.graph_objects.Figure.
+    """
+    if chart_type not in CHART_TYPES:
+        raise ValueError(f"Unsupported chart type '{chart_type}'; use one of {CHART_TYPES}.")
+    import plotly.express as px
+
+    data, note = _downsample(data, chart_type, x, y, max_points, max_categories, aggregate)
+    render_mode = "webgl" if len(data) > webgl_threshold else "svg"
+    if chart_type == "line":
+        figure = px.line(data, x=x, y=y, title=title, render_mode=render_mode)
+    elif chart_type == "scatter":
+        size = "points" if "points" in data.columns else None
+        figure = px.scatter(data, x=x, y=y, size=size, title=title, render_mode=render_mode)
+    elif chart_type == "bar":
+        figure = px.bar(data, x=x, y=y, title=title)
+    else:
+        figure = px.pie(data, names=x, values=y, title=title)
+    if note:
+        figure.add_annotation(text=note, xref="paper", yref="paper", x=1, y=1.08, showarrow=False,
+                              font={"size": 10, "color": "gray"})
+    return figure
+
+
+class FigureCache:
+    """LRU cache of serialized figure JSON, keyed by data version and chart parameters."""
+
+    def __init__(self, max_entries: int = 64, ttl: float = 3600.0):
+        """
+        Initialize the cache.
+        :param max_entries: Maximum figures kept before the least recently used one is evicted.
+        :param ttl: Seconds a cached figure stays valid.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = self.misses = self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, data_version: Hashable, key: Hashable, render: Callable) -> str:
+        """
+        Figure JSON for a key, rendering and serializing it on a miss.
+        :param data_version: Version of the data behind the figure (e.g. a replica generation);
+            entries for older versions are never returned.
+        :param key: Chart identity: insight, its parameters and chart type.
+        :param render: Callable returning a plotly Figure.
+        :return: Figure JSON, ready for json.loads and st.plotly_chart.
+        """
+        cache_key = (data_version, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] >= time.monotonic():
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        figure_json = render().to_json()
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + self.ttl, figure_json)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return figure_json
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Hit/miss counters and the size of the cached JSON."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "bytes": sum(len(entry[1]) for entry in self._entries.values()),
+            }
@@ -1,7 +1,11 @@
 import os
+import argparse
+import shutil
+import numpy as np
 import pandas as pd
 from faker import Faker
 import random
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
 # Initialize Faker
@@ -9,7 +13,22 @@ faker = Faker()
 
 # Folder for saving datasets
 output_folder = "synthetic_datasets"
-os.makedirs(output_folder, exist_ok=True)
+
+# Categorical values shared by both generators
+CUISINES = ["Indian", "Chinese", "Mexican", "Italian", "American"]
+ORDER_STATUSES = ["Pending", "Delivered", "Cancelled"]
+PAYMENT_MODES = ["Credit Card", "Cash", "UPI"]
+DELIVERY_STATUSES = ["On the way", "Delivered"]
+VEHICLE_TYPES = ["Bike", "Car", "Scooter"]
+
+# Table codes used to derive ids and per-chunk random streams in the scalable generator
+TABLE_CODES = {"customers": 1, "restaurants": 2, "orders": 3, "deliveries": 4}
+
+# Tables whose rows reference rows of other tables in the scalable generator
+PARENT_TABLES = {"orders": ["customers", "restaurants"], "deliveries": ["orders"]}
+
+# Default latest order/signup date, fixed so a seed gives the same output on any day
+DEFAULT_AS_OF = "2025-01-01"
 
 # Dataset creation functions
 def generate_customers(num_records=100):
@@ -88,21 +107,206 @@ def generate_deliveries(num_records=200, order_ids=None):
         })
     return pd.DataFrame(data)
 
-# Generate datasets
-customers_df = generate_customers(100)
-restaurants_df = generate_restaurants(50)
-orders_df = generate_orders(200, customers_df["customer_id"].tolist(), restaurants_df["restaurant_id"].tolist())
-deliveries_df = generate_deliveries(200, orders_df["order_id"].tolist())
+# Scalable generator: columns are drawn in bulk with NumPy, one chunk of rows per task.
+# Every chunk has its own random stream seeded from (seed, table, chunk), so the output
+# is identical for a given seed whatever the number of worker processes.
+def build_pools(seed, pool_size=1000):
+    """
+    Pre-generates the Faker values the scalable generator samples from.
+    """
+    pool_faker = Faker()
+    pool_faker.seed_instance(seed)
+    return {
+        "names": np.array([pool_faker.name() for _ in range(pool_size)], dtype=object),
+        "companies": np.array([pool_faker.company() for _ in range(pool_size)], dtype=object),
+        "addresses": np.array([pool_faker.address() for _ in range(pool_size)], dtype=object),
+        "phones": np.array([pool_faker.phone_number() for _ in range(pool_size)], dtype=object),
+        "domains": np.array([pool_faker.free_email_domain() for _ in range(50)], dtype=object),
+    }
+
+def make_ids(seed, table, indices):
+    """
+    Deterministic UUID-formatted ids for row indices, so any chunk can reference rows generated by another process.
+    """
+    prefix = f"{seed & 0xFFFFFFFF:08x}-{TABLE_CODES[table]:04x}-4000-8000-"
+    return prefix + pd.Series(indices).map("{:012x}".format).to_numpy(dtype=object)
+
+def format_timestamps(seconds):
+    """
+    Formats epoch seconds as 'YYYY-MM-DD HH:MM:SS' strings.
+    """
+    return pd.to_datetime(seconds, unit="s").strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object)
+
+def generate_chunk(table, start, stop, counts, seed, as_of, pools):
+    """
+    Generates rows [start, stop) of one table as a DataFrame.
+    """
+    rng = np.random.default_rng([seed, TABLE_CODES[table], start])
+    n = stop - start
+    indices = np.arange(start, stop)
+    pick = lambda values: rng.choice(np.array(values, dtype=object), n)
+    end = int(pd.Timestamp(as_of).timestamp())
+
+    if table == "customers":
+        signup = pd.to_datetime(end - rng.integers(0, 2 * 365 * 86400, n), unit="s")
+        return pd.DataFrame({
+            "customer_id": make_ids(seed, "customers", indices),
+            "name": pick(pools["names"]),
+            "email": "customer" + indices.astype(str).astype(object) + "@" + pick(pools["domains"]),
+            "phone": pick(pools["phones"]),
+            "location": pick(pools["addresses"]),
+            "signup_date": signup.strftime("%Y-%m-%d"),
+            "is_premium": rng.random(n) < 0.5,
+            "preferred_cuisine": pick(CUISINES),
+            "total_orders": rng.integers(1, 51, n),
+            "average_rating": np.round(rng.uniform(1, 5, n), 2),
+        })
+
+    if table == "restaurants":
+        return pd.DataFrame({
+            "restaurant_id": make_ids(seed, "restaurants", indices),
+            "name": pick(pools["companies"]),
+            "cuisine_type": pick(CUISINES),
+            "location": pick(pools["addresses"]),
+            "owner_name": pick(pools["names"]),
+            "average_delivery_time": rng.integers(20, 61, n),
+            "contact_number": pick(pools["phones"]),
+            "rating": np.round(rng.uniform(1, 5, n), 2),
+            "total_orders": rng.integers(1, 201, n),
+            "is_active": rng.random(n) < 0.5,
+        })
+
+    if table == "orders":
+        placed = end - rng.integers(0, 365 * 86400, n)
+        status = pick(ORDER_STATUSES)
+        delivered = format_timestamps(placed + 60 * rng.integers(20, 121, n))
+        return pd.DataFrame({
+            "order_id": make_ids(seed, "orders", indices),
+            "customer_id": make_ids(seed, "customers", rng.integers(0, counts["customers"], n)),
+            "restaurant_id": make_ids(seed, "restaurants", rng.integers(0, counts["restaurants"], n)),
+            "order_date": format_timestamps(placed),
+            "delivery_time": np.where(status == "Delivered", delivered, None),
+            "status": status,
+            "total_amount": np.round(rng.uniform(10, 200, n), 2),
+            "payment_mode": pick(PAYMENT_MODES),
+            "discount_applied": np.round(rng.uniform(0, 20, n), 2),
+            "feedback_rating": np.round(rng.uniform(1, 5, n), 2),
+        })
+
+    actual = rng.integers(15, 121, n)
+    return pd.DataFrame({
+        "delivery_id": make_ids(seed, "deliveries", indices),
+        "order_id": make_ids(seed, "orders", rng.integers(0, counts["orders"], n)),
+        "delivery_status": pick(DELIVERY_STATUSES),
+        "distance": np.round(rng.uniform(1, 20, n), 2),
+        "delivery_time": actual,
+        "estimated_time": actual + rng.integers(-10, 11, n),
+        "delivery_fee": np.round(rng.uniform(2, 10, n), 2),
+        "vehicle_type": pick(VEHICLE_TYPES),
+    })
+
+def write_chunk(task):
+    """
+    Worker entry point: generates one chunk and writes it as a part file.
+    """
+    table, start, stop, counts, seed, as_of, pools, part_path, file_format = task
+    chunk = generate_chunk(table, start, stop, counts, seed, as_of, pools)
+    if file_format == "parquet":
+        chunk.to_parquet(part_path, index=False)
+    else:
+        chunk.to_csv(part_path, index=False, header=False)
+    return part_path
+
+def generate_scalable(counts, seed, as_of, chunk_size, workers, file_format, folder, pool_size):
+    """
+    Generates all four tables in chunks across worker processes.
+    CSV parts are concatenated into <table>.csv; Parquet parts are kept as a <table>.parquet dataset directory.
+    """
+    for table, parents in PARENT_TABLES.items():
+        empty = [parent for parent in parents if counts[parent] == 0]
+        if counts[table] and empty:
+            raise ValueError(f"Cannot generate {table} without {' and '.join(empty)} to reference.")
+    pools = build_pools(seed, pool_size)
+    tasks = []
+    for table, total in counts.items():
+        parts_dir = os.path.join(folder, f"{table}.parquet" if file_format == "parquet" else f".{table}_parts")
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        os.makedirs(parts_dir)
+        # populate_database.py prefers <table>.parquet, so drop the other format's output of an earlier run
+        if file_format == "parquet" and os.path.exists(os.path.join(folder, f"{table}.csv")):
+            os.remove(os.path.join(folder, f"{table}.csv"))
+        if file_format == "csv":
+            shutil.rmtree(os.path.join(folder, f"{table}.parquet"), ignore_errors=True)
+        for index, start in enumerate(range(0, total, chunk_size)):
+            part_path = os.path.join(parts_dir, f"part-{index:05d}.{file_format}")
+            tasks.append((table, start, min(start + chunk_size, total), counts, seed, as_of, pools, part_path, file_format))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parts = list(executor.map(write_chunk, tasks))
+
+    if file_format == "csv":
+        for table in counts:
+            parts_dir = os.path.join(folder, f".{table}_parts")
+            columns = generate_chunk(table, 0, 0, counts, seed, as_of, pools).columns
+            with open(os.path.join(folder, f"{table}.csv"), "w", newline="") as output:
+                output.write(",".join(columns) + "\n")
+                for part_path in sorted(p for p in parts if p.startswith(parts_dir + os.sep)):
+                    with open(part_path) as part:
+                        shutil.copyfileobj(part, output)
+            shutil.rmtree(parts_dir)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the synthetic datasets.")
+    parser.add_argument("--customers", type=int, default=100)
+    parser.add_argument("--restaurants", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--deliveries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible output.")
+    parser.add_argument("--scalable", action="store_true",
+                        help="Vectorized multi-process generator for load-test volumes.")
+    parser.add_argument("--chunk-size", type=int, default=500000, help="Rows per worker task (scalable mode).")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (scalable mode).")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv", help="Output format (scalable mode).")
+    parser.add_argument("--as-of", default=DEFAULT_AS_OF,
+                        help="Latest order/signup date (scalable mode); with --seed, output is identical across runs.")
+    parser.add_argument("--pool-size", type=int, default=1000, help="Faker values per name/address pool (scalable mode).")
+    args = parser.parse_args()
+
+    os.makedirs(output_folder, exist_ok=True)
+
+    if args.scalable:
+        counts = {
+            "customers": args.customers,
+            "restaurants": args.restaurants,
+            "orders": args.orders,
+            "deliveries": args.deliveries,
+        }
+        seed = 42 if args.seed is None else args.seed
+        try:
+            generate_scalable(counts, seed, args.as_of, args.chunk_size, args.workers, args.format,
+                              output_folder, args.pool_size)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        if args.seed is not None:
+            Faker.seed(args.seed)
+            random.seed(args.seed)
+
+        # Generate datasets
+        customers_df = generate_customers(args.customers)
+        restaurants_df = generate_restaurants(args.restaurants)
+        orders_df = generate_orders(args.orders, customers_df["customer_id"].tolist(), restaurants_df["restaurant_id"].tolist())
+        deliveries_df = generate_deliveries(args.deliveries, orders_df["order_id"].tolist())
 
-# Save datasets as CSV files
-customers_file = os.path.join(output_folder, "customers.csv")
-restaurants_file = os.path.join(output_folder, "restaurants.csv")
-orders_file = os.path.join(output_folder, "orders.csv")
-deliveries_file = os.path.join(output_folder, "deliveries.csv")
+        # Save datasets as CSV files
+        customers_file = os.path.join(output_folder, "customers.csv")
+        restaurants_file = os.path.join(output_folder, "restaurants.csv")
+        orders_file = os.path.join(output_folder, "orders.csv")
+        deliveries_file = os.path.join(output_folder, "deliveries.csv")
 
-customers_df.to_csv(customers_file, index=False)
-restaurants_df.to_csv(restaurants_file, index=False)
-orders_df.to_csv(orders_file, index=False)
-deliveries_df.to_csv(deliveries_file, index=False)
+        customers_df.to_csv(customers_file, index=False)
+        restaurants_df.to_csv(restaurants_file, index=False)
+        orders_df.to_csv(orders_file, index=False)
+        deliveries_df.to_csv(deliveries_file, index=False)
 
-print(f"Datasets saved in folder: {output_folder}")
+    print(f"Datasets saved in folder: {output_folder}")
@@ -0,0 +1,42 @@
+"""
+Concurrent execution of dashboard insights.
+
+SQLite releases the GIL while it runs a query, so independent insight queries (and the
+DataFrame/figure work around them) overlap well on a small thread pool.
+"""
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+InsightResult = namedtuple("InsightResult", ["name", "data", "figure", "error", "elapsed"])
+
+
+def _run_one(name: str, fetch_visualize: Callable) -> InsightResult:
+    """Run a single insight, capturing its error instead of raising it."""
+    start = time.perf_counter()
+    try:
+        data, figure = fetch_visualize()
+        return InsightResult(name, data, figure, None, time.perf_counter() - start)
+    except Exception as e:
+        return InsightResult(name, None, None, e, time.perf_counter() - start)
+
+
+def run_insights(tasks: List[Tuple[str, Callable]], max_workers: int) -> List[InsightResult]:
+    """
+    Run insight callables concurrently.
+    :param tasks: (name, callable) pairs; each callable returns a (data, figure) tuple.
+    :param max_workers: Maximum worker threads. Pass the pool_size of the DatabaseManager the
+        tasks read from: workers beyond it only wait for a pooled connection.
+    :return: One InsightResult per task, in the order the tasks were given.
+    """
+    if not tasks:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)), thread_name_prefix="insight") as executor:
+        futures = [executor.submit(_run_one, name, fetch_visualize) for name, fetch_visualize in tasks]
+        return [future.result() for future in futures]
+
+
+def run_insights_serially(tasks: List[Tuple[str, Callable]]) -> List[InsightResult]:
+    """Run insight callables one after another (the baseline for run_insights)."""
+    return [_run_one(name, fetch_visualize) for name, fetch_visualize in tasks]
@@ -0,0 +1,152 @@
+"""
+Parameterized insight queries over Orders.
+
+Each insight is a grouped SELECT over Orders, joined only to the tables its columns and
+filters need. build_query adds the top-k limit, an order_date window and categorical
+filters as bound parameters: the window is answered through idx_orders_order_date and
+the cuisine filter through idx_restaurants_cuisine instead of a whole-history scan.
+Location insights and filters use the integer state and city keys of the location
+dimension (see locations.py), never the raw address strings. The
+SQL text depends only on which inputs are set and the parameters hold their values, so
+equal inputs always produce the same (query, params) query cache key. Requests over the
+whole history with no filter set (is_unfiltered) are answered from the Orders rollups
+instead where one exists (see DatabaseManager.insight_query).
+"""
+import re
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
+
+Insight = namedtuple("Insight", ["columns", "group_by", "order_by", "ranked"])
+
+# Insight name -> select list, grouping, ordering, and whether top_k limits it
+INSIGHTS = {
+    "top_customers": Insight("c.name, COUNT(*) AS order_count", "o.customer_id", "order_count DESC", True),
+    "top_restaurants": Insight("r.name, COUNT(*) AS order_count", "o.restaurant_id", "order_count DESC", True),
+    "order_value_by_restaurant": Insight(
+        "r.name, SUM(o.total_amount) AS total_value", "o.restaurant_id", "total_value DESC", True
+    ),
+    "avg_feedback_by_restaurant": Insight(
+        "r.name, AVG(o.feedback_rating) AS avg_feedback", "o.restaurant_id", "avg_feedback DESC", True
+    ),
+    "avg_feedback_by_customer": Insight(
+        "c.name, AVG(o.feedback_rating) AS avg_feedback", "o.customer_id", "avg_feedback DESC", True
+    ),
+    "popular_cuisines": Insight("r.cuisine_type, COUNT(*) AS order_count", "r.cuisine_type", "order_count DESC", True),
+    "average_delivery_times": Insight(
+        "r.name, AVG(d.delivery_time) AS avg_delivery_time", "o.restaurant_id", "avg_delivery_time ASC", True
+    ),
+    "peak_ordering_times": Insight(
+        "strftime('%H', o.order_date) AS hour, COUNT(*) AS order_count", "hour", "order_count DESC", True
+    ),
+    "order_count_by_hour": Insight(
+        "strftime('%H', o.order_date) AS hour, COUNT(*) AS order_count", "hour", "hour", False
+    ),
+    "peak_ordering_days": Insight(
+        "strftime('%w', o.order_date) AS weekday, COUNT(*) AS order_count", "weekday", "order_count DESC", False
+    ),
+    "orders_by_day": Insight("date(o.order_date) AS day, COUNT(*) AS order_count", "day", "day", False),
+    "orders_by_month": Insight(
+        "strftime('%Y-%m', o.order_date) AS month, COUNT(*) AS order_count", "month", "month", False
+    ),
+    "top_customer_states": Insight("cs.code AS state, COUNT(*) AS order_count", "c.state_id", "order_count DESC", True),
+    "top_customer_cities": Insight(
+        "cc.name || ', ' || cs.code AS city, COUNT(*) AS order_count", "c.city_id", "order_count DESC", True
+    ),
+    "top_restaurant_states": Insight(
+        "rs.code AS state, COUNT(*) AS order_count", "r.state_id", "order_count DESC", True
+    ),
+}
+
+# Filter name -> (column, operator); "in" matches any of the given values, "like" a substring
+FILTERS = {
+    "cuisine": ("r.cuisine_type", "in"),
+    "status": ("o.status", "in"),
+    "payment_mode": ("o.payment_mode", "in"),
+    "restaurant_location": ("r.location", "like"),
+    "customer_location": ("c.location", "like"),
+    "restaurant_state": ("rs.code", "in"),
+    "customer_state": ("cs.code", "in"),
+}
+
+# Alias -> join, in join order; the city and state lookups join through their customer or restaurant
+JOINS = {
+    "c": "JOIN Customers c ON c.customer_id = o.customer_id",
+    "cc": "JOIN Cities cc ON cc.city_id = c.city_id",
+    "cs": "JOIN States cs ON cs.state_id = c.state_id",
+    "r": "JOIN Restaurants r ON r.restaurant_id = o.restaurant_id",
+    "rs": "JOIN States rs ON rs.state_id = r.state_id",
+    "d": "JOIN Deliveries d ON d.order_id = o.order_id",
+}
+ALIAS = re.compile(r"\b(cc|cs|rs|[crd])\.")
+
+
+def _bound(value, end: bool = False) -> str:
+    """order_date bound as stored text; a plain end date includes that whole day."""
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return (value + timedelta(days=1) if end else value).isoformat()
+    return str(value)
+
+
+def _is_set(value) -> bool:
+    return not (value is None or value == "" or value == [] or value == ())
+
+
+def is_unfiltered(start=None, end=None, **filters) -> bool:
+    """Whether an insight request covers the whole order history with no filter set."""
+    return start is None and end is None and not any(_is_set(value) for value in filters.values())
+
+
+def build_query(name: str, top_k: int = 5, start=None, end=None, **filters) -> Tuple[str, Tuple]:
+    """
+    SQL and bound parameters for an insight.
+    :param name: Key of INSIGHTS (e.g., "top_restaurants").
+    :param top_k: Rows returned by ranked insights.
+    :param start: Earliest order_date included (date, datetime or ISO string), or None.
+    :param end: order_date upper bound, exclusive for datetimes and strings; a date includes that day.
+    :param filters: FILTERS values, e.g. cuisine=["Italian", "Thai"] or restaurant_location="MS".
+    :return: (query, params) tuple.
+    """
+    if name not in INSIGHTS:
+        raise KeyError(f"Unknown insight '{name}'.")
+    unknown = set(filters) - set(FILTERS)
+    if unknown:
+        raise ValueError(f"Unknown insight filters {sorted(unknown)}; use any of {sorted(FILTERS)}.")
+    if not isinstance(top_k, int) or top_k < 1:
+        raise ValueError(f"top_k must be a positive integer, got {top_k!r}.")
+
+    insight = INSIGHTS[name]
+    conditions: List[str] = []
+    params: List = []
+    if start is not None:
+        conditions.append("o.order_date >= ?")
+        params.append(_bound(start))
+    if end is not None:
+        conditions.append("o.order_date < ?")
+        params.append(_bound(end, end=True))
+    for filter_name in sorted(filters):
+        value = filters[filter_name]
+        if not _is_set(value):
+            continue
+        column, operator = FILTERS[filter_name]
+        if operator == "like":
+            conditions.append(f"{column} LIKE ?")
+            params.append(f"%{value}%")
+        else:
+            values = [value] if isinstance(value, str) else sorted(value)
+            conditions.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+
+    aliases = set(ALIAS.findall(" ".join([insight.columns, insight.group_by] + conditions)))
+    aliases |= {alias[0] for alias in aliases}
+    joins = " ".join(join for alias, join in JOINS.items() if alias in aliases)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    # Orders without a group key (e.g. a missing or unparseable order_date) are left out, as in the rollups
+    query = (f"SELECT {insight.columns} FROM Orders o {joins} {where} GROUP BY {insight.group_by} "
+             f"HAVING {insight.group_by} IS NOT NULL ORDER BY {insight.order_by}")
+    if insight.ranked:
+        query += " LIMIT ?"
+        params.append(top_k)
+    return re.sub(r"\s+", " ", query) + ";", tuple(params)
@@ -0,0 +1,69 @@
+"""
+Location dimension parsed from the Customers and Restaurants addresses.
+
+location holds a full multi-line address ("392 Bonnie Groves Suite 450\nSouth Matthew, MS 98956"),
+so nearly every value is unique and grouping on it is both meaningless and expensive. The last
+line is parsed once, when rows are loaded (populate_database.py) or inserted (insert_record),
+into city, state and postal code. States and cities are stored as integer-keyed rows of the
+States and Cities lookup tables; Customers and Restaurants carry indexed state_id and city_id
+keys plus the postal_code, so location insights group on small integers.
+"""
+import re
+from typing import List, Optional, Tuple
+
+LOCATION_TABLES = ("Customers", "Restaurants")
+
+# Lookup tables, created before the key columns that reference them
+DIMENSION_TABLES = {
+    "States": "state_id INTEGER PRIMARY KEY, code TEXT NOT NULL UNIQUE",
+    "Cities": "city_id INTEGER PRIMARY KEY, state_id INTEGER NOT NULL REFERENCES States (state_id), "
+              "name TEXT NOT NULL, UNIQUE (state_id, name)",
+}
+
+# Columns derived from location on every location table
+KEY_COLUMNS = {
+    "city_id": "INTEGER REFERENCES Cities (city_id)",
+    "state_id": "INTEGER REFERENCES States (state_id)",
+    "postal_code": "TEXT",
+}
+KEY_COLUMN_NAMES = tuple(KEY_COLUMNS)
+
+# Index name -> (table, column) for the keys the location insights group and filter on
+INDEXES = {
+    f"idx_{table.lower()}_{column}": (table, column)
+    for table in LOCATION_TABLES for column in ("state_id", "city_id")
+}
+
+# Last address line: "City, ST 12345", "City, ST 12345-6789" or a military "APO AE 12345"
+ADDRESS_TAIL = re.compile(
+    r"(?P<city>[^\r\n,]+?),?[ \t]+(?P<state>[A-Z]{2})[ \t]+(?P<postal_code>\d{5}(?:-\d{4})?)\s*$"
+)
+
+
+def parse_location(address) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """
+    Split an address into city, state and postal code.
+    :param address: Address string; the city, state and postal code are read from its last line.
+    :return: (city, state, postal_code), or (None, None, None) if the address does not parse.
+    """
+    if not isinstance(address, str):
+        return None, None, None
+    match = ADDRESS_TAIL.search(address)
+    if match is None:
+        return None, None, None
+    return match["city"].strip(), match["state"], match["postal_code"]
+
+
+def schema_sql(existing_columns: dict) -> List[str]:
+    """
+    Statements creating the lookup tables, the missing key columns and their indexes.
+    :param existing_columns: Table name -> set of its current column names.
+    """
+    statements = [f"CREATE TABLE IF NOT EXISTS {table} ({columns});" for table, columns in DIMENSION_TABLES.items()]
+    for table in LOCATION_TABLES:
+        statements += [
+            f"ALTER TABLE {table} ADD COLUMN {column} {definition};"
+            for column, definition in KEY_COLUMNS.items() if column not in existing_columns.get(table, ())
+        ]
+    statements += [f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column});" for name, (table, column) in INDEXES.items()]
+    return statements
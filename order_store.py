@@ -0,0 +1,370 @@
+"""
+In-process columnar copy of the Orders table for the most-viewed dashboard counts.
+
+OrderStore loads Orders once into NumPy columns (epoch-second timestamps, dictionary-encoded
+restaurant and customer ids, float32 amounts and ratings, plus the hour, weekday and month
+derived from each timestamp once at load) and answers the hour, weekday, month and
+per-restaurant/customer counts with np.bincount instead of re-parsing order_date with
+strftime in SQL. Triggers append the rowid of every inserted, updated or deleted order
+to a changelog table; before answering, the store applies the rows logged since its last
+sync, so it stays current without reloading. The triggers outlive the store: once the
+last store reading the database is retired, call close(uninstall=True) (or drop_changelog)
+so Orders writes stop logging to a table nobody prunes.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .summary_tables import TRACKED_COLUMNS
+
+CHANGELOG_TABLE = "_orders_changes"
+CHANGELOG_TRIGGERS = ["_orders_changes_insert", "_orders_changes_update", "_orders_changes_delete"]
+MISSING_TIMESTAMP = np.iinfo(np.int64).min
+EPOCH_WEEKDAY = 4  # 1970-01-01 was a Thursday (strftime('%w') numbering, Sunday = 0)
+# Bucket that orders with an unparseable order_date fall into (left out of the counts)
+NO_HOUR, NO_WEEKDAY, NO_MONTH = 24, 7, 0
+
+ORDER_QUERY = "SELECT rowid, order_date, restaurant_id, customer_id, total_amount, feedback_rating FROM Orders"
+
+
+def changelog_sql() -> List[str]:
+    """Statements creating the Orders changelog table and the triggers feeding it."""
+    log = f"INSERT INTO {CHANGELOG_TABLE} (order_rowid) VALUES"
+    return [
+        f"CREATE TABLE IF NOT EXISTS {CHANGELOG_TABLE} (seq INTEGER PRIMARY KEY AUTOINCREMENT, order_rowid INTEGER NOT NULL);",
+        f"CREATE TRIGGER IF NOT EXISTS _orders_changes_insert AFTER INSERT ON Orders BEGIN {log} (NEW.rowid); END;",
+        f"CREATE TRIGGER IF NOT EXISTS _orders_changes_update AFTER UPDATE OF {TRACKED_COLUMNS} ON Orders "
+        f"BEGIN {log} (OLD.rowid); {log} (NEW.rowid); END;",
+        f"CREATE TRIGGER IF NOT EXISTS _orders_changes_delete AFTER DELETE ON Orders BEGIN {log} (OLD.rowid); END;",
+    ]
+
+
+def drop_changelog_sql() -> List[str]:
+    """Statements removing the changelog triggers and table."""
+    statements = [f"DROP TRIGGER IF EXISTS {trigger};" for trigger in CHANGELOG_TRIGGERS]
+    return statements + [f"DROP TABLE IF EXISTS {CHANGELOG_TABLE};"]
+
+
+def parse_timestamps(values) -> np.ndarray:
+    """Epoch seconds for ISO-8601 date strings; unparseable or NULL dates become MISSING_TIMESTAMP."""
+    try:
+        return np.array(values, dtype="datetime64[s]").astype(np.int64)
+    except (ValueError, TypeError):
+        parsed = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values):
+            try:
+                parsed[i] = np.datetime64(value, "s").astype(np.int64)
+            except (ValueError, TypeError):
+                parsed[i] = MISSING_TIMESTAMP
+        return parsed
+
+
+class Dictionary:
+    """Dictionary encoding of string ids to dense int32 codes."""
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, values) -> np.ndarray:
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            code = self.codes.get(value)
+            if code is None:
+                code = self.codes[value] = len(self.values)
+                self.values.append(value)
+            codes[i] = code
+        return codes
+
+
+class OrderStore:
+    """Columnar, delta-maintained copy of Orders answering the hot dashboard counts with bincount."""
+
+    COLUMNS = {
+        "rowid": np.int64,
+        "timestamp": np.int64,
+        "restaurant": np.int32,
+        "customer": np.int32,
+        "amount": np.float32,
+        "rating": np.float32,
+        "hour": np.uint8,
+        "weekday": np.uint8,
+        "month": np.int32,  # months since 1970-01, plus one
+        "live": np.bool_,
+    }
+
+    def __init__(self, db_path: str, batch_size: int = 50000, prune: bool = True):
+        """
+        Initialize an empty store; call load() to fill it.
+        :param db_path: Path to the SQLite database file.
+        :param batch_size: Rows fetched per batch while loading.
+        :param prune: Delete changelog entries once applied. Disable when several stores share the database.
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.prune = prune
+        self.logger = logging.getLogger(__name__)
+        self.restaurants = Dictionary()
+        self.customers = Dictionary()
+        self.size = 0
+        self.last_seq = 0
+        self._tracking = False  # changelog installed by load() and not dropped since
+        self._dead = 0
+        self._columns = {name: np.empty(0, dtype=kind) for name, kind in self.COLUMNS.items()}
+        self._names = {"Restaurants": {}, "Customers": {}}
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._conn
+
+    def close(self, uninstall: bool = False) -> None:
+        """
+        Close the store's database connection.
+        :param uninstall: Also remove the changelog triggers and table (see drop_changelog).
+            Leave False while other stores share the database.
+        """
+        with self._lock:
+            if uninstall:
+                self.drop_changelog()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def drop_changelog(self) -> None:
+        """
+        Remove the changelog triggers and table that load() installed, so Orders writes no
+        longer pay for logging. Call it when no store reads the database any more; a store
+        that keeps answering afterwards serves its current rows until the next load().
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                for statement in drop_changelog_sql():
+                    conn.execute(statement)
+            self.last_seq = 0
+            self._tracking = False
+            self.logger.info("OrderStore changelog removed.")
+
+    def column(self, name: str) -> np.ndarray:
+        """View of a column trimmed to the rows in use (deleted rows have live == False)."""
+        return self._columns[name][:self.size]
+
+    def load(self) -> "OrderStore":
+        """Install the changelog triggers and load every order, in batches."""
+        with self._lock:
+            conn = self._connection()
+            start = time.perf_counter()
+            with conn:
+                for statement in changelog_sql():
+                    conn.execute(statement)
+            self._tracking = True
+            # One read transaction, so the rows match the changelog position
+            conn.execute("BEGIN;")
+            try:
+                self.last_seq = conn.execute(f"SELECT COALESCE(MAX(seq), 0) FROM {CHANGELOG_TABLE};").fetchone()[0]
+                self.size = self._dead = 0
+                cursor = conn.execute(ORDER_QUERY + " ORDER BY rowid;")
+                while True:
+                    rows = cursor.fetchmany(self.batch_size)
+                    if not rows:
+                        break
+                    self._append(rows)
+                self._load_names(conn)
+            finally:
+                conn.commit()
+            self._prune(conn)
+            self.logger.info(f"OrderStore loaded {self.size} orders in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return self
+
+    def _encode(self, rows: List[Tuple]) -> Dict[str, np.ndarray]:
+        rowids, dates, restaurants, customers, amounts, ratings = zip(*rows)
+        timestamps = parse_timestamps(dates)
+        valid = timestamps != MISSING_TIMESTAMP
+        months = np.where(valid, timestamps, 0).astype("datetime64[s]").astype("datetime64[M]").astype(np.int64) + 1
+        return {
+            "rowid": np.array(rowids, dtype=np.int64),
+            "timestamp": timestamps,
+            "hour": np.where(valid, timestamps // 3600 % 24, NO_HOUR),
+            "weekday": np.where(valid, (timestamps // 86400 + EPOCH_WEEKDAY) % 7, NO_WEEKDAY),
+            "month": np.where(valid, months, NO_MONTH),
+            "restaurant": self.restaurants.encode(restaurants),
+            "customer": self.customers.encode(customers),
+            "amount": np.array([np.nan if value is None else value for value in amounts], dtype=np.float32),
+            "rating": np.array([np.nan if value is None else value for value in ratings], dtype=np.float32),
+            "live": np.ones(len(rows), dtype=np.bool_),
+        }
+
+    def _append(self, rows: List[Tuple]) -> None:
+        """Append rows whose rowids are all greater than the last stored one."""
+        encoded = self._encode(rows)
+        needed = self.size + len(rows)
+        capacity = len(self._columns["rowid"])
+        if needed > capacity:
+            capacity = max(needed, capacity * 2, 1024)
+            for name, column in self._columns.items():
+                grown = np.empty(capacity, dtype=column.dtype)
+                grown[:self.size] = column[:self.size]
+                self._columns[name] = grown
+        for name, values in encoded.items():
+            self._columns[name][self.size:needed] = values
+        self.size = needed
+
+    def _load_names(self, conn: sqlite3.Connection) -> None:
+        for table, key in [("Restaurants", "restaurant_id"), ("Customers", "customer_id")]:
+            self._names[table] = dict(conn.execute(f"SELECT {key}, name FROM {table};").fetchall())
+
+    def sync(self) -> int:
+        """
+        Apply the orders inserted, updated or deleted since the last sync.
+        :return: Number of changed orders applied.
+        """
+        with self._lock:
+            if not self._tracking:
+                return 0
+            conn = self._connection()
+            changes = conn.execute(
+                f"SELECT seq, order_rowid FROM {CHANGELOG_TABLE} WHERE seq > ? ORDER BY seq;", (self.last_seq,)
+            ).fetchall()
+            if not changes:
+                return 0
+            changed = sorted({rowid for _, rowid in changes})
+            current = {}
+            for i in range(0, len(changed), 500):
+                chunk = changed[i:i + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                for row in conn.execute(f"{ORDER_QUERY} WHERE rowid IN ({placeholders});", chunk):
+                    current[row[0]] = row
+            self._apply(changed, current)
+            self.last_seq = changes[-1][0]
+            self._prune(conn)
+            if len(self.restaurants.values) > len(self._names["Restaurants"]) \
+                    or len(self.customers.values) > len(self._names["Customers"]):
+                self._load_names(conn)
+            return len(changed)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        if self.prune:
+            with conn:
+                conn.execute(f"DELETE FROM {CHANGELOG_TABLE} WHERE seq <= ?;", (self.last_seq,))
+
+    def _apply(self, changed: List[int], current: Dict[int, Tuple]) -> None:
+        columns = self._columns
+        rowids = columns["rowid"][:self.size]
+        # changed is sorted and rows only move in the single re-sort after the loop, so the positions hold throughout
+        positions = np.searchsorted(rowids, changed)
+        appended = []
+        out_of_order = False
+        for rowid, position in zip(changed, positions):
+            row = current.get(rowid)
+            present = position < self.size and rowids[position] == rowid
+            if row is None:
+                if present and columns["live"][position]:
+                    columns["live"][position] = False
+                    self._dead += 1
+            elif present:
+                if not columns["live"][position]:
+                    self._dead -= 1
+                for name, values in self._encode([row]).items():
+                    columns[name][position] = values[0]
+            else:
+                appended.append(row)
+                # Rowid below the last stored one (an explicit rowid, or one reused after a delete)
+                out_of_order |= self.size > 0 and rowid < rowids[-1]
+        if appended:
+            self._append(appended)
+            if out_of_order:
+                order = np.argsort(columns["rowid"][:self.size], kind="stable")
+                for name in columns:
+                    columns[name][:self.size] = columns[name][:self.size][order]
+        self._compact()
+
+    def _compact(self) -> None:
+        """Drop deleted rows once they make up a quarter of the store."""
+        if self._dead and self._dead * 4 >= self.size:
+            live = self._columns["live"][:self.size].copy()
+            for name in self._columns:
+                kept = self._columns[name][:self.size][live]
+                self._columns[name][:len(kept)] = kept
+            self.size -= self._dead
+            self._dead = 0
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the columns (at their used size) and the id dictionaries."""
+        columns = sum(column[:self.size].nbytes for column in self._columns.values())
+        dictionaries = sum(
+            len(value) + 49 + 8 * 3 for dictionary in (self.restaurants, self.customers) for value in dictionary.values
+        )
+        return columns + dictionaries
+
+    def _live(self, name: str) -> np.ndarray:
+        """Column values of the orders not deleted since the last compaction."""
+        values = self.column(name)
+        return values[self.column("live")] if self._dead else values
+
+    def _bincount(self, name: str, minlength: int, weights: Optional[np.ndarray] = None) -> np.ndarray:
+        if weights is not None and self._dead:
+            weights = weights[self.column("live")]
+        return np.bincount(self._live(name), weights=weights, minlength=minlength)
+
+    @staticmethod
+    def _counts(labels: List[str], counts: np.ndarray, by_count: bool = False) -> List[Tuple]:
+        rows = [(label, int(count)) for label, count in zip(labels, counts) if count]
+        if by_count:
+            rows.sort(key=lambda row: row[1], reverse=True)
+        return rows
+
+    def order_count_by_hour(self) -> List[Tuple]:
+        """(hour, order_count) rows, hours as "00".."23", like summary_tables.SUMMARY_QUERIES."""
+        self.sync()
+        counts = self._bincount("hour", NO_HOUR + 1)[:NO_HOUR]
+        return self._counts([f"{hour:02d}" for hour in range(NO_HOUR)], counts)
+
+    def peak_ordering_times(self, limit: int = 5) -> List[Tuple]:
+        """The busiest hours as (hour, order_count), busiest first."""
+        return sorted(self.order_count_by_hour(), key=lambda row: row[1], reverse=True)[:limit]
+
+    def peak_ordering_days(self) -> List[Tuple]:
+        """(weekday, order_count) rows, weekdays numbered like strftime('%w'), busiest first."""
+        self.sync()
+        counts = self._bincount("weekday", NO_WEEKDAY + 1)[:NO_WEEKDAY]
+        return self._counts([str(day) for day in range(NO_WEEKDAY)], counts, by_count=True)
+
+    def orders_by_month(self) -> List[Tuple]:
+        """("YYYY-MM", order_count) rows in month order."""
+        self.sync()
+        counts = self._bincount("month", 1)
+        months = np.flatnonzero(counts[1:])
+        labels = (months.astype("datetime64[M]")).astype(str)
+        return [(label, int(counts[month + 1])) for label, month in zip(labels, months)]
+
+    def _top(self, name: str, dictionary: Dictionary, names_table: str,
+             weights: Optional[np.ndarray], limit: int) -> List[Tuple]:
+        totals = self._bincount(name, len(dictionary.values), weights)
+        top = np.argpartition(-totals, limit - 1)[:limit] if len(totals) > limit else np.arange(len(totals))
+        top = top[np.argsort(-totals[top], kind="stable")]
+        names = self._names[names_table]
+        return [(names.get(dictionary.values[code], dictionary.values[code]),
+                 int(totals[code]) if weights is None else float(totals[code]))
+                for code in top if totals[code]]
+
+    def top_restaurants(self, limit: int = 5) -> List[Tuple]:
+        """(restaurant name, order_count) for the restaurants with the most orders."""
+        self.sync()
+        return self._top("restaurant", self.restaurants, "Restaurants", None, limit)
+
+    def order_value_by_restaurant(self, limit: int = 5) -> List[Tuple]:
+        """(restaurant name, total_amount) for the restaurants with the highest order value."""
+        self.sync()
+        return self._top("restaurant", self.restaurants, "Restaurants", np.nan_to_num(self.column("amount")), limit)
+
+    def top_customers(self, limit: int = 5) -> List[Tuple]:
+        """(customer name, order_count) for the customers with the most orders."""
+        self.sync()
+        return self._top("customer", self.customers, "Customers", None, limit)
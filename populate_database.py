@@ -1,7 +1,23 @@
 import os
+import sys
 import sqlite3
+import time
+import argparse
 import pandas as pd
 
+# Add project root to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from oop_database.database_manager import DatabaseManager
+from oop_database.locations import KEY_COLUMN_NAMES, LOCATION_TABLES
+
+# Command line options
+parser = argparse.ArgumentParser(description="Populate the database with the synthetic datasets.")
+parser.add_argument("--stream", action="store_true",
+                    help="Read the datasets in chunks with flat memory use, resuming from the last checkpoint.")
+parser.add_argument("--chunksize", type=int, default=50000, help="Rows per chunk (and per transaction) when streaming.")
+parser.add_argument("--reset-checkpoints", action="store_true", help="Forget streaming checkpoints and load from the start.")
+args = parser.parse_args()
+
 # Define file paths
 data_folder = "synthetic_datasets"
 database_folder = "database_scripts"
@@ -12,58 +28,187 @@ if not os.path.exists(database_file):
     raise FileNotFoundError(f"Database file '{database_file}' not found. Please run the create_database.py script first.")
 
 # Connect to the database
-conn = sqlite3.connect(database_file)
-cursor = conn.cursor()
+db_manager = DatabaseManager(database_file)
+
+def dataset_file(name):
+    """
+    Returns the <name>.parquet dataset written by generate_datasets.py --format parquet if there is one, else <name>.csv.
+    """
+    parquet_dir = os.path.join(data_folder, f"{name}.parquet")
+    return parquet_dir if os.path.isdir(parquet_dir) else os.path.join(data_folder, f"{name}.csv")
 
 # Load synthetic datasets
-customers_file = os.path.join(data_folder, "customers.csv")
-restaurants_file = os.path.join(data_folder, "restaurants.csv")
-orders_file = os.path.join(data_folder, "orders.csv")
-deliveries_file = os.path.join(data_folder, "deliveries.csv")
+customers_file = dataset_file("customers")
+restaurants_file = dataset_file("restaurants")
+orders_file = dataset_file("orders")
+deliveries_file = dataset_file("deliveries")
 
 # Check if files exist
 for file in [customers_file, restaurants_file, orders_file, deliveries_file]:
     if not os.path.exists(file):
         raise FileNotFoundError(f"Data file '{file}' not found. Please ensure datasets are generated in the synthetic_datasets folder.")
 
-# Load data into DataFrames
-customers_df = pd.read_csv(customers_file)
-restaurants_df = pd.read_csv(restaurants_file)
-orders_df = pd.read_csv(orders_file)
-deliveries_df = pd.read_csv(deliveries_file)
+# Tables in load order, with their source files
+sources = [
+    ("Customers", customers_file),
+    ("Restaurants", restaurants_file),
+    ("Orders", orders_file),
+    ("Deliveries", deliveries_file),
+]
+
+# Rows written per transaction during the bulk load
+BATCH_SIZE = 10000
+
+# Column conversions applied to every streamed chunk
+CONVERSIONS = {
+    "Customers": {"booleans": ["is_premium"], "dates": ["signup_date"], "addresses": ["location"]},
+    "Restaurants": {"booleans": ["is_active"], "addresses": ["location"]},
+    "Orders": {"datetimes": ["order_date", "delivery_time"]},
+    "Deliveries": {},
+}
+
+# Streaming progress is committed in the same transaction as each chunk
+CHECKPOINT_TABLE = "_ingest_checkpoints"
 
 # Insert data into tables
 def insert_data(table_name, dataframe):
     """
-    Inserts data from a DataFrame into the specified table.
+    Bulk inserts data from a DataFrame into the specified table, in one transaction so a failed
+    load leaves the table unchanged, and reports the load rate.
     """
     columns = ", ".join(dataframe.columns)
-    placeholders = ", ".join(["?"] * len(dataframe.columns))
-    query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders});"
-    
-    for row in dataframe.itertuples(index=False):
-        cursor.execute(query, tuple(row))
+    start = time.perf_counter()
+    inserted = db_manager.insert_many(
+        table_name,
+        columns,
+        dataframe.itertuples(index=False, name=None),
+        batch_size=BATCH_SIZE,
+        defer_indexes=True,
+        defer_foreign_keys=True,
+        single_transaction=True,
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Inserted {inserted} rows into {table_name} in {elapsed:.2f}s ({inserted / max(elapsed, 1e-9):,.0f} rows/s).")
+
+def add_location_keys(table_name, dataframe):
+    """
+    Parses each address once into city, state and postal code and adds their integer keys.
+    """
+    if table_name not in LOCATION_TABLES:
+        return dataframe
+    keys = db_manager.location_keys(dataframe["location"])
+    columns = zip(*keys) if keys else ([],) * len(KEY_COLUMN_NAMES)
+    return dataframe.assign(**{
+        name: pd.Series(values, index=dataframe.index, dtype=object) for name, values in zip(KEY_COLUMN_NAMES, columns)
+    })
+
+def convert_chunk(table_name, chunk):
+    """
+    Normalizes one chunk's types so every chunk binds the same way, whatever pandas inferred for it.
+    """
+    spec = CONVERSIONS.get(table_name, {})
+    for column in spec.get("booleans", []):
+        chunk[column] = chunk[column].map({True: 1, False: 0, "True": 1, "False": 0})
+    for column in spec.get("dates", []):
+        chunk[column] = pd.to_datetime(chunk[column], errors="coerce").dt.strftime("%Y-%m-%d")
+    for column in spec.get("datetimes", []):
+        chunk[column] = pd.to_datetime(chunk[column], errors="coerce").dt.strftime("%Y-%m-%d %H:%M:%S")
+    for column in spec.get("addresses", []):
+        chunk[column] = chunk[column].str.replace("\r\n", "\n", regex=False).str.strip()
+    chunk = chunk.astype(object)
+    return chunk.where(chunk.notna(), None)
+
+def read_source(source_file):
+    """
+    Reads a whole CSV file or Parquet dataset directory into a DataFrame.
+    """
+    if source_file.endswith(".parquet"):
+        return pd.read_parquet(source_file)
+    return pd.read_csv(source_file)
+
+def read_chunks(source_file, chunksize):
+    """
+    Yields a CSV file or Parquet dataset directory as DataFrames of at most `chunksize` rows, always in the same
+    order so checkpoints stay valid. Parquet part files are read in name order; pyarrow is only needed for them.
+    """
+    if not source_file.endswith(".parquet"):
+        yield from pd.read_csv(source_file, chunksize=chunksize)
+        return
+    import pyarrow.parquet as pq
+    for part in sorted(os.listdir(source_file)):
+        if part.endswith(".parquet"):
+            for batch in pq.ParquetFile(os.path.join(source_file, part)).iter_batches(batch_size=chunksize):
+                yield batch.to_pandas()
+
+def load_checkpoint(source_file):
+    """
+    Returns how many rows of a source file were already committed by an earlier streaming run.
+    """
+    rows = db_manager.fetch_all(f"SELECT rows_loaded FROM {CHECKPOINT_TABLE} WHERE source_file = ?;", (source_file,))
+    return rows[0][0] if rows else 0
+
+def stream_data(table_name, source_file):
+    """
+    Streams a CSV or Parquet source into the specified table one chunk per transaction, skipping rows already checkpointed.
+    """
+    def record_checkpoint(conn, batch_rows):
+        conn.execute(
+            f"INSERT INTO {CHECKPOINT_TABLE} (source_file, table_name, rows_loaded) VALUES (?, ?, ?) "
+            "ON CONFLICT(source_file) DO UPDATE SET rows_loaded = rows_loaded + excluded.rows_loaded;",
+            (source_file, table_name, batch_rows),
+        )
+
+    skip = load_checkpoint(source_file)
+    if skip:
+        print(f"Resuming {table_name} after {skip} checkpointed rows.")
+    inserted = 0
+    start = time.perf_counter()
+    for chunk in read_chunks(source_file, args.chunksize):
+        if skip >= len(chunk):
+            skip -= len(chunk)
+            continue
+        if skip:
+            chunk = chunk.iloc[skip:].copy()
+            skip = 0
+        chunk = add_location_keys(table_name, convert_chunk(table_name, chunk))
+        inserted += db_manager.insert_many(
+            table_name,
+            ", ".join(chunk.columns),
+            chunk.itertuples(index=False, name=None),
+            batch_size=len(chunk),
+            on_batch=record_checkpoint,
+        )
+    elapsed = time.perf_counter() - start
+    print(f"Streamed {inserted} rows into {table_name} in {elapsed:.2f}s ({inserted / max(elapsed, 1e-9):,.0f} rows/s).")
 
 # Populate tables
 try:
-    # Insert into Customers table
-    insert_data("Customers", customers_df)
+    # Lookup tables and key columns for the city, state and postal code parsed from each address
+    db_manager.create_location_dimension()
 
-    # Insert into Restaurants table
-    insert_data("Restaurants", restaurants_df)
+    if args.stream:
+        db_manager.create_table(
+            CHECKPOINT_TABLE, "source_file TEXT PRIMARY KEY, table_name TEXT NOT NULL, rows_loaded INTEGER NOT NULL"
+        )
+        if args.reset_checkpoints:
+            db_manager.execute_query(f"DELETE FROM {CHECKPOINT_TABLE};")
+        for table_name, source_file in sources:
+            stream_data(table_name, source_file)
+    else:
+        for table_name, source_file in sources:
+            insert_data(table_name, add_location_keys(table_name, read_source(source_file)))
 
-    # Insert into Orders table
-    insert_data("Orders", orders_df)
+    # Build (or rebuild) the Orders rollups used by the insights dashboard
+    db_manager.create_summary_tables()
 
-    # Insert into Deliveries table
-    insert_data("Deliveries", deliveries_df)
+    # Build (or rebuild) the full-text search indexes used by the Manage pages
+    db_manager.create_search_indexes()
 
-    # Commit the changes
-    conn.commit()
+    # Refresh the query planner statistics for the new data
+    db_manager.analyze()
     print("Data successfully inserted into the database.")
 
 except sqlite3.IntegrityError as e:
-    conn.rollback()
     print(f"Data insertion failed due to integrity error: {e}")
 
 # Data Validation
@@ -76,28 +221,25 @@ def validate_data():
     # Check for missing data
     for table in ["Customers", "Restaurants", "Orders", "Deliveries"]:
         query = f"SELECT COUNT(*) AS missing_count FROM {table} WHERE ROWID IS NULL;"
-        cursor.execute(query)
-        result = cursor.fetchone()[0]
+        result = db_manager.fetch_all(query)[0][0]
         if result > 0:
             issues.append(f"Table '{table}' contains {result} rows with missing data.")
     
     # Check for foreign key inconsistencies
-    cursor.execute("""
+    invalid_orders = db_manager.fetch_all("""
         SELECT COUNT(*) 
         FROM Orders 
         WHERE customer_id NOT IN (SELECT customer_id FROM Customers)
         OR restaurant_id NOT IN (SELECT restaurant_id FROM Restaurants);
-    """)
-    invalid_orders = cursor.fetchone()[0]
+    """)[0][0]
     if invalid_orders > 0:
         issues.append(f"Orders table contains {invalid_orders} rows with invalid foreign key references.")
     
-    cursor.execute("""
+    invalid_deliveries = db_manager.fetch_all("""
         SELECT COUNT(*) 
         FROM Deliveries 
         WHERE order_id NOT IN (SELECT order_id FROM Orders);
-    """)
-    invalid_deliveries = cursor.fetchone()[0]
+    """)[0][0]
     if invalid_deliveries > 0:
         issues.append(f"Deliveries table contains {invalid_deliveries} rows with invalid foreign key references.")
 
@@ -112,4 +254,4 @@ def validate_data():
 validate_data()
 
 # Close the database connection
-conn.close()
+db_manager.close()
@@ -0,0 +1,182 @@
+"""
+Read replica of the primary database for long-running insight queries.
+
+ReadReplica copies the primary into a new file with the sqlite3 backup API, which always
+yields a transactionally consistent copy, and then publishes it as the current generation.
+Aggregations read the replica and never hold locks on the primary, so CRUD writes there
+are not blocked behind them. A background thread re-copies the primary often enough that
+the replica is never older than max_staleness seconds.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple, Union
+
+from .database_manager import DatabaseManager
+
+
+class ReadReplica:
+    """Periodically refreshed, read-only copy of a SQLite database."""
+
+    def __init__(self, primary_path: str, replica_prefix: Optional[str] = None, max_staleness: float = 30.0,
+                 pages_per_step: int = 1024, pool_size: int = 4, cache_size: int = 256):
+        """
+        Initialize the replica; call refresh() or start() before reading.
+        :param primary_path: Path to the primary database file.
+        :param replica_prefix: Copies are written to <prefix>-<generation>.db (defaults to <primary>.replica).
+        :param max_staleness: Maximum age in seconds of the data served by reads.
+        :param pages_per_step: Pages copied per backup step; -1 copies everything in one step, holding
+            a read lock on the primary throughout. Smaller steps let writers in between steps (the copy
+            restarts when they change the primary, so it needs short pauses in the write stream).
+        :param pool_size: Pooled read-only connections per replica generation.
+        :param cache_size: Query cache entries per replica generation (0 disables caching).
+        """
+        self.primary_path = primary_path
+        self.replica_prefix = replica_prefix or f"{os.path.splitext(primary_path)[0]}.replica"
+        self.path = None
+        self.max_staleness = max_staleness
+        self.pages_per_step = pages_per_step
+        self.pool_size = pool_size
+        self.cache_size = cache_size
+        self.generation = 0
+        self.last_refresh = None
+        self.logger = logging.getLogger(__name__)
+        self._managers = []
+        self._refresh_lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def staleness(self) -> float:
+        """Seconds since the data in the replica was copied from the primary."""
+        return float("inf") if self.last_refresh is None else time.monotonic() - self.last_refresh
+
+    def refresh(self) -> None:
+        """Copy the primary into the next generation's file and make it the current replica."""
+        with self._refresh_lock:
+            started = time.monotonic()
+            path = f"{self.replica_prefix}-{self.generation + 1}.db"
+            source = sqlite3.connect(self.primary_path)
+            target = sqlite3.connect(path)
+            try:
+                source.backup(target, pages=self.pages_per_step)
+                # Readers open the copy read-only, which a WAL-mode file would not allow without its -shm file
+                target.execute("PRAGMA journal_mode = DELETE;")
+            finally:
+                target.close()
+                source.close()
+
+            # The previous generation stays open for readers that already picked it up
+            manager = DatabaseManager(path, pool_size=self.pool_size, cache_size=self.cache_size, read_only=True)
+            retired = self._managers[1:]
+            self._managers = [manager] + self._managers[:1]
+            self.path = path
+            self.generation += 1
+            for old in retired:
+                old.close()
+                try:
+                    os.remove(old.db_path)
+                except OSError:
+                    pass  # Still open by an outside reader (e.g. on Windows); overwritten by a later generation
+            self.last_refresh = started
+            self.logger.info(
+                f"Replica '{self.path}' refreshed (generation {self.generation}) "
+                f"in {(time.monotonic() - started) * 1000:.1f} ms"
+            )
+
+    def ensure_fresh(self) -> None:
+        """Refresh now if the replica is older than max_staleness (or has never been copied)."""
+        if self.staleness > self.max_staleness:
+            with self._refresh_lock:
+                if self.staleness > self.max_staleness:
+                    self.refresh()
+
+    def start(self) -> "ReadReplica":
+        """Copy the primary now and keep refreshing it in the background every max_staleness / 2 seconds."""
+        self.ensure_fresh()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._refresh_loop, name="replica-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(self.max_staleness / 2):
+            try:
+                self.refresh()
+            except sqlite3.Error as e:
+                self.logger.error(f"Replica refresh failed: {e}")
+
+    def stop(self) -> None:
+        """Stop the background refresh and close the replica's connections."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for manager in self._managers:
+            manager.close()
+            try:
+                os.remove(manager.db_path)
+            except OSError:
+                pass
+        self._managers = []
+
+    @property
+    def manager(self) -> DatabaseManager:
+        """Read-only DatabaseManager on the current replica generation."""
+        self.ensure_fresh()
+        return self._managers[0]
+
+    def fetch_all(self, query: str, params: Tuple = ()) -> List[Tuple]:
+        """
+        Fetch all rows for a given query from the replica.
+        :param query: SQL query string.
+        :param params: Tuple of parameters for the query.
+        :return: List of rows.
+        """
+        return self.manager.fetch_all(query, params)
+
+    def fetch_insight(self, name: str, top_k: int = 5, start=None, end=None, **filters) -> List[Tuple]:
+        """
+        Run a parameterized insight query against the replica (see DatabaseManager.fetch_insight).
+        :param name: Key of insight_queries.INSIGHTS.
+        :return: List of rows.
+        """
+        return self.manager.fetch_insight(name, top_k, start, end, **filters)
+
+    def insight_query(self, name: str, top_k: int = 5, start=None, end=None, **filters) -> Tuple[str, Tuple]:
+        """
+        SQL and bound parameters answering an insight on the replica, from its rollup tables
+        when possible (see DatabaseManager.insight_query).
+        :param name: Key of insight_queries.INSIGHTS.
+        :return: (query, params) tuple.
+        """
+        return self.manager.insight_query(name, top_k, start, end, **filters)
+
+    def fetch_dataframe(self, query: str, params: Tuple = (), use_cache: bool = True):
+        """
+        Fetch a query from the replica into a DataFrame built from typed columns (see DatabaseManager.fetch_dataframe).
+        :param query: SQL query string.
+        :param params: Tuple of parameters for the query.
+        :param use_cache: Serve repeated reads from the replica's query cache.
+        :return: DataFrame.
+        """
+        return self.manager.fetch_dataframe(query, params, use_cache=use_cache)
+
+    def get_table_data(self, table_name: str) -> List[Tuple]:
+        """
+        Fetch all data from a table in the replica.
+        :param table_name: Name of the table.
+        :return: List of rows.
+        """
+        return self.manager.get_table_data(table_name)
+
+    def fetch_column_names(self, table_name: str) -> Union[List[str], None]:
+        """
+        Fetch column names for a given table in the replica.
+        :param table_name: Name of the table.
+        :return: List of column names or None if the table doesn't exist.
+        """
+        return self.manager.fetch_column_names(table_name)
@@ -0,0 +1,78 @@
+"""
+Full-text search over Customers, Restaurants and Orders with SQLite FTS5.
+
+Each searchable table gets an external-content FTS5 index (_<table>_search) over its text
+columns: the index stores only the tokens and reads the column values from the table by
+rowid, so it adds little to the database size. Triggers keep it in sync on every insert,
+update and delete. DatabaseManager.search turns the typed text into prefix terms and
+returns the matching rows ranked by bm25, answered from the index instead of a LIKE scan.
+"""
+import re
+from typing import List, Optional
+
+# Table -> indexed columns (the primary key first, so a UUID prefix finds its record)
+SEARCHABLE = {
+    "Customers": ["customer_id", "name", "email", "phone"],
+    "Restaurants": ["restaurant_id", "name", "cuisine_type", "owner_name"],
+    "Orders": ["order_id", "customer_id", "restaurant_id", "status", "payment_mode"],
+}
+
+TOKEN = re.compile(r"\w+")
+
+
+def index_name(table: str) -> str:
+    """Name of the FTS5 index of a table, e.g. _customers_search."""
+    return f"_{table.lower()}_search"
+
+
+def trigger_names(table: str) -> List[str]:
+    return [f"{index_name(table)}_{event}" for event in ("insert", "update", "delete")]
+
+
+TRIGGERS = [name for table in SEARCHABLE for name in trigger_names(table)]
+
+
+def create_index_sql(table: str) -> str:
+    columns = ", ".join(SEARCHABLE[table])
+    return (f"CREATE VIRTUAL TABLE IF NOT EXISTS {index_name(table)} USING fts5("
+            f"{columns}, content='{table}', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2');")
+
+
+def trigger_sql(table: str) -> List[str]:
+    """Triggers applying every insert, update and delete on the table to its index."""
+    index = index_name(table)
+    columns = SEARCHABLE[table]
+    names = ", ".join(columns)
+    new = ", ".join(f"NEW.{column}" for column in columns)
+    old = ", ".join(f"OLD.{column}" for column in columns)
+    add = f"INSERT INTO {index} (rowid, {names}) VALUES (NEW.rowid, {new});"
+    remove = f"INSERT INTO {index} ({index}, rowid, {names}) VALUES ('delete', OLD.rowid, {old});"
+    insert_trigger, update_trigger, delete_trigger = trigger_names(table)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {insert_trigger} AFTER INSERT ON {table} BEGIN {add} END;",
+        f"CREATE TRIGGER IF NOT EXISTS {update_trigger} AFTER UPDATE OF {names} ON {table} BEGIN {remove} {add} END;",
+        f"CREATE TRIGGER IF NOT EXISTS {delete_trigger} AFTER DELETE ON {table} BEGIN {remove} END;",
+    ]
+
+
+def rebuild_sql(table: str) -> str:
+    """Re-read every row of the table into its index."""
+    return f"INSERT INTO {index_name(table)} ({index_name(table)}) VALUES ('rebuild');"
+
+
+def match_query(text: str) -> Optional[str]:
+    """
+    FTS5 query matching rows that contain every word of the text as a token prefix,
+    e.g. "sara ru" -> '"sara"* "ru"*'. Punctuation separates words, so emails, phone
+    numbers and UUIDs can be typed as they appear.
+    :return: The MATCH expression, or None if the text holds no words.
+    """
+    tokens = TOKEN.findall(text or "")
+    return " ".join(f'"{token}"*' for token in tokens) if tokens else None
+
+
+def search_sql(table: str) -> str:
+    """Matching rows of the table, best bm25 rank first, for (match_query, limit) parameters."""
+    index = index_name(table)
+    return (f"SELECT t.* FROM {index} JOIN {table} t ON t.rowid = {index}.rowid "
+            f"WHERE {index} MATCH ? ORDER BY {index}.rank LIMIT ?;")
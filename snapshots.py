@@ -0,0 +1,329 @@
+"""
+Columnar snapshots of the database for analytics offload.
+
+DatabaseManager.export_table / export_query stream SQLite rows into Parquet or Arrow IPC
+files one record batch at a time, so memory stays bounded by the batch size. Table
+snapshots are dataset directories of part files; incremental exports append a part holding
+only the rows whose key (e.g. rowid or order_date) is past the last exported value, which
+is recorded per part in the directory's state file. SnapshotInsights answers the summary insight
+queries from those snapshots with pyarrow compute instead of the live SQLite file.
+
+pyarrow is imported lazily, so it is only required when snapshots are used.
+"""
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import summary_tables
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+STATE_FILE = "_export_state.json"
+
+# SQLite type affinity rules, checked in order; DATE/DATETIME stay ISO-8601 strings
+AFFINITIES = [
+    (re.compile(r"INT", re.IGNORECASE), "int64"),
+    (re.compile(r"CHAR|CLOB|TEXT", re.IGNORECASE), "string"),
+    (re.compile(r"BOOL", re.IGNORECASE), "bool_"),
+    (re.compile(r"REAL|FLOA|DOUB|NUMERIC|DECIMAL", re.IGNORECASE), "float64"),
+]
+
+# Text spellings stored in BOOLEAN columns (SQLite keeps e.g. pandas' "True"/"False" as text)
+TEXT_BOOLEANS = {"true": True, "t": True, "yes": True, "y": True, "1": True,
+                 "false": False, "f": False, "no": False, "n": False, "0": False}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Snapshots require pyarrow (pip install pyarrow).") from e
+    return pyarrow
+
+
+def arrow_type(declared_type: str):
+    """Arrow type for a declared SQLite column type, or None to infer it from the data."""
+    pa = _pyarrow()
+    for pattern, name in AFFINITIES:
+        if pattern.search(declared_type or ""):
+            return getattr(pa, name)()
+    return pa.string() if re.search(r"DATE|TIME", declared_type or "", re.IGNORECASE) else None
+
+
+def _boolean(value):
+    """Value of a BOOLEAN column as a bool; unrecognised text is returned unchanged (and rejected)."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return TEXT_BOOLEANS.get(value.strip().lower(), value)
+    return bool(value)
+
+
+def to_record_batch(rows: List[Tuple], names: List[str], types: List):
+    """
+    Convert fetched rows to an Arrow record batch.
+    :param rows: Rows as returned by cursor.fetchmany.
+    :param names: Column names.
+    :param types: Arrow type per column (None to infer).
+    """
+    pa = _pyarrow()
+    arrays = []
+    for name, arrow_kind, values in zip(names, types, zip(*rows)):
+        try:
+            if arrow_kind == pa.bool_():
+                arrays.append(pa.array([_boolean(value) for value in values], type=pa.bool_()))
+            else:
+                arrays.append(pa.array(values, type=arrow_kind))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError) as e:
+            raise ValueError(f"Column '{name}' holds values that do not match its declared type: {e}") from e
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+class SnapshotWriter:
+    """Write record batches to one Parquet or Arrow IPC file, opened on the first batch."""
+
+    def __init__(self, path: str, file_format: str = "parquet", compression: str = "zstd",
+                 column_compression: Optional[Dict[str, str]] = None):
+        """
+        :param path: Output file path.
+        :param file_format: "parquet" or "arrow".
+        :param compression: Codec for every column (e.g. "zstd", "snappy", "lz4", "none").
+        :param column_compression: Per-column codec overrides (Parquet only).
+        """
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported snapshot format '{file_format}'; use one of {sorted(FORMATS)}.")
+        if column_compression and file_format != "parquet":
+            raise ValueError("Per-column compression is only supported for Parquet snapshots.")
+        self.path = path
+        self.file_format = file_format
+        self.compression = None if compression == "none" else compression
+        self.column_compression = column_compression or {}
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+
+    def write(self, batch) -> None:
+        pa = _pyarrow()
+        if self._writer is None:
+            self._schema = batch.schema
+            if self.file_format == "parquet":
+                compression = self.compression or "none"
+                if self.column_compression:
+                    compression = {name: self.column_compression.get(name, compression) for name in batch.schema.names}
+                self._writer = pa.parquet.ParquetWriter(self.path, self._schema, compression=compression)
+            else:
+                options = pa.ipc.IpcWriteOptions(compression=self.compression)
+                self._writer = pa.ipc.new_file(self.path, self._schema, options=options)
+        self._writer.write_batch(pa.RecordBatch.from_arrays(batch.columns, schema=self._schema))
+        self.rows += batch.num_rows
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def part_files(directory: str) -> List[str]:
+    """Part files of a snapshot dataset directory, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.startswith("part-") and name.endswith(tuple(FORMATS.values()))
+    )
+
+
+def last_exported_value(directory: str, key: str):
+    """
+    Key value of the last row exported into a dataset directory by an incremental export, or None.
+    Entries whose part file was never moved into place (an interrupted export) are ignored.
+    """
+    state = read_state(directory)
+    if state.get("key") != key:
+        return None
+    for path in reversed(part_files(directory)):
+        name = os.path.basename(path)
+        if name in state["parts"]:
+            return state["parts"][name]
+    return None
+
+
+def read_state(directory: str) -> Dict:
+    path = os.path.join(directory, STATE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as state_file:
+        return json.load(state_file)
+
+
+def record_part(directory: str, key: Optional[str], part: str, last_value) -> None:
+    """Record the last key value of a part before it is moved into place; a full export resets the state."""
+    state = read_state(directory)
+    if key is None or state.get("key") != key:
+        state = {"key": key, "parts": {}}
+    state["parts"][os.path.basename(part)] = last_value
+    path = os.path.join(directory, STATE_FILE)
+    with open(path + ".tmp", "w") as state_file:
+        json.dump(state, state_file)
+    os.replace(path + ".tmp", path)
+
+
+def load_dataset(directory: str, columns: Optional[Iterable[str]] = None):
+    """Read every part of a snapshot dataset directory into one Arrow table."""
+    _pyarrow()
+    import pyarrow.dataset as ds
+
+    parts = part_files(directory)
+    if not parts:
+        raise FileNotFoundError(f"No snapshot parts found in '{directory}'.")
+    file_format = "parquet" if parts[0].endswith(FORMATS["parquet"]) else "ipc"
+    return ds.dataset(parts, format=file_format).to_table(columns=list(columns) if columns else None)
+
+
+class SnapshotInsights:
+    """
+    Answer the summary insight queries (summary_tables.SUMMARY_QUERIES) from table snapshots,
+    with the same columns, top-k limit and missing-key rule as the rollups: orders whose
+    order_date is empty or does not parse are left out of the date insights.
+    """
+
+    TABLES = ("Orders", "Restaurants", "Customers")
+    # Insights limited to the top_k rows
+    RANKED = {
+        "peak_ordering_times", "top_restaurants", "order_value_by_restaurant",
+        "avg_feedback_by_restaurant", "top_customers", "avg_feedback_by_customer",
+    }
+
+    def __init__(self, snapshot_dir: str):
+        """
+        :param snapshot_dir: Directory holding one dataset directory per table (e.g. snapshots/Orders).
+        """
+        self.snapshot_dir = snapshot_dir
+        self._tables = {}  # (table, columns) -> (part files and their mtimes when loaded, Arrow table)
+
+    def available(self) -> bool:
+        """Whether every table the insights read has been snapshotted."""
+        return all(part_files(os.path.join(self.snapshot_dir, name)) for name in self.TABLES)
+
+    def _table(self, name: str, columns: List[str]):
+        """Columns of a table snapshot, reloaded when an export has added or replaced a part since the last read."""
+        directory = os.path.join(self.snapshot_dir, name)
+        parts = tuple((path, os.stat(path).st_mtime_ns) for path in part_files(directory))
+        key = (name, tuple(columns))
+        if key not in self._tables or self._tables[key][0] != parts:
+            self._tables[key] = (parts, load_dataset(directory, columns))
+        return self._tables[key][1]
+
+    def table(self, name: str, top_k: int = 5):
+        """
+        Arrow table for a summary insight, with the columns of summary_tables.SUMMARY_QUERIES[name].
+        :param name: Insight name (e.g., "peak_ordering_times").
+        :param top_k: Rows returned by ranked insights.
+        """
+        if name not in summary_tables.SUMMARY_QUERIES:
+            raise KeyError(f"Unknown insight '{name}'.")
+        if not isinstance(top_k, int) or top_k < 1:
+            raise ValueError(f"top_k must be a positive integer, got {top_k!r}.")
+        method = getattr(self, f"_{name}")
+        return method(top_k) if name in self.RANKED else method()
+
+    def run(self, name: str, top_k: int = 5) -> List[Tuple]:
+        """
+        Rows for a summary insight, in the same shape as DatabaseManager.fetch_summary(name, top_k).
+        :param name: Insight name (e.g., "peak_ordering_times").
+        :param top_k: Rows returned by ranked insights.
+        """
+        table = self.table(name, top_k)
+        return list(zip(*(column.to_pylist() for column in table.columns)))
+
+    @staticmethod
+    def _sorted(table, sort_by: List[Tuple[str, str]], limit: Optional[int] = None):
+        table = table.sort_by(sort_by)
+        return table.slice(0, limit) if limit is not None else table
+
+    @staticmethod
+    def _renamed(table, names: Dict[str, str]):
+        return table.rename_columns([names.get(name, name) for name in table.column_names])
+
+    def _order_times(self):
+        """order_date parsed like SQLite's date functions read it; NULL where it does not parse."""
+        import pyarrow.compute as pc
+
+        order_date = pc.replace_substring(self._table("Orders", ["order_date"]).column("order_date"), "T", " ")
+        full = pc.strptime(pc.utf8_slice_codeunits(order_date, 0, 19), format="%Y-%m-%d %H:%M:%S",
+                           unit="s", error_is_null=True)
+        day_only = pc.strptime(order_date, format="%Y-%m-%d", unit="s", error_is_null=True)
+        return pc.coalesce(full, day_only)
+
+    def _orders_by(self, name: str, key):
+        """Order counts per non-NULL key value."""
+        pa = _pyarrow()
+        import pyarrow.compute as pc
+
+        keys = pa.table({name: key}).filter(pc.is_valid(pc.field(name)))
+        grouped = keys.group_by(name).aggregate([([], "count_all")])
+        return self._renamed(grouped, {"count_all": "order_count"}).select([name, "order_count"])
+
+    def _orders_by_format(self, name: str, time_format: str):
+        import pyarrow.compute as pc
+
+        return self._orders_by(name, pc.strftime(self._order_times(), format=time_format))
+
+    def _order_count_by_hour(self):
+        return self._sorted(self._orders_by_format("hour", "%H"), [("hour", "ascending")])
+
+    def _peak_ordering_times(self, top_k: int):
+        return self._sorted(self._orders_by_format("hour", "%H"), [("order_count", "descending")], top_k)
+
+    def _orders_by_day(self):
+        return self._sorted(self._orders_by_format("day", "%Y-%m-%d"), [("day", "ascending")])
+
+    def _orders_by_month(self):
+        return self._sorted(self._orders_by_format("month", "%Y-%m"), [("month", "ascending")])
+
+    def _peak_ordering_days(self):
+        pa = _pyarrow()
+        import pyarrow.compute as pc
+
+        weekday = pc.cast(pc.day_of_week(self._order_times(), count_from_zero=True, week_start=7), pa.string())
+        return self._sorted(self._orders_by("weekday", weekday), [("order_count", "descending")])
+
+    def _stats(self, key: str, names_table: str):
+        import pyarrow.compute as pc
+
+        orders = self._table("Orders", [key, "total_amount", "feedback_rating"])
+        stats = orders.group_by(key).aggregate([
+            ([], "count_all"), ("total_amount", "sum"), ("feedback_rating", "sum"), ("feedback_rating", "count"),
+        ])
+        stats = self._renamed(stats, {
+            "count_all": "order_count", "total_amount_sum": "total_value",
+            "feedback_rating_sum": "feedback_sum", "feedback_rating_count": "feedback_count",
+        })
+        names = self._table(names_table, [key, "name"])
+        stats = stats.join(names, key)
+        average = pc.divide(stats.column("feedback_sum"), stats.column("feedback_count"))
+        return stats.append_column("avg_feedback", average)
+
+    def _ranked(self, key: str, names_table: str, measure: str, top_k: int):
+        import pyarrow.compute as pc
+
+        stats = self._stats(key, names_table)
+        if measure == "avg_feedback":
+            stats = stats.filter(pc.field("feedback_count") > 0)
+        return self._sorted(stats.select(["name", measure]), [(measure, "descending")], top_k)
+
+    def _top_restaurants(self, top_k: int):
+        return self._ranked("restaurant_id", "Restaurants", "order_count", top_k)
+
+    def _order_value_by_restaurant(self, top_k: int):
+        return self._ranked("restaurant_id", "Restaurants", "total_value", top_k)
+
+    def _avg_feedback_by_restaurant(self, top_k: int):
+        return self._ranked("restaurant_id", "Restaurants", "avg_feedback", top_k)
+
+    def _top_customers(self, top_k: int):
+        return self._ranked("customer_id", "Customers", "order_count", top_k)
+
+    def _avg_feedback_by_customer(self, top_k: int):
+        return self._ranked("customer_id", "Customers", "avg_feedback", top_k)
@@ -0,0 +1,140 @@
+"""
+Materialized rollups of the Orders table, kept current by triggers.
+
+Each summary table is keyed by one expression over an Orders row and stores additive
+measures, so an INSERT, UPDATE or DELETE on Orders adjusts a single summary row instead
+of re-aggregating the whole table. Rows whose key is NULL (a missing or unparseable
+order_date) are left out, as the insight queries over Orders leave out their NULL group.
+"""
+
+# Measures stored by every summary; {row} is NEW, OLD or Orders
+ORDER_MEASURES = [
+    ("order_count", "INTEGER", "1"),
+    ("total_amount", "REAL", "COALESCE({row}.total_amount, 0)"),
+]
+FEEDBACK_MEASURES = [
+    ("feedback_sum", "REAL", "COALESCE({row}.feedback_rating, 0)"),
+    ("feedback_count", "INTEGER", "({row}.feedback_rating IS NOT NULL)"),
+]
+
+SUMMARIES = {
+    "_orders_by_hour": ("hour", "strftime('%H', {row}.order_date)", ORDER_MEASURES),
+    "_orders_by_day": ("day", "date({row}.order_date)", ORDER_MEASURES),
+    "_restaurant_stats": ("restaurant_id", "{row}.restaurant_id", ORDER_MEASURES + FEEDBACK_MEASURES),
+    "_customer_stats": ("customer_id", "{row}.customer_id", ORDER_MEASURES + FEEDBACK_MEASURES),
+}
+
+# Orders columns that feed a summary key or measure
+TRACKED_COLUMNS = "order_date, customer_id, restaurant_id, total_amount, feedback_rating"
+
+# Insight queries answered from the summaries instead of Orders; ranked ones bind top_k (see summary_query)
+SUMMARY_QUERIES = {
+    "order_count_by_hour": "SELECT hour, order_count FROM _orders_by_hour ORDER BY hour;",
+    "peak_ordering_times": "SELECT hour, order_count FROM _orders_by_hour ORDER BY order_count DESC LIMIT ?;",
+    "orders_by_day": "SELECT day, order_count FROM _orders_by_day ORDER BY day;",
+    "orders_by_month": """
+        SELECT substr(day, 1, 7) AS month, SUM(order_count) AS order_count
+        FROM _orders_by_day GROUP BY month ORDER BY month;
+    """,
+    "peak_ordering_days": """
+        SELECT strftime('%w', day) AS weekday, SUM(order_count) AS order_count
+        FROM _orders_by_day GROUP BY weekday ORDER BY order_count DESC;
+    """,
+    "top_restaurants": """
+        SELECT r.name, s.order_count
+        FROM _restaurant_stats s JOIN Restaurants r ON r.restaurant_id = s.restaurant_id
+        ORDER BY s.order_count DESC LIMIT ?;
+    """,
+    "order_value_by_restaurant": """
+        SELECT r.name, s.total_amount AS total_value
+        FROM _restaurant_stats s JOIN Restaurants r ON r.restaurant_id = s.restaurant_id
+        ORDER BY total_value DESC LIMIT ?;
+    """,
+    "avg_feedback_by_restaurant": """
+        SELECT r.name, s.feedback_sum / s.feedback_count AS avg_feedback
+        FROM _restaurant_stats s JOIN Restaurants r ON r.restaurant_id = s.restaurant_id
+        WHERE s.feedback_count > 0 ORDER BY avg_feedback DESC LIMIT ?;
+    """,
+    "top_customers": """
+        SELECT c.name, s.order_count
+        FROM _customer_stats s JOIN Customers c ON c.customer_id = s.customer_id
+        ORDER BY s.order_count DESC LIMIT ?;
+    """,
+    "avg_feedback_by_customer": """
+        SELECT c.name, s.feedback_sum / s.feedback_count AS avg_feedback
+        FROM _customer_stats s JOIN Customers c ON c.customer_id = s.customer_id
+        WHERE s.feedback_count > 0 ORDER BY avg_feedback DESC LIMIT ?;
+    """,
+}
+
+
+def summary_query(name, top_k=5):
+    """
+    SQL and bound parameters for a summary insight.
+    :param name: Key of SUMMARY_QUERIES (e.g., "top_restaurants").
+    :param top_k: Rows returned by ranked insights.
+    :return: (query, params) tuple.
+    """
+    if not isinstance(top_k, int) or top_k < 1:
+        raise ValueError(f"top_k must be a positive integer, got {top_k!r}.")
+    query = SUMMARY_QUERIES[name]
+    return query, ((top_k,) if "LIMIT ?" in query else ())
+
+
+def create_table_sql(table):
+    """CREATE TABLE statement for a summary table."""
+    key_column, _, measures = SUMMARIES[table]
+    columns = ", ".join(f"{name} {kind} NOT NULL DEFAULT 0" for name, kind, _ in measures)
+    return f"CREATE TABLE IF NOT EXISTS {table} ({key_column} TEXT PRIMARY KEY NOT NULL, {columns});"
+
+
+def add_row_sql(table, row):
+    """Statement adding one Orders row ({row} = NEW) to a summary, unless its key is NULL."""
+    key_column, key_expression, measures = SUMMARIES[table]
+    names = ", ".join(name for name, _, _ in measures)
+    values = ", ".join(expression.format(row=row) for _, _, expression in measures)
+    updates = ", ".join(f"{name} = {name} + excluded.{name}" for name, _, _ in measures)
+    key = key_expression.format(row=row)
+    return (
+        f"INSERT INTO {table} ({key_column}, {names}) SELECT {key}, {values} WHERE {key} IS NOT NULL "
+        f"ON CONFLICT({key_column}) DO UPDATE SET {updates};"
+    )
+
+
+def remove_row_sql(table, row):
+    """Statements subtracting one Orders row ({row} = OLD) from a summary (a NULL key matches no row)."""
+    key_column, key_expression, measures = SUMMARIES[table]
+    updates = ", ".join(f"{name} = {name} - {expression.format(row=row)}" for name, _, expression in measures)
+    key = key_expression.format(row=row)
+    return (
+        f"UPDATE {table} SET {updates} WHERE {key_column} = {key};\n"
+        f"DELETE FROM {table} WHERE {key_column} = {key} AND order_count <= 0;"
+    )
+
+
+def rebuild_sql(table):
+    """Statements recomputing a summary from the whole Orders table."""
+    key_column, key_expression, measures = SUMMARIES[table]
+    names = ", ".join(name for name, _, _ in measures)
+    sums = ", ".join(f"SUM({expression.format(row='Orders')})" for _, _, expression in measures)
+    key = key_expression.format(row="Orders")
+    return [
+        f"DELETE FROM {table};",
+        f"INSERT INTO {table} ({key_column}, {names}) "
+        f"SELECT {key}, {sums} FROM Orders WHERE {key} IS NOT NULL GROUP BY 1;",
+    ]
+
+
+def trigger_sql():
+    """CREATE TRIGGER statements keeping every summary in step with Orders."""
+    add_new = "\n".join(add_row_sql(table, "NEW") for table in SUMMARIES)
+    remove_old = "\n".join(remove_row_sql(table, "OLD") for table in SUMMARIES)
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS _orders_summary_insert AFTER INSERT ON Orders BEGIN\n{add_new}\nEND;",
+        f"CREATE TRIGGER IF NOT EXISTS _orders_summary_delete AFTER DELETE ON Orders BEGIN\n{remove_old}\nEND;",
+        f"CREATE TRIGGER IF NOT EXISTS _orders_summary_update AFTER UPDATE OF {TRACKED_COLUMNS} ON Orders "
+        f"BEGIN\n{remove_old}\n{add_new}\nEND;",
+    ]
+
+
+TRIGGERS = ["_orders_summary_insert", "_orders_summary_delete", "_orders_summary_update"]
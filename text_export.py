@@ -0,0 +1,176 @@
+"""
+Streaming text exports: CSV or JSON Lines, optionally gzip-compressed.
+
+DatabaseManager.export_text writes a query result batch by batch from one cursor, so memory
+stays bounded by the batch size however large the table is. ExportJobs runs exports on
+background threads for results too large to wait for and reports their progress.
+"""
+import base64
+import csv
+import gzip
+import io
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+TEXT_FORMATS = {"csv": ".csv", "jsonl": ".jsonl"}
+MIME_TYPES = {"csv": "text/csv", "jsonl": "application/x-ndjson", "gzip": "application/gzip"}
+
+
+def file_name(name: str, file_format: str, compress: bool) -> str:
+    """Export file name for a table or insight name, e.g. Orders.csv.gz."""
+    if file_format not in TEXT_FORMATS:
+        raise ValueError(f"Unsupported export format '{file_format}'; use one of {sorted(TEXT_FORMATS)}.")
+    safe = re.sub(r"[^\w.-]+", "_", name).strip("_") or "export"
+    return f"{safe}{TEXT_FORMATS[file_format]}{'.gz' if compress else ''}"
+
+
+def _json_value(value):
+    return base64.b64encode(value).decode("ascii") if isinstance(value, bytes) else str(value)
+
+
+class TextWriter:
+    """Write rows to one CSV or JSON Lines file, gzip-compressed if requested."""
+
+    def __init__(self, path: str, file_format: str = "csv", compress: bool = False):
+        """
+        :param path: Output file path.
+        :param file_format: "csv" or "jsonl".
+        :param compress: gzip the output.
+        """
+        if file_format not in TEXT_FORMATS:
+            raise ValueError(f"Unsupported export format '{file_format}'; use one of {sorted(TEXT_FORMATS)}.")
+        self.path = path
+        self.file_format = file_format
+        self.rows = 0
+        raw = gzip.open(path, "wb", compresslevel=6) if compress else open(path, "wb")
+        self._file = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        self._csv = csv.writer(self._file) if file_format == "csv" else None
+        self._names = None
+
+    def write(self, names: List[str], rows: List[Tuple]) -> None:
+        """Write a batch of rows; the CSV header is written before the first batch."""
+        if self._names is None:
+            self.start(names)
+        if self._csv is not None:
+            self._csv.writerows(rows)
+        else:
+            self._file.writelines(
+                json.dumps(dict(zip(names, row)), ensure_ascii=False, default=_json_value) + "\n" for row in rows
+            )
+        self.rows += len(rows)
+
+    def start(self, names: List[str]) -> None:
+        """Write the CSV header (also for an empty result); later calls do nothing."""
+        if self._names is None:
+            self._names = names
+            if self._csv is not None:
+                self._csv.writerow(names)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ExportJob:
+    """State of one background export, updated by its worker thread."""
+
+    def __init__(self, job_id: int, name: str, path: str, download_name: str):
+        self.id = job_id
+        self.name = name
+        self.path = path
+        self.download_name = download_name
+        self.state = "queued"
+        self.rows = 0
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id, "name": self.name, "state": self.state, "rows": self.rows,
+            "path": self.path, "error": self.error,
+            "seconds": round((self.finished or time.time()) - self.submitted, 1),
+        }
+
+
+class ExportJobs:
+    """Run text exports on background threads and keep the most recent jobs for status and download."""
+
+    def __init__(self, directory: str = "exports", max_workers: int = 2, keep: int = 20, max_age: float = 3600.0):
+        """
+        :param directory: Directory the export files are written to.
+        :param max_workers: Exports running at the same time.
+        :param keep: Finished jobs kept in the list; older ones are forgotten and their files removed.
+        :param max_age: Seconds a finished job (and its file) is kept after it finishes.
+        """
+        self.directory = directory
+        self.keep = keep
+        self.max_age = max_age
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="export")
+        self._jobs = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def submit(self, manager, query: str, params: Tuple = (), name: str = "export", file_format: str = "csv",
+               compress: bool = False) -> ExportJob:
+        """
+        Queue an export of a query result.
+        :param manager: DatabaseManager to read from.
+        :param query: SQL query string.
+        :param params: Tuple of parameters for the query.
+        :param name: Table or insight name, used for the file name.
+        :param file_format: "csv" or "jsonl".
+        :param compress: gzip the output.
+        :return: The queued job.
+        """
+        job_id = next(self._ids)
+        download_name = file_name(name, file_format, compress)
+        path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{job_id}-{download_name}")
+        job = ExportJob(job_id, name, path, download_name)
+        with self._lock:
+            self._jobs.append(job)
+            self._forget_old()
+        self._executor.submit(self._run, job, manager, query, params, file_format, compress)
+        return job
+
+    def _run(self, job: ExportJob, manager, query: str, params: Tuple, file_format: str, compress: bool) -> None:
+        job.state = "running"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            manager.export_text(query, job.path, params, file_format, compress,
+                                progress=lambda rows: setattr(job, "rows", rows))
+            job.state = "done"
+        except Exception as e:
+            job.error = str(e)
+            job.state = "failed"
+        job.finished = time.time()
+
+    def _forget_old(self) -> None:
+        """Forget finished jobs beyond the newest `keep` or older than `max_age`, removing their files."""
+        finished = [job for job in self._jobs if job.finished is not None]
+        expired = time.time() - self.max_age
+        old = finished[:max(len(finished) - self.keep, 0)] + [job for job in finished if job.finished < expired]
+        for job in dict.fromkeys(old):
+            self._jobs.remove(job)
+            try:
+                os.remove(job.path)
+            except OSError:
+                pass
+
+    def jobs(self) -> List[ExportJob]:
+        """Known jobs, newest first (expired ones are pruned first)."""
+        with self._lock:
+            self._forget_old()
+            return list(reversed(self._jobs))
+
+    def get(self, job_id: int) -> Optional[ExportJob]:
+        with self._lock:
+            return next((job for job in self._jobs if job.id == job_id), None)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
@@ -1,34 +1,115 @@
 import streamlit as st
-import pandas as pd
 import sys
 import os
+import json
 import logging
+import tempfile
 
 # Add project root to the system path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from oop_database.database_manager import DatabaseManager
-from insights_visualization.data_insights import DataInsights
+from oop_database.insight_executor import run_insights
+from oop_database.insight_queries import is_unfiltered
+from oop_database.locations import KEY_COLUMN_NAMES, LOCATION_TABLES
+from oop_database.replica import ReadReplica
+from oop_database.snapshots import SnapshotInsights, part_files
+from oop_database.summary_tables import SUMMARY_QUERIES
+from oop_database.text_export import MIME_TYPES, ExportJobs, file_name
 
 # Database Configuration
 DB_PATH = "database_scripts/zomata_database.db"
-
-# Initialize Database Manager and Data Insights
-db_manager = DatabaseManager(DB_PATH)
-data_insights = DataInsights(DB_PATH)
-
-# Setup Logging
+SNAPSHOT_DIR = "snapshots"
+EXPORT_DIR = "exports"
+REPLICA_MAX_STALENESS = 30.0  # seconds
+
+# Insights answered by parameterized queries (top-k, date window, filters) on the replica
+PARAMETERIZED_INSIGHTS = {
+    "Peak Ordering Times": "peak_ordering_times",
+    "Top Customers": "top_customers",
+    "Top Restaurants": "top_restaurants",
+    "Popular Cuisines": "popular_cuisines",
+    "Average Delivery Times": "average_delivery_times",
+    "Orders by Day": "orders_by_day",
+    "Orders by Month": "orders_by_month",
+    "Order Value by Restaurant": "order_value_by_restaurant",
+    "Average Feedback by Restaurant": "avg_feedback_by_restaurant",
+    "Order Count by Hour": "order_count_by_hour",
+    "Peak Ordering Days": "peak_ordering_days",
+    "Top Customer Locations": "top_customer_states",
+    "Top Customer Cities": "top_customer_cities",
+    "Top Restaurant States": "top_restaurant_states",
+}
+TIME_SERIES_INSIGHTS = {"orders_by_day", "orders_by_month", "order_count_by_hour"}
+# Insights answered from the DeliveryAnalytics histograms: (method, group_by, columns, chart y column)
+ETA_COLUMNS = ["mean_error_min", "mean_abs_error_min", "late_share", "p50_min", "p90_min", "p95_min", "p99_min"]
+TIME_COLUMNS = ["p50_min", "p90_min", "p95_min", "p99_min"]
+FEE_COLUMNS = ["total_fee", "total_km", "fee_per_km", "mean_fee_per_km"]
+DELIVERY_INSIGHTS = {
+    "Delivery ETA Error Distribution": ("eta_error_histogram", None, ["group", "error_min", "deliveries"], "deliveries"),
+    "Delivery ETA Error by Vehicle": ("eta_error_percentiles", "vehicle", ["vehicle", "deliveries"] + ETA_COLUMNS, "p90_min"),
+    "Delivery ETA Error by Distance": ("eta_error_percentiles", "distance", ["distance", "deliveries"] + ETA_COLUMNS, "p90_min"),
+    "Delivery Time Percentiles by Vehicle": ("delivery_time_percentiles", "vehicle", ["vehicle", "deliveries"] + TIME_COLUMNS, "p90_min"),
+    "Delivery Time Percentiles by Distance": ("delivery_time_percentiles", "distance", ["distance", "deliveries"] + TIME_COLUMNS, "p90_min"),
+    "Delivery Fee per km": ("fee_per_km", "vehicle", ["vehicle", "deliveries"] + FEE_COLUMNS, "fee_per_km"),
+}
+FIGURE_MAX_POINTS = 2000  # points per line/scatter trace sent to the browser
+FIGURE_CACHE_SIZE = 64
+SEARCH_LIMIT = 20  # ranked matches shown by the Manage search box
+
+# Setup Logging (before anything below logs, so this configuration is the one that applies)
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Heavy objects are built once per server process and only when a page needs them: the
+# replica copy and DataInsights wait for the first Insights visit. pandas and plotly.express
+# are imported inside the functions that use them, so Home renders without loading either.
+@st.cache_resource
+def get_db_manager(db_path):
+    """One DatabaseManager per server process, so its pool, cache and query profile survive reruns."""
+    return DatabaseManager(db_path)
+
+@st.cache_resource
+def get_replica(db_path):
+    """Insights read a periodically refreshed copy of the database so they never block CRUD writes."""
+    return ReadReplica(db_path, max_staleness=REPLICA_MAX_STALENESS).start()
+
+@st.cache_resource(max_entries=2)
+def get_data_insights(replica_path):
+    """DataInsights on one replica generation; the module and plotly are imported on first use."""
+    from insights_visualization.data_insights import DataInsights
+    return DataInsights(replica_path)
+
+@st.cache_resource(max_entries=2)
+def get_delivery_analytics(replica_path, _manager):
+    """Delivery histograms of one replica generation, computed in one pass when it is first viewed."""
+    from oop_database.delivery_analytics import DeliveryAnalytics
+    return DeliveryAnalytics(_manager).refresh()
+
+@st.cache_resource
+def get_figure_cache():
+    """Serialized insight figures, shared by every session and keyed by the replica generation."""
+    from oop_database.figures import FigureCache
+    return FigureCache(max_entries=FIGURE_CACHE_SIZE)
+
+@st.cache_resource
+def get_snapshot_insights():
+    """Summary insights computed from the table snapshots; reloads a table when it is exported again."""
+    return SnapshotInsights(SNAPSHOT_DIR)
+
+@st.cache_resource
+def get_export_jobs():
+    """Background CSV/JSONL exports, shared by every session of this server process."""
+    return ExportJobs(EXPORT_DIR)
+
+db_manager = get_db_manager(DB_PATH)
+
 # Streamlit App
 def main():
     st.title("Zomato - Food Delivery Management Tool")
 
-    # Fetch dynamic menu
-    existing_tables = db_manager.fetch_all(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';"
-    )
-    menu = ["Home"] + [f"Manage {table[0]}" for table in existing_tables] + ["Add/Modify Tables", "Insights"]
+    # Fetch dynamic menu (tables prefixed with '_' are internal bookkeeping)
+    existing_tables = db_manager.list_tables()
+    menu = ["Home"] + [f"Manage {table}" for table in existing_tables] + ["Add/Modify Tables", "Insights", "Performance"]
     choice = st.sidebar.selectbox("Menu", menu)
 
     if choice == "Home":
@@ -45,6 +126,9 @@ def main():
     elif choice == "Insights":
         show_insights()
 
+    elif choice == "Performance":
+        show_performance()
+
 
 def show_home():
     """Display the home page."""
@@ -59,24 +143,169 @@ def manage_table(table_name):
         st.error(f"Table '{table_name}' does not exist.")
         return
 
-    # Fetch current data and columns
-    data, columns = fetch_table_data(table_name)
+    # Fetch columns and display one page of table data
+    columns = db_manager.fetch_column_names(table_name)
+    where_clause, params = show_table_page(table_name, columns)
+    export_text(db_manager, table_name, f"SELECT * FROM {table_name}" + (f" WHERE {where_clause}" if where_clause else ""),
+                params, label="Export CSV/JSONL" + (" (filtered rows)" if where_clause else ""))
+    export_snapshot(table_name)
+
+    if db_manager.has_search_index(table_name):
+        search_records(table_name, columns)
 
-    # Display Table Data
+    # CRUD Operations; city_id, state_id and postal_code are derived from location on insert and update
+    if table_name in LOCATION_TABLES:
+        columns = [col for col in columns if col not in KEY_COLUMN_NAMES]
+    add_record(table_name, columns)
+    update_or_delete_record(table_name, columns)
+
+def show_table_page(table_name, columns):
+    """Display a table one page at a time with server-side sorting and filtering."""
+    sort_col, filter_col, size_col = st.columns(3)
+    order_by = sort_col.selectbox("Sort by", ["(insertion order)"] + columns, key=f"sort_{table_name}")
+    descending = sort_col.checkbox("Descending", key=f"desc_{table_name}")
+    filter_column = filter_col.selectbox("Filter column", columns, key=f"filter_col_{table_name}")
+    filter_text = filter_col.text_input("Contains", key=f"filter_text_{table_name}")
+    page_size = size_col.selectbox("Rows per page", [25, 50, 100, 500], index=1, key=f"size_{table_name}")
+
+    import pandas as pd
+
+    order_by = None if order_by == "(insertion order)" else order_by
+    where_clause, params = (f"{filter_column} LIKE ?", (f"%{filter_text}%",)) if filter_text else ("", ())
+
+    # Keys of the pages visited so far; reset whenever the view changes
+    view = (order_by, descending, where_clause, params, page_size)
+    state_key = f"pages_{table_name}"
+    if st.session_state.get(f"{state_key}_view") != view:
+        st.session_state[f"{state_key}_view"] = view
+        st.session_state[state_key] = [None]
+    page_keys = st.session_state[state_key]
+
+    data, next_key = db_manager.get_table_page(
+        table_name, page_keys[-1], page_size, order_by, descending, where_clause, params
+    )
     if data:
         st.dataframe(pd.DataFrame(data, columns=columns))
     else:
         st.info(f"No data available in {table_name}.")
 
-    # CRUD Operations
-    add_record(table_name, columns)
-    update_or_delete_record(table_name, columns)
+    if where_clause:
+        total = f"{db_manager.count_rows(table_name, where_clause, params)} matching rows"
+    else:
+        total = f"~{db_manager.estimate_row_count(table_name)} rows"
+    prev_col, info_col, next_col = st.columns([1, 2, 1])
+    if prev_col.button("Previous", key=f"prev_{table_name}", disabled=len(page_keys) == 1):
+        page_keys.pop()
+        st.rerun()
+    info_col.caption(f"Page {len(page_keys)} · {total}")
+    if next_col.button("Next", key=f"next_{table_name}", disabled=next_key is None):
+        page_keys.append(next_key)
+        st.rerun()
+    return where_clause, params
+
+def export_text(manager, name, query, params=(), label="Export CSV/JSONL"):
+    """
+    Export a query result (a table or an insight) to CSV or JSON Lines, written in bounded-memory
+    batches by the server. Small exports download directly; large ones can run as background jobs.
+    """
+    with st.expander(label):
+        format_col, compress_col = st.columns(2)
+        file_format = format_col.selectbox("Format", ["csv", "jsonl"], key=f"text_format_{name}")
+        compress = compress_col.checkbox("gzip", key=f"text_gzip_{name}")
+        download_name = file_name(name, file_format, compress)
+
+        def write_export():
+            # Runs when the button is clicked, on a separate thread from the rerun
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            descriptor, path = tempfile.mkstemp(prefix="download-", suffix=f"-{download_name}", dir=EXPORT_DIR)
+            os.close(descriptor)
+            try:
+                manager.export_text(query, path, params, file_format, compress)
+                return read_export_file(path)
+            finally:
+                os.remove(path)
+
+        download_col, job_col = st.columns(2)
+        download_col.download_button(
+            "Download", write_export, file_name=download_name,
+            mime=MIME_TYPES["gzip" if compress else file_format], key=f"text_download_{name}",
+        )
+        if job_col.button("Run in background", key=f"text_job_{name}"):
+            job = get_export_jobs().submit(manager, query, params, name, file_format, compress)
+            st.info(f"Export job {job.id} queued; follow it under Export Jobs.")
+        show_export_jobs(name)
+
+def read_export_file(path):
+    """Contents of an export file, read when its download button is clicked; no handle outlives the read."""
+    with open(path, "rb") as export:
+        return export.read()
+
+def show_export_jobs(name):
+    """Status of the background exports of a table or insight, with downloads for finished ones."""
+    jobs = [job for job in get_export_jobs().jobs() if job.name == name]
+    if not jobs:
+        return
+    st.write("Export Jobs")
+    if st.button("Refresh", key=f"text_jobs_refresh_{name}"):
+        st.rerun()
+    for job in jobs:
+        status = job.as_dict()
+        info_col, action_col = st.columns([3, 1])
+        info_col.caption(f"Job {job.id}: {status['state']} · {status['rows']:,} rows · {status['seconds']}s"
+                         + (f" · {job.error}" if job.error else ""))
+        if job.state == "done" and os.path.exists(job.path):
+            action_col.download_button(
+                "Download", lambda path=job.path: read_export_file(path), file_name=job.download_name,
+                key=f"text_job_download_{job.id}",
+            )
 
-def fetch_table_data(table_name):
-    """Fetch data and column names for a table."""
-    data = db_manager.get_table_data(table_name)
-    columns = db_manager.fetch_column_names(table_name)
-    return data, columns
+def export_snapshot(table_name):
+    """Export the table to a columnar Parquet/Arrow snapshot for analytics."""
+    with st.expander("Export Snapshot"):
+        format_col, compression_col = st.columns(2)
+        file_format = format_col.selectbox("Format", ["parquet", "arrow"], key=f"snapshot_format_{table_name}")
+        compression = compression_col.selectbox(
+            "Compression", ["zstd", "snappy", "lz4", "gzip", "none"], key=f"snapshot_compression_{table_name}"
+        )
+        incremental = st.checkbox("Only rows added since the last export (by rowid)", key=f"snapshot_incr_{table_name}")
+        if st.button("Export", key=f"snapshot_{table_name}"):
+            directory = os.path.join(SNAPSHOT_DIR, table_name)
+            try:
+                rows = db_manager.export_table(
+                    table_name, directory, file_format=file_format, compression=compression,
+                    incremental_key="rowid" if incremental else None,
+                )
+                st.success(f"Exported {rows} rows to '{directory}'.")
+                if rows and not incremental:
+                    with open(part_files(directory)[0], "rb") as snapshot:
+                        st.download_button("Download Snapshot", snapshot.read(),
+                                           file_name=f"{table_name}.{file_format}", key=f"snapshot_dl_{table_name}")
+            except Exception as e:
+                st.error(f"Error exporting snapshot: {e}")
+
+def search_records(table_name, columns):
+    """Full-text search of the table; a match can be picked for Update/Delete instead of typing its id."""
+    text = st.text_input(f"Search {table_name}", key=f"search_{table_name}",
+                         help="Words match the start of names, emails, phones, ids and other text columns.")
+    if not text.strip():
+        return
+
+    import time
+    import pandas as pd
+
+    start = time.perf_counter()
+    matches = db_manager.search(table_name, text, limit=SEARCH_LIMIT)
+    st.caption(f"{len(matches)} matches in {(time.perf_counter() - start) * 1000:.1f} ms, best first.")
+    if not matches:
+        return
+    st.dataframe(pd.DataFrame(matches, columns=columns))
+
+    def pick(record_id):
+        st.session_state[f"record_id_{table_name}"] = record_id
+
+    pick_col, button_col = st.columns([3, 1])
+    record_id = pick_col.selectbox("Match", [row[0] for row in matches], key=f"search_pick_{table_name}")
+    button_col.button("Use for Update/Delete", on_click=pick, args=(record_id,), key=f"search_use_{table_name}")
 
 def add_record(table_name, columns):
     """Add a new record to the table."""
@@ -93,7 +322,7 @@ def add_record(table_name, columns):
 def update_or_delete_record(table_name, columns):
     """Handle updating or deleting a record."""
     with st.expander(f"Update/Delete {table_name[:-1]}"):
-        selected_id = st.text_input(f"Enter {columns[0]} to Update/Delete")
+        selected_id = st.text_input(f"Enter {columns[0]} to Update/Delete", key=f"record_id_{table_name}")
         action = st.radio("Select Action", ["Update", "Delete"], horizontal=True)
 
         if action == "Delete" and st.button("Delete"):
@@ -174,9 +403,7 @@ def add_or_modify_tables():
                 column_to_delete = st.selectbox("Select Column to Delete", column_names)
                 if st.button("Delete Column"):
                     try:
-                        db_manager.execute_query(
-                            f"ALTER TABLE {modify_table_name} DROP COLUMN {column_to_delete};"
-                        )
+                        db_manager.drop_column(modify_table_name, column_to_delete)
                         st.success(f"Column '{column_to_delete}' deleted successfully from '{modify_table_name}'!")
                         st.rerun()  # Trigger a rerun to refresh the table
                     except Exception as e:
@@ -203,22 +430,39 @@ def show_insights():
         "Order Value by Restaurant",
         "Average Feedback by Restaurant",
         "Order Distribution by Feedback",
-        "Most Active Delivery Persons",
         "Top Customer Locations",
+        "Top Customer Cities",
+        "Top Restaurant States",
         "Most Ordered Cuisine by Customer",
         "Order Count by Hour",
         "Top Restaurants by Rating",
         "Peak Ordering Days",
         "Highest Rated Customers",
         "Top Rated Restaurants",
-    ]
+    ] + list(DELIVERY_INSIGHTS)
     selected_insights = st.multiselect("Select Insights to View:", insights_options)
+    replica = get_replica(DB_PATH)
+    insight_params = insight_controls(replica)
+    snapshot_insights = get_snapshot_insights()
+    use_snapshots = snapshot_insights.available() and st.checkbox(
+        "Answer from snapshots",
+        help=f"Whole-history insights without filters are computed from the Parquet/Arrow snapshots in "
+             f"'{SNAPSHOT_DIR}' (Manage > Export Snapshot) with pyarrow instead of querying the database.",
+    )
+
+    # Query cache counters, for tuning cache size and TTL
+    with st.expander("Query Cache Statistics"):
+        st.json(db_manager.cache_stats())
+        st.json({"figures": get_figure_cache().stats()})
+
+    st.caption(f"Insights read a replica refreshed {replica.staleness:.0f}s ago (at most {REPLICA_MAX_STALENESS:.0f}s).")
 
     if not selected_insights:
         st.info("Please select insights from the dropdown above to display visualizations.")
         return
 
     # Mapping insights to corresponding methods in DataInsights
+    data_insights = get_data_insights(replica.path)
     insight_methods = {
         "Peak Ordering Times": data_insights.fetch_and_visualize_peak_ordering_times,
         "Top Customers": data_insights.fetch_and_visualize_top_customers,
@@ -233,8 +477,6 @@ def show_insights():
         "Order Value by Restaurant": data_insights.fetch_and_visualize_order_value_by_restaurant,
         "Average Feedback by Restaurant": data_insights.fetch_and_visualize_avg_feedback_by_restaurant,
         "Order Distribution by Feedback": data_insights.fetch_and_visualize_order_distribution_by_feedback,
-        "Most Active Delivery Persons": data_insights.fetch_and_visualize_most_active_delivery_persons,
-        "Top Customer Locations": data_insights.fetch_and_visualize_top_customer_locations,
         "Most Ordered Cuisine by Customer": data_insights.fetch_and_visualize_most_ordered_cuisine_by_customer,
         "Order Count by Hour": data_insights.fetch_and_visualize_order_count_by_hour,
         "Top Restaurants by Rating": data_insights.fetch_and_visualize_top_restaurants_by_rating,
@@ -243,26 +485,155 @@ def show_insights():
         "Top Rated Restaurants": data_insights.fetch_and_visualize_top_rated_restaurants,
     }
 
-    for selected_insight in selected_insights:
-        st.write(f"### {selected_insight}")
-        fetch_visualize_method = insight_methods.get(selected_insight)
+    # Top-k, date window and filters are pushed into the SQL of the parameterized insights
+    figure_cache = get_figure_cache()
+    for name, insight in PARAMETERIZED_INSIGHTS.items():
+        insight_methods[name] = lambda insight=insight: fetch_and_visualize_insight(
+            replica, figure_cache, insight, insight_params, snapshot_insights if use_snapshots else None
+        )
+    # Delivery performance comes from histograms built once per replica generation (filters do not apply)
+    if any(name in DELIVERY_INSIGHTS for name in selected_insights):
+        manager = replica.manager
+        delivery_analytics = get_delivery_analytics(manager.db_path, manager)
+        for name in DELIVERY_INSIGHTS:
+            insight_methods[name] = lambda name=name: fetch_and_visualize_delivery_insight(
+                delivery_analytics, replica.generation, figure_cache, name
+            )
 
-        if fetch_visualize_method:
-            try:
-                # Fetch data and visualization
-                data, fig = fetch_visualize_method()
-
-                # Display data
-                if not data.empty:
-                    st.table(data)
-                else:
-                    st.warning(f"No data available for {selected_insight}.")
-
-                # Display visualization if available
-                if fig:
-                    st.plotly_chart(fig)
-            except Exception as e:
-                st.error(f"An error occurred while processing {selected_insight}: {e}")
+    # Export the filtered data of one parameterized insight
+    exportable = [name for name in selected_insights if name in PARAMETERIZED_INSIGHTS]
+    if exportable:
+        export_name = st.selectbox("Insight to export", exportable)
+        insight = PARAMETERIZED_INSIGHTS[export_name]
+        # Read from the primary (WAL readers do not block writers); a long export could outlive a replica generation
+        export_text(db_manager, insight, *db_manager.insight_query(insight, **insight_params), label="Export Insight Data")
+
+    # Run every selected insight concurrently, one worker per pooled replica connection,
+    # then render in the order they were selected
+    tasks = [(name, insight_methods[name]) for name in selected_insights if name in insight_methods]
+    for result in run_insights(tasks, max_workers=replica.pool_size):
+        st.write(f"### {result.name}")
+
+        try:
+            if result.error is not None:
+                raise result.error
+
+            # Display data
+            if not result.data.empty:
+                st.table(result.data)
+            else:
+                st.warning(f"No data available for {result.name}.")
+
+            # Display visualization if available
+            if result.figure:
+                st.plotly_chart(result.figure)
+        except Exception as e:
+            st.error(f"An error occurred while processing {result.name}: {e}")
+
+def insight_controls(replica):
+    """Top-k, order date window and filter inputs for the parameterized insights."""
+    with st.expander("Insight Filters", expanded=True):
+        top_col, date_col = st.columns([1, 2])
+        top_k = int(top_col.number_input("Top K", min_value=1, max_value=100, value=5, step=1))
+        window = date_col.date_input("Order date range", value=(), help="Leave empty for the whole history.")
+        cuisine_col, location_col = st.columns(2)
+        cuisines = [row[0] for row in replica.fetch_all(
+            "SELECT DISTINCT cuisine_type FROM Restaurants ORDER BY cuisine_type;"
+        )]
+        cuisine = cuisine_col.multiselect("Cuisine", cuisines)
+        states = [row[0] for row in replica.fetch_all("SELECT code FROM States ORDER BY code;")] \
+            if replica.manager.table_exists("States") else []
+        state = location_col.multiselect("Restaurant state", states)
+    return {
+        "top_k": top_k,
+        "start": window[0] if len(window) > 0 else None,
+        "end": window[1] if len(window) > 1 else None,
+        "cuisine": cuisine,
+        "restaurant_state": state,
+    }
+
+def fetch_and_visualize_insight(replica, figure_cache, insight, params, snapshot_insights=None):
+    """
+    Run a parameterized insight on the replica and chart its two columns, downsampled to
+    FIGURE_MAX_POINTS. Unfiltered requests are read from the Orders rollups, or computed from
+    the table snapshots when snapshot_insights is given. Replica figure JSON is cached until
+    the replica is refreshed.
+    """
+    from oop_database.figures import render_figure
+
+    filters = {name: value for name, value in params.items() if name != "top_k"}
+    from_snapshot = snapshot_insights is not None and insight in SUMMARY_QUERIES and is_unfiltered(**filters)
+    if from_snapshot:
+        data = snapshot_insights.table(insight, params["top_k"]).to_pandas()
+    else:
+        data = replica.fetch_dataframe(*replica.insight_query(insight, **params))
+    if data.empty:
+        return data, None
+    x, y = data.columns
+    chart_type = "line" if insight in TIME_SERIES_INSIGHTS else "bar"
+
+    def render():
+        return render_figure(data, chart_type, x, y, title=insight.replace("_", " ").title(),
+                             max_points=FIGURE_MAX_POINTS)
+
+    if from_snapshot:
+        # Snapshots change with each export rather than with the replica generation
+        return data, render()
+    figure_json = figure_cache.get_or_render(
+        replica.generation, (insight, chart_type, json.dumps(params, sort_keys=True, default=str)), render,
+    )
+    return data, json.loads(figure_json)
+
+def fetch_and_visualize_delivery_insight(delivery_analytics, generation, figure_cache, name):
+    """Table and bar chart of one DELIVERY_INSIGHTS entry, read from the precomputed histograms."""
+    import pandas as pd
+    from oop_database.figures import render_figure
+
+    method, group_by, columns, y = DELIVERY_INSIGHTS[name]
+    data = pd.DataFrame(getattr(delivery_analytics, method)(group_by), columns=columns)
+    if data.empty:
+        return data, None
+    x = columns[1] if group_by is None else columns[0]
+    figure_json = figure_cache.get_or_render(
+        generation, (name,), lambda: render_figure(data, "bar", x, y, title=name, max_points=FIGURE_MAX_POINTS)
+    )
+    return data, json.loads(figure_json)
+
+def show_performance():
+    """Display query timing statistics and the slow query log."""
+    import pandas as pd
+
+    st.subheader("Query Performance")
+
+    db_manager.profiler.slow_query_ms = st.number_input(
+        "Slow query threshold (ms)", min_value=0.0, value=float(db_manager.profiler.slow_query_ms), step=50.0
+    )
+    report = db_manager.profile_report()
+
+    # Per-fingerprint latency percentiles, hottest queries first
+    if report["queries"]:
+        queries_df = pd.DataFrame(report["queries"])
+        st.dataframe(queries_df.drop(columns=["rows_by_caller"]))
+        fingerprint = st.selectbox("Rows by caller for query", queries_df["fingerprint"])
+        st.json(queries_df.set_index("fingerprint").loc[fingerprint, "rows_by_caller"])
+    else:
+        st.info("No queries recorded yet.")
+
+    # Recent slow queries with their plans
+    st.write("### Slow Queries")
+    if report["slow_queries"]:
+        slow_df = pd.DataFrame(report["slow_queries"])
+        slow_df["plan"] = slow_df["plan"].str.join(" | ")
+        st.dataframe(slow_df)
+    else:
+        st.info(f"No queries slower than {report['slow_query_ms']} ms.")
+
+    st.download_button(
+        "Download JSON", json.dumps(report, indent=2), file_name="query_profile.json", mime="application/json"
+    )
+    if st.button("Reset Statistics"):
+        db_manager.profiler.reset()
+        st.rerun()
 
 if __name__ == "__main__":
     main()